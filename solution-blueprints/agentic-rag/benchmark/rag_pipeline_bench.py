@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""Run fixed questions through the agentic-rag pipeline and measure it node by node.
+
+Starts ``stub_servers.py`` (LLM and embeddings), a local ChromaDB server (``chroma run``, unless ``--chroma-url``
+names an existing one) and the real MCP server (``src/mcp_server.py``) as local processes, ingests the corpus through
+``ingest_files`` and then asks every question through ``run_rag_agent``, in this process, so each graph node can be
+timed. Reported over all questions:
+
+* ``e2e_ms`` - client-observed time per question, from the call to the final answer;
+* ``nodes`` - per-call time of each graph node (``reasoner``, ``tool_executor``, ``grader``) and of the reasoner's
+  LLM steps (``search``, ``completeness``, ``answer``), with calls per question;
+* ``llm`` - LLM calls and prompt/completion tokens per question, by node, as reported in the LLM's ``usage``;
+* ``quality`` - share of questions whose answer contains the expected facts, and of unanswerable questions
+  answered with the "not found" message, plus searches per question.
+
+Question lines are JSON objects with ``question``, ``expect`` (substrings the answer must contain) and optional
+``not_found: true``.
+
+Usage: rag_pipeline_bench.py [--questions questions.jsonl] [--corpus corpus] [--repeats 3] [--concurrency 1]
+                             [--chroma-url URL] [--output rag_pipeline_results.json]
+"""
+
+import argparse
+import asyncio
+import contextvars
+import functools
+import glob
+import importlib.util
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import httpx
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(os.path.dirname(HERE), "src")
+NAMESPACE = "benchmark"
+# The ChromaDB CLI entry point, run with this interpreter so no ``chroma`` script is needed on PATH.
+CHROMA_CLI = "from chromadb.cli.cli import app; app()"
+# RAGAgent methods timed as nodes: graph nodes, then the reasoner's LLM steps.
+TIMED = {
+    "reasoner": "reasoner",
+    "tool_executor": "tool_executor",
+    "grader_node": "grader",
+    "_build_search_response": "search",
+    "_check_completeness": "completeness",
+    "_synthesize_answer": "answer",
+}
+
+
+@dataclass
+class QuestionRun:
+    question: str
+    e2e_s: float = 0.0
+    answer: str = ""
+    error: str = ""
+    node_s: dict = field(default_factory=lambda: defaultdict(list))
+    llm_calls: dict = field(default_factory=lambda: defaultdict(int))
+    prompt_tokens: dict = field(default_factory=lambda: defaultdict(int))
+    completion_tokens: dict = field(default_factory=lambda: defaultdict(int))
+
+
+_current_run: contextvars.ContextVar = contextvars.ContextVar("current_run", default=None)
+_current_node: contextvars.ContextVar = contextvars.ContextVar("current_node", default="other")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(values) -> dict:
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": len(values), "mean": float(np.mean(values)), "p50": p50, "p95": p95, "p99": p99}
+
+
+class Service:
+    """One local server process whose output goes to a log file."""
+
+    def __init__(self, name: str, args: list, env: dict, cwd: str, url: str, log_dir: str):
+        self.name = name
+        self.url = url
+        self.log_path = os.path.join(log_dir, f"{name}.log")
+        self._log = open(self.log_path, "w")
+        self.proc = subprocess.Popen(
+            args, cwd=cwd, env={**os.environ, **env}, stdout=self._log, stderr=subprocess.STDOUT
+        )
+
+    def wait_ready(self, path: str, timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with code {self.proc.returncode}, see {self.log_path}")
+            try:
+                # The MCP endpoint is an SSE stream: its status line is enough.
+                with httpx.stream("GET", f"{self.url}{path}", timeout=1.0) as resp:
+                    if resp.status_code == 200:
+                        return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"{self.name} not ready after {timeout:.0f}s, see {self.log_path}")
+
+    def stop(self):
+        if self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self._log.close()
+
+
+def parse_env(pairs: list) -> dict:
+    env = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected KEY=VALUE, got '{pair}'")
+        env[key] = value
+    return env
+
+
+def load_questions(path: str) -> list:
+    with open(path) as fh:
+        questions = [json.loads(line) for line in fh if line.strip()]
+    if not questions:
+        raise SystemExit(f"Question set {path} is empty")
+    return questions
+
+
+def instrument(rag_agent) -> None:
+    """Time the agent's nodes and count its LLM calls and tokens, attributed to the question being run.
+
+    Wraps RAGAgent methods before the shared graph is compiled, and adds a callback to the LLM client.
+    """
+    from langchain_core.callbacks import AsyncCallbackHandler
+
+    for method_name, node in TIMED.items():
+        original = getattr(rag_agent.RAGAgent, method_name)
+
+        def timed(original=original, node=node):
+            @functools.wraps(original)
+            async def wrapper(*args, **kwargs):
+                token = _current_node.set(node)
+                started = time.perf_counter()
+                try:
+                    return await original(*args, **kwargs)
+                finally:
+                    run = _current_run.get()
+                    if run is not None:
+                        run.node_s[node].append(time.perf_counter() - started)
+                    _current_node.reset(token)
+
+            return wrapper
+
+        setattr(rag_agent.RAGAgent, method_name, timed())
+
+    class UsageRecorder(AsyncCallbackHandler):
+        async def on_llm_end(self, response, **kwargs):
+            run = _current_run.get()
+            if run is None:
+                return
+            node = _current_node.get()
+            usage = (response.llm_output or {}).get("token_usage") or {}
+            run.llm_calls[node] += 1
+            run.prompt_tokens[node] += usage.get("prompt_tokens", 0)
+            run.completion_tokens[node] += usage.get("completion_tokens", 0)
+
+    create_llm = rag_agent.create_llm
+
+    def create_instrumented_llm():
+        llm = create_llm()
+        llm.callbacks = [UsageRecorder()]
+        return llm
+
+    rag_agent.create_llm = create_instrumented_llm
+
+
+async def ask(rag_agent, item: dict) -> QuestionRun:
+    run = QuestionRun(question=item["question"])
+    _current_run.set(run)
+    started = time.perf_counter()
+    async for event in rag_agent.run_rag_agent(item["question"], namespace=NAMESPACE):
+        if "**Final Answer:**" in event:
+            run.answer = event.split("**Final Answer:**", 1)[1].strip()
+        elif event.startswith("❌"):
+            run.error = event
+    run.e2e_s = time.perf_counter() - started
+    return run
+
+
+async def run_questions(rag_agent, questions: list, repeats: int, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(item):
+        async with semaphore:
+            # Own context per question, so concurrent runs never share a recorder.
+            return await asyncio.create_task(ask(rag_agent, item), context=contextvars.copy_context())
+
+    return await asyncio.gather(*(bounded(item) for _ in range(repeats) for item in questions))
+
+
+async def ingest(backend, mcp_pool, paths: list, clear: bool) -> float:
+    async with mcp_pool.get_session_pool().session() as session:
+        if clear:  # A shared server may hold chunks from an earlier run or another corpus
+            await session.call_tool("clear_database", {"namespace": NAMESPACE})
+    started = time.perf_counter()
+    async with mcp_pool.get_session_pool().session() as session:
+        async for _ in backend.ingest_files(session, paths, NAMESPACE):
+            pass
+    return time.perf_counter() - started
+
+
+def summarize(runs: list, questions: list) -> dict:
+    expectations = {item["question"]: item for item in questions}
+    ok = [r for r in runs if not r.error]
+    nodes = [node for node in TIMED.values() if any(node in r.node_s for r in ok)]
+    llm_nodes = sorted({node for r in ok for node in r.llm_calls})
+
+    def per_question(counter_name: str, node: str | None = None) -> float:
+        values = [
+            sum(getattr(r, counter_name).values()) if node is None else getattr(r, counter_name).get(node, 0)
+            for r in ok
+        ]
+        return float(np.mean(values)) if values else 0.0
+
+    answerable = [r for r in ok if not expectations[r.question].get("not_found")]
+    unanswerable = [r for r in ok if expectations[r.question].get("not_found")]
+    correct = [
+        r for r in answerable if all(e.lower() in r.answer.lower() for e in expectations[r.question].get("expect", []))
+    ]
+    declined = [r for r in unanswerable if r.answer.startswith("I was unable to find")]
+    return {
+        "questions": len(runs),
+        "errors": len(runs) - len(ok),
+        "e2e_ms": percentiles([r.e2e_s * 1000 for r in ok]),
+        "nodes": {
+            node: {
+                "ms": percentiles([s * 1000 for r in ok for s in r.node_s.get(node, [])]),
+                "calls_per_question": float(np.mean([len(r.node_s.get(node, [])) for r in ok])) if ok else 0.0,
+            }
+            for node in nodes
+        },
+        "llm": {
+            "calls_per_question": per_question("llm_calls"),
+            "prompt_tokens_per_question": per_question("prompt_tokens"),
+            "completion_tokens_per_question": per_question("completion_tokens"),
+            "by_node": {
+                node: {
+                    "calls_per_question": per_question("llm_calls", node),
+                    "prompt_tokens_per_question": per_question("prompt_tokens", node),
+                }
+                for node in llm_nodes
+            },
+        },
+        "quality": {
+            "answer_hit_rate": len(correct) / len(answerable) if answerable else None,
+            "not_found_rate": len(declined) / len(unanswerable) if unanswerable else None,
+            "searches_per_question": float(np.mean([len(r.node_s.get("tool_executor", [])) for r in ok])) if ok else 0,
+            "misses": sorted({r.question for r in answerable if r not in correct}),
+        },
+    }
+
+
+def print_summary(s: dict):
+    def fmt(stats, q):
+        return f"{stats[q]:8.1f}" if q in stats else f"{'-':>8}"
+
+    e2e = s["e2e_ms"]
+    print(
+        f"questions={s['questions']} errors={s['errors']}  e2e p50/p95/p99={fmt(e2e, 'p50')}{fmt(e2e, 'p95')}"
+        f"{fmt(e2e, 'p99')} ms"
+    )
+    for node, stats in s["nodes"].items():
+        llm = s["llm"]["by_node"].get(node, {})
+        print(
+            f"  {node:>13}  p50/p95={fmt(stats['ms'], 'p50')}{fmt(stats['ms'], 'p95')} ms  "
+            f"calls/q={stats['calls_per_question']:5.2f}  llm calls/q={llm.get('calls_per_question', 0.0):5.2f}  "
+            f"prompt tok/q={llm.get('prompt_tokens_per_question', 0.0):8.0f}"
+        )
+    llm, quality = s["llm"], s["quality"]
+    print(
+        f"  llm calls/q={llm['calls_per_question']:.2f}  prompt tok/q={llm['prompt_tokens_per_question']:.0f}  "
+        f"completion tok/q={llm['completion_tokens_per_question']:.0f}  "
+        f"searches/q={quality['searches_per_question']:.2f}"
+    )
+    print(f"  answer hit rate={quality['answer_hit_rate']}  not-found rate={quality['not_found_rate']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", default=os.path.join(HERE, "questions.jsonl"), help="JSONL question set")
+    parser.add_argument("--corpus", default=os.path.join(HERE, "corpus"), help="directory of .txt/.pdf documents")
+    parser.add_argument("--repeats", type=int, default=3, help="times every question is asked")
+    parser.add_argument("--concurrency", type=int, default=1, help="questions in flight at once")
+    parser.add_argument("--llm-ms", type=float, default=40.0)
+    parser.add_argument("--prefill-ms", type=float, default=20.0)
+    parser.add_argument("--token-ms", type=float, default=2.0)
+    parser.add_argument("--embedding-ms", type=float, default=5.0)
+    parser.add_argument("--env", action="append", help="extra KEY=VALUE for the agent and MCP server, repeatable")
+    parser.add_argument(
+        "--chroma-url",
+        help="existing ChromaDB server to use instead of starting one; its benchmark namespace is cleared",
+    )
+    parser.add_argument("--log-dir", help="where service logs and data go (default: a temporary directory)")
+    parser.add_argument("--output", default="rag_pipeline_results.json", help="JSON results file")
+    args = parser.parse_args()
+
+    questions = load_questions(args.questions)
+    paths = sorted(p for ext in ("txt", "pdf") for p in glob.glob(os.path.join(args.corpus, f"*.{ext}")))
+    if not paths:
+        raise SystemExit(f"No .txt or .pdf documents in {args.corpus}")
+    if importlib.util.find_spec("chromadb") is None:
+        raise SystemExit("chromadb is not installed; pip install -r ../src/requirements.txt")
+    log_dir = args.log_dir or tempfile.mkdtemp(prefix="agentic-rag-bench-")
+    os.makedirs(log_dir, exist_ok=True)
+    print(f"Service logs: {log_dir}")
+
+    stub_port, chroma_port, mcp_port = free_port(), free_port(), free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    chroma_url = (args.chroma_url or f"http://127.0.0.1:{chroma_port}").rstrip("/")
+    env = {
+        "EMBEDDING_URL": f"{stub_url}/v1/embeddings",
+        "VLLM_URL": f"{stub_url}/v1",
+        "CHROMADB_URL": chroma_url,
+        "MCP_URL": f"http://127.0.0.1:{mcp_port}/sse",
+        "MCP_PORT": str(mcp_port),
+        "EMBED_CACHE_PATH": os.path.join(log_dir, "embeddings.sqlite"),
+        "HF_HUB_OFFLINE": "1",  # The stub models have no tokenizer to download
+        **parse_env(args.env),
+    }
+
+    stub_args = [sys.executable, os.path.join(HERE, "stub_servers.py"), "--port", str(stub_port)]
+    stub_args += ["--llm-ms", str(args.llm_ms), "--prefill-ms", str(args.prefill_ms)]
+    stub_args += ["--token-ms", str(args.token_ms), "--embedding-ms", str(args.embedding_ms)]
+    services = [Service("stub", stub_args, {}, HERE, stub_url, log_dir)]
+    try:
+        services[0].wait_ready("/health")
+        if args.chroma_url:
+            httpx.get(f"{chroma_url}/api/v2/heartbeat", timeout=5.0).raise_for_status()
+        else:
+            chroma_args = [sys.executable, "-c", CHROMA_CLI, "run"]
+            chroma_args += ["--path", os.path.join(log_dir, "chroma"), "--port", str(chroma_port)]
+            services.append(Service("chroma", chroma_args, {}, log_dir, chroma_url, log_dir))
+            services[-1].wait_ready("/api/v2/heartbeat")
+        mcp = Service("mcp", [sys.executable, "mcp_server.py"], env, SRC_DIR, f"http://127.0.0.1:{mcp_port}", log_dir)
+        services.append(mcp)
+        mcp.wait_ready("/sse")
+
+        # The agent reads its configuration at import time.
+        os.environ.update(env)
+        sys.path.insert(0, SRC_DIR)
+        import backend
+        import mcp_pool
+        import rag_agent
+
+        instrument(rag_agent)
+
+        async def bench():
+            ingest_s = await ingest(backend, mcp_pool, paths, clear=bool(args.chroma_url))
+            await ask(rag_agent, questions[0])  # Warm-up: tool discovery and graph compilation
+            started = time.perf_counter()
+            runs = await run_questions(rag_agent, questions, args.repeats, args.concurrency)
+            return ingest_s, runs, time.perf_counter() - started
+
+        ingest_s, runs, elapsed = asyncio.run(bench())
+        stub_stats = httpx.get(f"{stub_url}/stats", timeout=5.0).json()
+    finally:
+        for service in reversed(services):
+            service.stop()
+
+    summary = summarize(runs, questions)
+    print(f"Ingested {len(paths)} documents in {ingest_s:.2f}s")
+    print_summary(summary)
+    report = {
+        "questions_file": os.path.abspath(args.questions),
+        "corpus": [os.path.basename(p) for p in paths],
+        "repeats": args.repeats,
+        "concurrency": args.concurrency,
+        "stub": {
+            "llm_ms": args.llm_ms,
+            "prefill_ms": args.prefill_ms,
+            "token_ms": args.token_ms,
+            "embedding_ms": args.embedding_ms,
+        },
+        "env": parse_env(args.env),
+        "ingest_s": ingest_s,
+        "elapsed_s": elapsed,
+        "questions_per_second": len(runs) / elapsed if elapsed else 0.0,
+        **summary,
+        "stub_requests": stub_stats,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2, default=float)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""OpenAI-compatible stub LLM and embedding server for the agentic-rag pipeline benchmark.
+
+Serves everything the agent and the MCP server talk to from one process, with configurable latencies:
+
+* ``POST /v1/embeddings`` - deterministic bag-of-words vectors, so retrieval finds chunks sharing the query's words;
+* ``POST /v1/chat/completions`` - recognizes the agent's prompts (search with tools, single and multi-chunk grading,
+  completeness check, answer synthesis, see ``src/rag_prompts.py``) and answers each from word overlap with the
+  question. Latency is ``--llm-ms`` plus ``--prefill-ms`` per 1000 prompt tokens plus ``--token-ms`` per
+  generated token, so larger prompts cost more, as on a real server;
+* ``GET /v1/models`` - a single ``stub-model`` entry;
+* ``GET /stats`` - request counts and estimated tokens per prompt kind (4 characters per token).
+
+Usage: stub_servers.py --port 18000 [--llm-ms 40] [--prefill-ms 20] [--token-ms 2] [--embedding-ms 5]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import re
+import sys
+import time
+import uuid
+from collections import Counter
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from rag_prompts import (  # noqa: E402  # type: ignore[attr-defined]
+    ANSWER_SYSTEM_PROMPT,
+    COMPLETENESS_PROMPT_TEMPLATE,
+    GRADER_PROMPT_TEMPLATE,
+    MULTI_CHUNK_GRADER_PROMPT,
+)
+
+EMBEDDING_DIM = 1024
+MODEL_ID = "stub-model"
+CHARS_PER_TOKEN = 4
+
+# The last line of each template identifies the prompt kind; they change together with the prompts.
+GRADE_MULTI_MARKER = MULTI_CHUNK_GRADER_PROMPT.rstrip().splitlines()[-1]
+GRADE_MARKER = GRADER_PROMPT_TEMPLATE.rstrip().splitlines()[-1]
+COMPLETENESS_MARKER = COMPLETENESS_PROMPT_TEMPLATE.rstrip().splitlines()[-1]
+
+_WORD = re.compile(r"[a-z0-9]+(?:[.,-][a-z0-9]+)*")
+_STOP_WORDS = frozenset(
+    "a an and are at by do does for from how i in is it many much of on or that the this to what when which who "
+    "why with within".split()
+)
+_PASSAGE = re.compile(r"^\[(\d+)\]\n", re.MULTILINE)
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+app = FastAPI(title="Agentic RAG benchmark stub")
+settings = argparse.Namespace(llm_ms=40.0, prefill_ms=20.0, token_ms=2.0, embedding_ms=5.0)
+stats: dict = {"requests": Counter(), "prompt_tokens": Counter(), "completion_tokens": Counter(), "embeddings": 0}
+
+
+def terms(text: str) -> set:
+    return {w for w in _WORD.findall(text.lower()) if w not in _STOP_WORDS and len(w) > 1}
+
+
+def embed(text: str) -> np.ndarray:
+    # Instruction-tuned embedders condition on the "Instruct: ... Query:" prefix rather than matching its words.
+    text = text.rsplit("Query:", 1)[-1]
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in terms(text):
+        bucket = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little")
+        vec[bucket % EMBEDDING_DIM] += 1.0
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+def is_relevant(question: str, passage: str) -> bool:
+    """Lenient like the real grader prompt: a third of the question's terms must appear in the passage."""
+    wanted = terms(question)
+    return bool(wanted) and len(wanted & terms(passage)) >= math.ceil(len(wanted) / 3)
+
+
+def best_sentence(question: str, context: str) -> str:
+    wanted = terms(question)
+    sentences = [s.strip() for s in _SENTENCE.split(context) if s.strip()]
+    if not sentences:
+        return "The context does not say."
+    return max(sentences, key=lambda s: len(wanted & terms(s)))
+
+
+def section(text: str, start: str, end: str) -> str:
+    return text.split(start, 1)[-1].split(end, 1)[0]
+
+
+def answer(body: dict) -> tuple:
+    """(prompt kind, message) for one chat completion request."""
+    messages = body.get("messages") or []
+    contents = [str(m.get("content") or "") for m in messages]
+    prompt = contents[-1] if contents else ""
+    if body.get("tools"):
+        question = next((c for m, c in zip(messages, contents) if m.get("role") == "user"), prompt)
+        query = " ".join(w for w in _WORD.findall(question.lower()) if w not in _STOP_WORDS)
+        call = {"name": "retrieve_documents", "arguments": json.dumps({"query": query or question})}
+        return "search", {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [{"id": uuid.uuid4().hex[:8], "type": "function", "function": call}],
+        }
+    if GRADE_MULTI_MARKER in prompt:
+        question = section(prompt, "Question: ", "\n\n")
+        parts = _PASSAGE.split(section(prompt, "[1] to [", "List ONLY the numbers"))
+        numbered = [(parts[i], parts[i + 1]) for i in range(1, len(parts) - 1, 2)]
+        chosen = [n for n, passage in numbered if is_relevant(question, passage)]
+        return "grade_multi", {"role": "assistant", "content": ", ".join(chosen) or "NONE"}
+    if GRADE_MARKER in prompt:
+        question = section(prompt, "Question: ", "\n\n")
+        verdict = "YES" if is_relevant(question, section(prompt, "Retrieved Text:\n", "\n\nDoes this text")) else "NO"
+        return "grade", {"role": "assistant", "content": verdict}
+    if COMPLETENESS_MARKER in prompt:
+        question = section(prompt, "Question: ", "\n\n")
+        context = section(prompt, "Context found so far:\n", "\n\nDoes this context")
+        covered = len(terms(question) & terms(context)) >= math.ceil(len(terms(question)) * 2 / 3)
+        return "completeness", {"role": "assistant", "content": "FULLY" if covered else "PARTIALLY"}
+    if contents and contents[0] == ANSWER_SYSTEM_PROMPT:
+        question = contents[1] if len(contents) > 1 else ""
+        context = contents[-1].split("Retrieved Context:\n", 1)[-1]
+        return "answer", {"role": "assistant", "content": best_sentence(question, context)}
+    return "other", {"role": "assistant", "content": "OK"}
+
+
+@app.get("/v1/models")
+async def models():
+    return {"object": "list", "data": [{"id": MODEL_ID, "object": "model"}]}
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    texts = body.get("input") or []
+    if isinstance(texts, str):
+        texts = [texts]
+    stats["embeddings"] += len(texts)
+    await asyncio.sleep(settings.embedding_ms / 1000)
+    data = [{"object": "embedding", "index": i, "embedding": embed(text).tolist()} for i, text in enumerate(texts)]
+    return {"object": "list", "model": body.get("model") or MODEL_ID, "data": data}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    kind, message = answer(body)
+    prompt_tokens = len(json.dumps(body.get("messages") or [])) // CHARS_PER_TOKEN
+    completion = message.get("content") or json.dumps(message.get("tool_calls") or [])
+    completion_tokens = max(1, len(completion) // CHARS_PER_TOKEN)
+    stats["requests"][kind] += 1
+    stats["prompt_tokens"][kind] += prompt_tokens
+    stats["completion_tokens"][kind] += completion_tokens
+    delay = settings.llm_ms + settings.prefill_ms * prompt_tokens / 1000 + settings.token_ms * completion_tokens
+    await asyncio.sleep(delay / 1000)
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model") or MODEL_ID,
+        "choices": [
+            {"index": 0, "message": message, "finish_reason": "tool_calls" if "tool_calls" in message else "stop"}
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--llm-ms", type=float, default=40.0, help="fixed latency of one chat completion")
+    parser.add_argument("--prefill-ms", type=float, default=20.0, help="added latency per 1000 prompt tokens")
+    parser.add_argument("--token-ms", type=float, default=2.0, help="added latency per generated token")
+    parser.add_argument("--embedding-ms", type=float, default=5.0, help="latency of one /v1/embeddings call")
+    args = parser.parse_args()
+    for key in ("llm_ms", "prefill_ms", "token_ms", "embedding_ms"):
+        setattr(settings, key, getattr(args, key))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
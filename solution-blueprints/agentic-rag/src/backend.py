@@ -2,22 +2,37 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import json
+import os
+import re
+import threading
+import time
 import urllib.parse
-from typing import AsyncGenerator, List
+import uuid
+from dataclasses import dataclass
+from typing import AsyncGenerator, Awaitable, Callable, Dict, List, Tuple
 
 import chromadb
 import config  # type: ignore[attr-defined]
+import numpy as np
+from hybrid_search import BM25Index, mmr_select, reciprocal_rank_fusion  # type: ignore[attr-defined]
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from mcp import types
 
 from utils import (  # type: ignore[attr-defined]
+    CHUNK_SEP,
+    LRUCache,
     RemoteEmbeddingFunction,
     content_hash,
     extract_key_terms,
+    file_hash,
     format_trace_event,
-    load_docs,
     logger,
+    normalize_query,
+    stream_docs,
 )
 
 # This is the only file that contains ChromaDB-specific code.
@@ -45,6 +60,22 @@ def _make_splitter() -> RecursiveCharacterTextSplitter:
     )
 
 
+@dataclass
+class SyncPlan:
+    """What it takes to bring one source document's chunks up to date."""
+
+    chunks: Dict[str, Document]  # Source-scoped chunk ID -> chunk, for the new version of the document
+    new_ids: List[str]
+    stale_ids: List[str]
+    kept_ids: List[str]
+
+    def stats(self) -> Dict[str, int]:
+        return {"added": len(self.new_ids), "removed": len(self.stale_ids), "kept": len(self.kept_ids)}
+
+    def summary(self) -> str:
+        return f"Added: {len(self.new_ids)} | Removed: {len(self.stale_ids)} | Kept: {len(self.kept_ids)}"
+
+
 class KnowledgeBase:
     """
     Vector database wrapper. All ChromaDB-specific code lives here.
@@ -53,8 +84,17 @@ class KnowledgeBase:
 
     def __init__(self):
         self._client = None  # Lazy-initialized ChromaDB HTTP client
-        self.vector_store = None  # LangChain Chroma wrapper (also lazy)
-        self.collection_name = "rag_collection"  # Single collection for all documents
+        self.vector_stores: Dict[str, Chroma] = {}  # LangChain Chroma wrappers per namespace (also lazy)
+        self.collection_name = "rag_collection"  # Collection of the default namespace
+        self.lexical_indexes: Dict[str, BM25Index] = {}  # BM25 indexes per namespace (lazy)
+        self._lexical_lock = threading.Lock()
+        # Chunk IDs are content hashes, so a cached candidate embedding never goes stale.
+        self.vector_cache = LRUCache(config.RETRIEVAL_VECTOR_CACHE_SIZE)
+        # Retrieval results keyed by (namespace, collection version, normalized query, k). Every write
+        # through this server bumps the namespace's version, which retires its cached results.
+        self.retrieval_cache = LRUCache(config.RETRIEVAL_CACHE_SIZE)
+        self.versions: Dict[str, int] = {}
+        self._version_lock = threading.Lock()
         self.embedding_function = RemoteEmbeddingFunction(
             url=config.EMBEDDING_URL,  # vLLM embedding server endpoint
             model=config.get_embed_model(),  # auto-detected from /v1/models
@@ -79,19 +119,30 @@ class KnowledgeBase:
                 )
         return self._client
 
-    def _get_vector_store(self):
-        """Ensures the Chroma vector store connection is active."""
-        if self.vector_store is None:
-            self.vector_store = Chroma(
+    def _collection_for(self, namespace: str) -> str:
+        """Each namespace gets its own collection; the default one keeps the historical name."""
+        if namespace == config.DEFAULT_NAMESPACE:
+            return self.collection_name
+        safe = re.sub(r"[^a-zA-Z0-9_-]", "-", namespace).strip("-_")[:200]
+        return f"{self.collection_name}_{safe}"
+
+    def _get_vector_store(self, namespace: str = config.DEFAULT_NAMESPACE):
+        """Ensures the Chroma vector store connection for the namespace is active."""
+        vs = self.vector_stores.get(namespace)
+        if vs is None:
+            vs = Chroma(
                 client=self.client,
-                collection_name=self.collection_name,
+                collection_name=self._collection_for(namespace),
                 embedding_function=self.embedding_function,
             )
-        return self.vector_store
+            self.vector_stores[namespace] = vs
+        return vs
 
-    def build_from_texts(self, texts: List[str], source_name: str = "default") -> str:
+    def build_from_texts(
+        self, texts: List[str], source_name: str = "default", namespace: str = config.DEFAULT_NAMESPACE
+    ) -> str:
         """Chunk, deduplicate, and upsert texts into the vector store."""
-        logger.info(f"--- DB Sync Start | Source: {source_name} ---")
+        logger.info(f"--- DB Sync Start | Source: {source_name} | Namespace: {namespace} ---")
 
         all_docs = [Document(page_content=t, metadata={"source": source_name}) for t in texts]
         splitter = _make_splitter()
@@ -101,102 +152,467 @@ class KnowledgeBase:
         # Chroma upserts on matching IDs, so re-uploading the same file is a no-op.
         ids = [content_hash(chunk.page_content) for chunk in chunks]
 
-        vs = self._get_vector_store()
+        vs = self._get_vector_store(namespace)
         pre_count = vs._collection.count()
         vs.add_documents(documents=chunks, ids=ids)
+        self._record_write(namespace, ids, chunks)
         post_count = vs._collection.count()
         newly_added = post_count - pre_count
-
-        # Warmup query: forces ChromaDB to finalize its HNSW index immediately after
-        # ingestion, so the very first user question doesn't return empty results due
-        # to the index not yet being ready.
-        try:
-            vs.similarity_search("warmup", k=1)
-            logger.info("Index warmup complete - HNSW index is ready for queries.")
-        except Exception as e:
-            logger.warning(f"Index warmup query failed (non-fatal): {e}")
+        if ids:
+            self._wait_until_queryable(vs, ids[-1])
 
         logger.info(f"Sync Finish | Added: {newly_added} | Total DB Size: {post_count}")
         return f"DB Update: Added {newly_added} new unique chunks. Total DB Size: {post_count}."
 
-    def retrieve(self, query: str, k: int = 0) -> str:
-        """MMR (Maximal Marginal Relevance) retrieval with diversity logging.
+    def document_hashes(self, source_names: List[str], namespace: str = config.DEFAULT_NAMESPACE) -> Dict[str, str]:
+        """Manifest lookup: the file hash each source was last synced with, for sources already indexed."""
+        collection = self._get_vector_store(namespace)._collection
+        hashes: Dict[str, str] = {}
+        for source in source_names:
+            # One metadata-filtered row per source, so this is O(files asked), not O(corpus).
+            found = collection.get(where={"source": source}, limit=1, include=["metadatas"])
+            metadatas = found.get("metadatas") or []
+            if not (metadatas and metadatas[0] and metadatas[0].get("file_hash")):
+                continue
+            current = metadatas[0]["file_hash"]
+            # Chunks with another hash mean an interrupted sync; leave the source out so it is synced again.
+            mixed = collection.get(
+                where={"$and": [{"source": source}, {"file_hash": {"$ne": current}}]}, limit=1, include=[]
+            )
+            if not mixed.get("ids"):
+                hashes[source] = str(current)
+        return hashes
+
+    def _plan_sync(self, text: str, source_name: str, file_hash: str, namespace: str) -> SyncPlan | None:
+        """Diff a source document against what is indexed; None if it is already up to date.
 
-        MMR balances relevance and diversity to avoid returning near-duplicate chunks.
+        Chunk IDs are scoped to the source, so documents sharing a passage can be updated
+        or removed independently. Work is proportional to this document, not the collection.
+        """
+        collection = self._get_vector_store(namespace)._collection
+        existing = collection.get(where={"source": source_name}, include=["metadatas"])
+        existing_ids = list(existing.get("ids") or [])
+        existing_meta = existing.get("metadatas") or []
+        if existing_ids and all((m or {}).get("file_hash") == file_hash for m in existing_meta):
+            return None
+
+        doc = Document(page_content=text, metadata={"source": source_name, "file_hash": file_hash})
+        chunks: Dict[str, Document] = {}
+        for chunk in _make_splitter().split_documents([doc]):
+            chunks.setdefault(content_hash(f"{source_name}\n{chunk.page_content}"), chunk)
+
+        known = set(existing_ids)
+        return SyncPlan(
+            chunks=chunks,
+            new_ids=[cid for cid in chunks if cid not in known],
+            stale_ids=[cid for cid in existing_ids if cid not in chunks],
+            kept_ids=[cid for cid in existing_ids if cid in chunks],
+        )
+
+    def _apply_removals(self, plan: SyncPlan, namespace: str) -> None:
+        collection = self._get_vector_store(namespace)._collection
+        if plan.stale_ids:
+            collection.delete(ids=plan.stale_ids)
+            self._record_removal(namespace, plan.stale_ids)
+        if plan.kept_ids:
+            # Unchanged chunks only need the new file hash; no re-embedding.
+            collection.update(ids=plan.kept_ids, metadatas=[plan.chunks[cid].metadata for cid in plan.kept_ids])
+
+    def sync_document(
+        self, text: str, source_name: str, file_hash: str = "", namespace: str = config.DEFAULT_NAMESPACE
+    ) -> Dict[str, int]:
+        """Bring one source document up to date: embed only its new chunks and delete the stale ones."""
+        plan = self._plan_sync(text, source_name, file_hash or content_hash(text), namespace)
+        if plan is None:
+            return {"added": 0, "removed": 0, "kept": self._count_source(source_name, namespace)}
+        vs = self._get_vector_store(namespace)
+        if plan.new_ids:
+            vs.add_documents(documents=[plan.chunks[cid] for cid in plan.new_ids], ids=plan.new_ids)
+            self._record_write(namespace, plan.new_ids, [plan.chunks[cid] for cid in plan.new_ids])
+            self._wait_until_queryable(vs, plan.new_ids[-1])
+        # Only once the new version is stored, so a failed embed or write leaves the old one intact.
+        self._apply_removals(plan, namespace)
+        logger.info(f"Synced '{source_name}' ({namespace}) | {plan.summary()}")
+        return plan.stats()
+
+    async def sync_document_stream(
+        self,
+        text: str,
+        source_name: str,
+        file_hash: str = "",
+        namespace: str = config.DEFAULT_NAMESPACE,
+        on_progress: Callable[[int, int], Awaitable[None]] | None = None,
+    ) -> Dict[str, int]:
+        """Async ``sync_document`` that embeds new chunks in windows and reports progress after each one.
+
+        Each window holds enough chunks to keep every embedding request slot busy, and is written
+        to Chroma while the next window is being embedded. Chroma calls run in worker threads so the
+        event loop (and other documents' syncs) keep moving.
+        """
+        plan = await asyncio.to_thread(self._plan_sync, text, source_name, file_hash or content_hash(text), namespace)
+        if plan is None:
+            kept = await asyncio.to_thread(self._count_source, source_name, namespace)
+            return {"added": 0, "removed": 0, "kept": kept}
+        vs = self._get_vector_store(namespace)
+
+        ef = self.embedding_function
+        window = ef.batch_size * ef.max_concurrency
+        total = len(plan.new_ids)
+        pending_write: asyncio.Task | None = None
+        try:
+            for start in range(0, total, window):
+                ids = plan.new_ids[start : start + window]
+                docs = [plan.chunks[cid] for cid in ids]
+                embeddings = await ef.aembed_documents([d.page_content for d in docs])
+                if pending_write is not None:
+                    await pending_write
+                pending_write = asyncio.create_task(
+                    asyncio.to_thread(
+                        vs._collection.add,
+                        ids=ids,
+                        embeddings=embeddings,
+                        documents=[d.page_content for d in docs],
+                        metadatas=[d.metadata for d in docs],
+                    )
+                )
+                if on_progress is not None:
+                    await on_progress(min(start + window, total), total)
+        finally:
+            # Also when embedding a later window fails: the write runs in a thread regardless,
+            # so don't return while it is still in flight.
+            if pending_write is not None:
+                await pending_write
+        if plan.new_ids:
+            new_chunks = [plan.chunks[cid] for cid in plan.new_ids]
+            await asyncio.to_thread(self._record_write, namespace, plan.new_ids, new_chunks)
+            await asyncio.to_thread(self._wait_until_queryable, vs, plan.new_ids[-1])
+        await asyncio.to_thread(self._apply_removals, plan, namespace)
+        logger.info(f"Synced '{source_name}' ({namespace}) | {plan.summary()}")
+        return plan.stats()
+
+    def _bump_version(self, namespace: str) -> None:
+        with self._version_lock:
+            self.versions[namespace] = self.versions.get(namespace, 0) + 1
+
+    def _record_write(self, namespace: str, ids: List[str], chunks: List[Document]) -> None:
+        """After chunks are written: retire cached results and update the BM25 index
+        (an index not built yet picks the chunks up when it is)."""
+        self._bump_version(namespace)
+        index = self.lexical_indexes.get(namespace)
+        if index is not None:
+            index.add(ids, [c.page_content for c in chunks], [c.metadata for c in chunks])
+
+    def _record_removal(self, namespace: str, ids: List[str]) -> None:
+        self._bump_version(namespace)
+        index = self.lexical_indexes.get(namespace)
+        if index is not None:
+            index.remove(ids)
+
+    def _lexical_index(self, namespace: str, collection) -> BM25Index:
+        """The namespace's BM25 index, (re)built from the collection when missing or out of step with it.
+
+        Writes made through this server keep the index current; the size check catches any
+        made elsewhere (e.g. another replica), at the cost of one count() per retrieval.
+        """
+        total = collection.count()
+        index = self.lexical_indexes.get(namespace)
+        if index is not None and len(index) == total:
+            return index
+        with self._lexical_lock:
+            index = self.lexical_indexes.get(namespace)
+            if index is None or len(index) != total:
+                started = time.perf_counter()
+                index = BM25Index()
+                page = 1000
+                for offset in range(0, total, page):
+                    found = collection.get(include=["documents", "metadatas"], limit=page, offset=offset)
+                    index.add(found["ids"], found.get("documents") or [], found.get("metadatas") or [])
+                self.lexical_indexes[namespace] = index
+                logger.info(
+                    f"Built BM25 index for '{namespace}': {len(index)} chunks in {time.perf_counter() - started:.2f}s"
+                )
+        return index
+
+    def _remember_vector(self, chunk_id: str, vector) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32)
+        self.vector_cache.put(chunk_id, vec)
+        return vec
+
+    def _candidate_vectors(self, ids: List[str], collection) -> np.ndarray | None:
+        """Embeddings of the candidates as one matrix: cached ones from memory, the rest in one get()."""
+        vectors: Dict[str, np.ndarray] = {}
+        for cid in ids:
+            vec = self.vector_cache.get(cid)
+            if vec is not None:
+                vectors[cid] = vec
+        missing = [cid for cid in ids if cid not in vectors]
+        if missing:
+            found = collection.get(ids=missing, include=["embeddings"])
+            embeddings = found.get("embeddings")
+            for cid, vec in zip(found.get("ids") or [], embeddings if embeddings is not None else []):
+                vectors[cid] = self._remember_vector(cid, vec)
+        if len(vectors) != len(ids):
+            return None
+        return np.stack([vectors[cid] for cid in ids])
+
+    def _count_source(self, source_name: str, namespace: str) -> int:
+        found = self._get_vector_store(namespace)._collection.get(where={"source": source_name}, include=[])
+        return len(found.get("ids") or [])
+
+    @staticmethod
+    def _wait_until_queryable(vs, chunk_id: str) -> bool:
+        """Readiness check: poll until a just-written chunk is returned by a nearest-neighbour query
+        on its own embedding, so the first question after a sync sees the new data."""
+        collection = vs._collection
+        deadline = time.monotonic() + config.KB_READY_TIMEOUT
+        delay = 0.05
+        try:
+            found = collection.get(ids=[chunk_id], include=["embeddings"])
+            embeddings = found.get("embeddings")
+            if embeddings is None or len(embeddings) == 0:
+                return False
+            probe = [[float(x) for x in embeddings[0]]]
+            while True:
+                res = collection.query(query_embeddings=probe, n_results=1, include=["distances"])
+                if chunk_id in (res.get("ids") or [[]])[0]:
+                    return True
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+        except Exception as e:
+            logger.warning(f"Index readiness check failed (non-fatal): {e}")
+            return False
+        logger.warning(f"Index not queryable after {config.KB_READY_TIMEOUT}s, continuing anyway")
+        return False
+
+    def retrieve(self, query: str, k: int = 0, namespace: str = config.DEFAULT_NAMESPACE) -> str:
+        """Hybrid retrieval: dense and BM25 candidates fused by reciprocal rank, then MMR re-ranking.
+
+        Exact terms (names, codes, rare words) that embeddings blur are caught by BM25, and MMR
+        keeps near-duplicate chunks from crowding out the rest.
         - k: number of final results (defaults to config.TOP_K_DOCS, set via TOP_K_DOCS env var)
-        - fetch_k=30: initially fetch 30 candidates, then re-rank for diversity
-        - lambda_mult=0.7: 70% relevance, 30% diversity (1.0 = pure relevance)
+        - RETRIEVAL_FETCH_K=30: candidates taken from each retriever before fusion
+        - MMR_LAMBDA=0.7: 70% relevance (fused rank), 30% diversity (1.0 = pure relevance)
         """
         if k == 0:
             k = config.TOP_K_DOCS
-        vs = self._get_vector_store()
 
-        key_terms = extract_key_terms(query)
         safe_query = query.replace("\n", " ").replace("\r", " ")
+        # Read the version before searching: a write landing mid-search retires this entry.
+        cache_key = (namespace, self.versions.get(namespace, 0), normalize_query(query), k)
+        cached = self.retrieval_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Retrieval Query: '%s' | served from cache", safe_query)
+            return cached
+
+        key_terms = extract_key_terms(query)
         logger.info("Retrieval Query: '%s' | Keywords: %s", safe_query, key_terms)
 
         try:
-            docs = vs.max_marginal_relevance_search(
-                query,
-                k=k,
-                fetch_k=30,
-                lambda_mult=0.7,  # See docstring for parameter explanation
-            )
-            if docs:
-                unique = len(set(d.page_content[:60] for d in docs))
-                logger.info(f"📊 MMR Diversity: {unique}/{len(docs)} unique snippets found.")
+            hits = self._hybrid_search(query, key_terms, k, namespace)
+            cacheable = True
         except Exception as e:
-            logger.error(f"MMR search failed, falling back to similarity: {e}")
-            docs = vs.similarity_search(query, k=k)
-
-        if not docs:
-            return "No relevant documents found."
-
-        return "\n\n---\n\n".join(f"[Source: {d.metadata.get('source', 'doc')}] {d.page_content}" for d in docs)
-
-    def count(self) -> int:
-        """Returns the number of chunks currently in the collection."""
+            logger.error(f"Hybrid search failed, falling back to similarity: {e}")
+            docs = self._get_vector_store(namespace).similarity_search(query, k=k)
+            hits = [(d.page_content, d.metadata) for d in docs]
+            cacheable = False  # Degraded result; let the next call try the full path again
+
+        if not hits:
+            context = "No relevant documents found."
+        else:
+            context = CHUNK_SEP.join(f"[Source: {meta.get('source', 'doc')}] {text}" for text, meta in hits)
+        if cacheable:
+            self.retrieval_cache.put(cache_key, context)
+        return context
+
+    def _hybrid_search(self, query: str, key_terms: List[str], k: int, namespace: str) -> List[Tuple[str, dict]]:
+        collection = self._get_vector_store(namespace)._collection
+        fetch_k = max(config.RETRIEVAL_FETCH_K, k)
+
+        query_vec = self.embedding_function.embed_query(query)
+        dense = collection.query(
+            query_embeddings=[query_vec], n_results=fetch_k, include=["documents", "metadatas", "embeddings"]
+        )
+        dense_ids = list((dense.get("ids") or [[]])[0])
+        candidates: Dict[str, Tuple[str, dict]] = {}
+        if dense_ids:
+            for cid, text, meta, vec in zip(
+                dense_ids, dense["documents"][0], dense["metadatas"][0], dense["embeddings"][0]
+            ):
+                candidates[cid] = (text, meta or {})
+                self._remember_vector(cid, vec)
+
+        rankings = [dense_ids]
+        sparse_ids: List[str] = []
+        if config.RETRIEVAL_MODE == "hybrid":
+            index = self._lexical_index(namespace, collection)
+            for cid, _ in index.search(key_terms, fetch_k):
+                doc = candidates.get(cid) or index.documents.get(cid)
+                if doc is not None:
+                    candidates[cid] = doc
+                    sparse_ids.append(cid)
+            rankings.append(sparse_ids)
+
+        fused = reciprocal_rank_fusion(rankings, config.RRF_K)[:fetch_k]
+        ids = [cid for cid, _ in fused]
+        if config.RETRIEVAL_MMR and len(ids) > k:
+            vectors = self._candidate_vectors(ids, collection)
+            if vectors is not None:
+                relevance = np.array([score for _, score in fused], dtype=np.float32)
+                relevance /= relevance.max()
+                ids = [ids[i] for i in mmr_select(vectors, relevance, k, config.MMR_LAMBDA)]
+        ids = ids[:k]
+
+        overlap = len(set(dense_ids) & set(sparse_ids))
+        logger.info(
+            f"📊 Hybrid retrieval: {len(dense_ids)} dense + {len(sparse_ids)} BM25 candidates "
+            f"({overlap} in both) -> {len(ids)} chunks"
+        )
+        return [candidates[cid] for cid in ids]
+
+    def cache_stats(self) -> Dict[str, str]:
+        """Hit rates of the server-side caches, for the stats tool."""
+        return {
+            "retrieval": self.retrieval_cache.stats(),
+            "query embeddings": self.embedding_function.query_cache.stats(),
+            "candidate vectors": self.vector_cache.stats(),
+        }
+
+    def count(self, namespace: str = config.DEFAULT_NAMESPACE) -> int:
+        """Returns the number of chunks currently in the namespace's collection."""
         try:
-            return self._get_vector_store()._collection.count()
+            return self._get_vector_store(namespace)._collection.count()
         except Exception:
             return 0
 
-    def clear(self):
-        """Wipes the collection for a fresh session.
-        Called before each new file upload to prevent cross-session data leakage."""
+    def clear(self, namespace: str = config.DEFAULT_NAMESPACE):
+        """Wipes the namespace's collection for a fresh start."""
+        collection_name = self._collection_for(namespace)
         try:
-            logger.warning(f"Wiping collection: {self.collection_name}")
-            self.client.delete_collection(self.collection_name)
-            self.vector_store = None
+            logger.warning(f"Wiping collection: {collection_name}")
+            self.client.delete_collection(collection_name)
+            self.vector_stores.pop(namespace, None)
+            self.lexical_indexes.pop(namespace, None)
+            self._bump_version(namespace)
         except Exception as e:
             logger.error(f"Clear DB failed: {e}")
 
 
-# Seconds to wait after ChromaDB ingestion before querying, to allow indexing to complete.
-CHROMADB_INDEX_DELAY = 3.0
+# MCP PROGRESS (client side):
+
+# Progress callbacks of in-flight call_tool_with_progress calls, keyed by progress token.
+_progress_listeners: Dict[str, Callable[[float, float | None], Awaitable[None]]] = {}
+
+
+async def forward_progress(message) -> None:
+    """ClientSession ``message_handler`` that routes progress notifications to call_tool_with_progress.
 
+    Sessions opened without it still work; their tool calls just report no progress.
+    """
+    if isinstance(message, types.ServerNotification) and isinstance(message.root, types.ProgressNotification):
+        params = message.root.params
+        listener = _progress_listeners.get(str(params.progressToken))
+        if listener is not None:
+            await listener(params.progress, params.total)
+
+
+async def call_tool_with_progress(
+    session, name: str, arguments: Dict, on_progress: Callable[[float, float | None], Awaitable[None]]
+) -> types.CallToolResult:
+    """``session.call_tool`` that asks the server for progress notifications and passes them to on_progress."""
+    token = uuid.uuid4().hex
+    params = types.CallToolRequestParams(name=name, arguments=arguments)
+    params.meta = types.RequestParams.Meta(progressToken=token)
+    _progress_listeners[token] = on_progress
+    try:
+        return await session.send_request(
+            types.ClientRequest(types.CallToolRequest(method="tools/call", params=params)),
+            types.CallToolResult,
+        )
+    finally:
+        _progress_listeners.pop(token, None)
 
-async def ingest_files(session, file_paths: List[str]) -> AsyncGenerator[str, None]:
-    """Clear the knowledge base and re-index the given files via MCP.
 
-    Yields status trace events for the UI as each step completes.
-    This is the data-sync step that runs before the agent graph starts.
+async def ingest_files(
+    session, file_paths: List[str], namespace: str = config.DEFAULT_NAMESPACE
+) -> AsyncGenerator[str, None]:
+    """Incrementally sync the given files into the namespace's knowledge base via MCP.
+
+    Files whose hash matches the server's manifest are skipped without being parsed;
+    changed files only upsert their new chunks and drop stale ones, so adding one file
+    costs O(file) rather than a rebuild of the collection.
+
+    Changed files run through a pipeline with bounded queues between stages: a process pool
+    parses them, and up to INGEST_CONCURRENCY documents are embedded and stored on the server
+    while later files are still parsing. Yields status trace events for the UI, including
+    per-document embedding progress.
     """
-    import asyncio
+    sources = {os.path.basename(path): path for path in file_paths}  # Re-uploading a file name replaces it
+    hashes = {source: await asyncio.to_thread(file_hash, path) for source, path in sources.items()}
 
+    known: Dict[str, str] = {}
     try:
-        await session.call_tool("clear_database", {})
-        yield format_trace_event("status", {"message": "Cleared previous knowledge base."})
+        res = await session.call_tool("get_document_hashes", {"source_names": list(sources), "namespace": namespace})
+        known = json.loads(res.content[0].text)
     except Exception as e:
-        logger.warning(f"Failed to clear database: {e}")
-
-    yield format_trace_event("status", {"message": f"Processing {len(file_paths)} files..."})
-    texts = await asyncio.to_thread(load_docs, file_paths)
-
-    if texts:
-        yield format_trace_event("status", {"message": "Deduplicating and storing in Knowledge Base..."})
-        res = await session.call_tool("build_knowledge_base", {"texts": texts})
-        db_info = res.content[0].text
-        yield format_trace_event("status", {"message": db_info})
-        # Brief pause to let ChromaDB finish indexing before we query it
-        await asyncio.sleep(CHROMADB_INDEX_DELAY)
+        logger.warning(f"Failed to read document manifest, syncing all files: {e}")
+
+    changed = [source for source in sources if known.get(source) != hashes[source]]
+    unchanged = len(sources) - len(changed)
+    yield format_trace_event(
+        "status", {"message": f"Processing {len(changed)} new or changed files ({unchanged} already indexed)..."}
+    )
+    if not changed:
+        return
+
+    events: asyncio.Queue[str | None] = asyncio.Queue()
+    parsed: asyncio.Queue[tuple[str, str | None] | None] = asyncio.Queue(maxsize=config.INGEST_QUEUE_SIZE)
+    consumers = max(1, min(config.INGEST_CONCURRENCY, len(changed)))
+
+    async def parse():
+        async for path, text in stream_docs([sources[source] for source in changed]):
+            await parsed.put((os.path.basename(path), text))
+        # Only on success: after a failure the task group cancels the stores instead.
+        for _ in range(consumers):
+            await parsed.put(None)
+
+    async def store():
+        while (item := await parsed.get()) is not None:
+            source, text = item
+            if text is None:
+                events.put_nowait(format_trace_event("status", {"message": f"Skipped {source}: could not be read."}))
+                continue
+
+            async def on_progress(done: float, total: float | None, source: str = source) -> None:
+                message = f"{source}: embedded {int(done)}/{int(total or done)} new chunks"
+                events.put_nowait(format_trace_event("status", {"message": message}))
+
+            res = await call_tool_with_progress(
+                session,
+                "sync_document_stream",
+                {"text": text, "source_name": source, "file_hash": hashes[source], "namespace": namespace},
+                on_progress,
+            )
+            events.put_nowait(format_trace_event("status", {"message": f"{source}: {res.content[0].text}"}))
+
+    async def run():
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(parse())
+                for _ in range(consumers):
+                    group.create_task(store())
+        except ExceptionGroup as errors:
+            # The first failure cancels the other stages, so none is left blocked on the bounded queue.
+            raise errors.exceptions[0]
+        finally:
+            events.put_nowait(None)
+
+    runner = asyncio.create_task(run())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+        await runner  # Surface pipeline errors to the caller
+    finally:
+        if not runner.done():
+            runner.cancel()
@@ -19,6 +19,7 @@ __all__ = [
     "TITLE",
     "GRADIO_PORT",
     "MCP_URL",
+    "MCP_PORT",
     "EMBEDDING_URL",
     "VLLM_API_KEY",
     "VLLM_MODEL",
@@ -29,14 +30,41 @@ __all__ = [
     "CHUNK_OVERLAP",
     "EMBED_MAX_TOKENS",
     "get_embed_tokenizer",
+    "get_context_tokenizer",
     "get_embed_model",
     "get_gen_model",
     "get_vllm_base_url",
     "TOP_K_DOCS",
+    "RETRIEVAL_MODE",
+    "RETRIEVAL_FETCH_K",
+    "RRF_K",
+    "RETRIEVAL_MMR",
+    "MMR_LAMBDA",
+    "RETRIEVAL_VECTOR_CACHE_SIZE",
+    "RETRIEVAL_CACHE_SIZE",
     "MAX_RETRIES",
     "INITIAL_DELAY",
     "BACKOFF_FACTOR",
     "EMBEDDING_TIMEOUT",
+    "EMBED_BATCH_SIZE",
+    "EMBED_MAX_CONCURRENCY",
+    "EMBED_CACHE_PATH",
+    "EMBED_QUERY_CACHE_SIZE",
+    "DEFAULT_NAMESPACE",
+    "KB_NAMESPACE_MODE",
+    "KB_READY_TIMEOUT",
+    "kb_namespace",
+    "INGEST_WORKERS",
+    "INGEST_QUEUE_SIZE",
+    "INGEST_CONCURRENCY",
+    "FANOUT_QUERIES",
+    "FANOUT_MAX_CHUNKS",
+    "MCP_POOL_SIZE",
+    "MCP_POOL_PING_TIMEOUT",
+    "ANSWER_CONTEXT_TOKENS",
+    "COMPLETENESS_CONTEXT_TOKENS",
+    "GRADER_CONTEXT_TOKENS",
+    "GRADER_CHUNK_TOKENS",
 ]
 
 TITLE = "Agentic RAG (MCP Architecture)"
@@ -44,6 +72,11 @@ GRADIO_PORT = int(os.getenv("GRADIO_PORT", "7860"))
 
 # MCP_URL: The SSE endpoint the agent connects to for tool discovery and invocation.
 MCP_URL: Final[str] = cast(str, os.getenv("MCP_URL", "http://localhost:8000/sse"))
+MCP_PORT = int(os.getenv("MCP_PORT", "8000"))  # Port the MCP server listens on
+# Initialized MCP sessions kept open between questions; a pooled session is only reused
+# if it answers a ping within MCP_POOL_PING_TIMEOUT seconds.
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "4"))
+MCP_POOL_PING_TIMEOUT = float(os.getenv("MCP_POOL_PING_TIMEOUT", "2.0"))
 
 # Required by components that talk to the embedding service (knowledge-mcp).
 # Empty when not set; consumers fail loudly via get_embed_model().
@@ -64,6 +97,31 @@ CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", "300"))
 CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "60"))
 TOP_K_DOCS = int(os.getenv("TOP_K_DOCS", "6"))  # Number of chunks to retrieve per query
 
+# Hybrid retrieval: RETRIEVAL_FETCH_K candidates each from the dense index and an in-memory BM25
+# index, fused by reciprocal rank (RRF_K damps the weight of top ranks), then re-ranked with MMR
+# (MMR_LAMBDA: 1.0 = pure relevance). RETRIEVAL_MODE=dense skips BM25; RETRIEVAL_MMR=false keeps
+# the fused order. RETRIEVAL_VECTOR_CACHE_SIZE bounds the in-memory cache of candidate embeddings.
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "hybrid").lower()
+RETRIEVAL_FETCH_K = int(os.getenv("RETRIEVAL_FETCH_K", "30"))
+RRF_K = int(os.getenv("RRF_K", "60"))
+RETRIEVAL_MMR = os.getenv("RETRIEVAL_MMR", "true").lower() in ("1", "true", "yes")
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+RETRIEVAL_VECTOR_CACHE_SIZE = int(os.getenv("RETRIEVAL_VECTOR_CACHE_SIZE", "4096"))
+# retrieve_documents results cached per namespace and collection version; 0 disables the cache.
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "512"))
+
+# Fan-out retrieval: each search step runs up to FANOUT_QUERIES query rewrites concurrently and
+# grades their deduplicated union (capped at FANOUT_MAX_CHUNKS) in one call. 1 = one query per step.
+FANOUT_QUERIES = int(os.getenv("FANOUT_QUERIES", "3"))
+FANOUT_MAX_CHUNKS = int(os.getenv("FANOUT_MAX_CHUNKS", "12"))
+
+# Token budgets for retrieved context in LLM prompts (counted with the generation model's tokenizer).
+# Context is deduplicated and packed best-first; whatever does not fit is dropped and logged.
+ANSWER_CONTEXT_TOKENS = int(os.getenv("ANSWER_CONTEXT_TOKENS", "6000"))
+COMPLETENESS_CONTEXT_TOKENS = int(os.getenv("COMPLETENESS_CONTEXT_TOKENS", "1500"))
+GRADER_CONTEXT_TOKENS = int(os.getenv("GRADER_CONTEXT_TOKENS", "6000"))
+GRADER_CHUNK_TOKENS = int(os.getenv("GRADER_CHUNK_TOKENS", "512"))  # Per-passage cap in the multi-chunk grader
+
 # Hard upper bound enforced by the embedding model (e.g. 512 for e5-large).
 # Inputs are truncated below this to leave margin for special / instruction tokens.
 EMBED_MAX_TOKENS = int(os.getenv("EMBED_MAX_TOKENS", "512"))
@@ -74,6 +132,30 @@ INITIAL_DELAY = float(os.getenv("INITIAL_DELAY", "1.0"))
 BACKOFF_FACTOR = float(os.getenv("BACKOFF_FACTOR", "2.0"))
 EMBEDDING_TIMEOUT: int = int(os.getenv("EMBEDDING_TIMEOUT", "120"))
 
+# Embedding requests are split into batches of EMBED_BATCH_SIZE inputs, with at most
+# EMBED_MAX_CONCURRENCY batches in flight on the shared connection pool.
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+
+# SQLite file caching embeddings by (model, chunk hash), so re-uploaded chunks cost no embedding calls.
+# Set to an empty string to disable. EMBED_QUERY_CACHE_SIZE bounds the in-memory LRU of query embeddings.
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", "/tmp/agentic-rag/embeddings.sqlite")
+EMBED_QUERY_CACHE_SIZE = int(os.getenv("EMBED_QUERY_CACHE_SIZE", "256"))
+
+# Knowledge base namespaces: "shared" keeps one knowledge base for every user (synced
+# incrementally per document); "session" gives each UI session its own collection.
+DEFAULT_NAMESPACE = "default"
+KB_NAMESPACE_MODE = os.getenv("KB_NAMESPACE_MODE", "shared").lower()
+# Upper bound on waiting for freshly written chunks to become queryable after a sync.
+KB_READY_TIMEOUT = float(os.getenv("KB_READY_TIMEOUT", "10.0"))
+
+# Ingestion pipeline: INGEST_WORKERS parser processes (scale with the agent pod's CPUs),
+# at most INGEST_QUEUE_SIZE parsed documents waiting, and INGEST_CONCURRENCY documents
+# being embedded and stored by the MCP server at once.
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "2"))
+
 # Number of retries when auto-detecting model names at startup.
 # The init container already gates the main pod on /health, so this is a
 # safety net for transient blips rather than a long startup wait.
@@ -139,10 +221,32 @@ def get_gen_model() -> str:
     return _detect_model(get_vllm_base_url(), with_auth=True)
 
 
-# Lazy tokenizer loader for token-aware chunking + input truncation.
+def kb_namespace(session_id: str | None) -> str:
+    """Knowledge base namespace for a UI session, following KB_NAMESPACE_MODE."""
+    if KB_NAMESPACE_MODE == "session" and session_id:
+        return session_id
+    return DEFAULT_NAMESPACE
+
+
+# Lazy tokenizer loaders for token-aware chunking, input truncation and prompt budgets.
 _TOKENIZER_CACHE: dict = {}
 
 
+def _load_tokenizer(key: str, model: str, fallback: str):
+    """Load and cache a HuggingFace tokenizer under ``key``; None (also cached) if unavailable."""
+    if key in _TOKENIZER_CACHE:
+        return _TOKENIZER_CACHE[key]
+    try:
+        from transformers import AutoTokenizer
+
+        tok = AutoTokenizer.from_pretrained(model)
+    except Exception as e:
+        print(f"Could not load tokenizer for {model}: {e}. {fallback}", file=sys.stderr)
+        tok = None
+    _TOKENIZER_CACHE[key] = tok
+    return tok
+
+
 def get_embed_tokenizer():
     """Return a HuggingFace tokenizer for EMBED_MODEL, or None if unavailable.
 
@@ -150,19 +254,22 @@ def get_embed_tokenizer():
     repeatedly when transformers/sentencepiece aren't installed or the model
     can't be downloaded.
     """
-    if "tokenizer" in _TOKENIZER_CACHE:
-        return _TOKENIZER_CACHE["tokenizer"]
-    model = get_embed_model()
-    try:
-        from transformers import AutoTokenizer
+    return _load_tokenizer(
+        "tokenizer",
+        get_embed_model(),
+        "Falling back to char-based chunking (less accurate for non-English text).",
+    )
 
-        tok = AutoTokenizer.from_pretrained(model)
-    except Exception as e:
-        print(
-            f"Could not load tokenizer for {model}: {e}. "
-            "Falling back to char-based chunking (less accurate for non-English text).",
-            file=sys.stderr,
-        )
-        tok = None
-    _TOKENIZER_CACHE["tokenizer"] = tok
-    return tok
+
+def get_context_tokenizer():
+    """Return the tokenizer used to budget prompt context, or None if unavailable.
+
+    Prefers the generation model's tokenizer (the budgets are for its prompts) and falls
+    back to the embedding tokenizer, e.g. when VLLM_MODEL is not a Hugging Face model ID.
+    """
+    try:
+        tok = _load_tokenizer("gen_tokenizer", get_gen_model(), "Trying the embedding model's tokenizer.")
+        return tok if tok is not None else get_embed_tokenizer()
+    except RuntimeError as e:  # Model auto-detection failed or its URL is not set
+        print(f"No tokenizer for context budgets: {e}. Estimating tokens from characters.", file=sys.stderr)
+        return None
@@ -0,0 +1,145 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import re
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+from utils import LRUCache, content_hash, logger  # type: ignore[attr-defined]
+
+# Fits retrieved chunks into explicit token budgets before they go into a prompt
+# (grader, completeness check, answer synthesis), instead of cutting the prompt at a
+# character count. Chunks are expected best-first; overlap between them is removed first.
+
+# Fallback when no tokenizer can be loaded: a conservative estimate, so budgets hold
+# even for dense scripts where a token covers fewer characters than in English.
+CHARS_PER_TOKEN = 3
+# A chunk cut to fewer tokens than this is not worth including.
+MIN_PARTIAL_TOKENS = 48
+# Shorter suffix/prefix matches between chunks are treated as coincidence, not splitter overlap.
+MIN_OVERLAP_CHARS = 40
+TRUNCATION_MARK = " [...]"
+
+_SOURCE_PREFIX = re.compile(r"^(\[Source: [^\]]*\] )")
+
+
+def _split_source(chunk: str) -> Tuple[str, str]:
+    """Split a retrieve_documents chunk into its "[Source: ...] " prefix and body."""
+    match = _SOURCE_PREFIX.match(chunk)
+    if not match:
+        return "", chunk
+    return match.group(1), chunk[match.end() :]
+
+
+def _overlap(a: str, b: str) -> int:
+    """Length of the longest suffix of ``a`` that is a prefix of ``b`` (0 below MIN_OVERLAP_CHARS)."""
+    if len(a) < MIN_OVERLAP_CHARS or len(b) < MIN_OVERLAP_CHARS:
+        return 0
+    probe = b[:MIN_OVERLAP_CHARS]
+    start = a.find(probe)
+    while start != -1:
+        # The first match is the longest candidate overlap.
+        if b.startswith(a[start:]):
+            return len(a) - start
+        start = a.find(probe, start + 1)
+    return 0
+
+
+class ContextPacker:
+    """Token counting, overlap removal and best-first packing of context chunks.
+
+    The tokenizer is the generation model's (see config.get_context_tokenizer), loaded once
+    by load(); until then, or if none is available, tokens are estimated from characters.
+    """
+
+    def __init__(self, tokenizer_loader: Optional[Callable[[], Any]] = None):
+        self._loader = tokenizer_loader
+        self._tokenizer: Any = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._lengths = LRUCache(4096)  # content_hash(text) -> token count
+
+    def load(self) -> None:
+        """Load the tokenizer (blocking: may download it). Safe to call repeatedly."""
+        with self._load_lock:
+            if self._loaded:
+                return
+            if self._loader is not None:
+                try:
+                    self._tokenizer = self._loader()
+                except Exception as e:
+                    logger.warning(f"Context tokenizer unavailable, estimating tokens from characters: {e}")
+            self._loaded = True
+
+    def count(self, text: str) -> int:
+        key = content_hash(text)
+        n = self._lengths.get(key)
+        if n is None:
+            if self._tokenizer is not None:
+                n = len(self._tokenizer.encode(text, add_special_tokens=False))
+            else:
+                n = -(-len(text) // CHARS_PER_TOKEN)
+            self._lengths.put(key, n)
+        return n
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut ``text`` to at most ``max_tokens`` tokens, marking the cut."""
+        if self.count(text) <= max_tokens:
+            return text
+        budget = max(0, max_tokens - self.count(TRUNCATION_MARK))
+        if self._tokenizer is not None:
+            ids = self._tokenizer.encode(text, add_special_tokens=False)[:budget]
+            cut = self._tokenizer.decode(ids, skip_special_tokens=True)
+        else:
+            cut = text[: budget * CHARS_PER_TOKEN]
+        return cut.rstrip() + TRUNCATION_MARK
+
+    @staticmethod
+    def dedupe(chunks: List[str]) -> List[str]:
+        """Drop chunks repeated or contained in a better-ranked chunk of the same source, and trim
+        text a chunk shares with a better-ranked neighbour (the splitter's chunk overlap)."""
+        kept: List[Tuple[str, str]] = []  # (source prefix, body), in input order
+        for chunk in chunks:
+            source, body = _split_source(chunk.strip())
+            same_source = [b for s, b in kept if s == source]
+            if any(body in b for b in same_source):
+                continue
+            for b in same_source:
+                body = body[_overlap(b, body) :]  # b ends where body starts
+                cut = _overlap(body, b)  # body ends where b starts
+                if cut:
+                    body = body[:-cut]
+            if body.strip():
+                kept.append((source, body.strip()))
+        return [source + body for source, body in kept]
+
+    def pack(self, chunks: List[str], budget: int, chunk_budget: int = 0, separator: str = "\n---\n") -> List[str]:
+        """Take chunks in order while they fit in ``budget`` tokens (separators included).
+
+        ``chunk_budget`` caps each chunk. The first chunk that does not fit is truncated into the
+        remaining room if that is worth it; it and everything after it is otherwise dropped, and
+        the drop is logged rather than silently overflowing the prompt.
+        """
+        packed: List[str] = []
+        used = 0
+        sep_tokens = self.count(separator)
+        for i, chunk in enumerate(chunks):
+            if chunk_budget:
+                chunk = self.truncate(chunk, chunk_budget)
+            cost = self.count(chunk) + (sep_tokens if packed else 0)
+            if used + cost <= budget:
+                packed.append(chunk)
+                used += cost
+                continue
+            room = budget - used - (sep_tokens if packed else 0)
+            if room >= MIN_PARTIAL_TOKENS:
+                packed.append(self.truncate(chunk, room))
+                used = budget
+            dropped = len(chunks) - len(packed)
+            if dropped:
+                logger.warning(f"Context packer: {dropped}/{len(chunks)} chunks dropped to fit {budget} tokens")
+            else:
+                logger.info(f"Context packer: chunk {i + 1}/{len(chunks)} truncated to fit {budget} tokens")
+            break
+        return packed
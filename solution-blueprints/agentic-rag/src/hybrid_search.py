@@ -0,0 +1,126 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import heapq
+import math
+import threading
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from utils import tokenize_terms  # type: ignore[attr-defined]
+
+# Building blocks of the hybrid retriever in backend.py: a lexical BM25 index kept next to
+# the dense collection, reciprocal-rank fusion of the two rankings, and a vectorized MMR re-rank.
+# Nothing here talks to the vector DB.
+
+
+class BM25Index:
+    """In-memory inverted index scoring chunks with Okapi BM25.
+
+    Keyed by the same chunk IDs as the vector collection, so it can be updated with the
+    IDs a sync adds or deletes. Thread-safe: MCP tools call it from worker threads.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> {chunk ID: term frequency}
+        self._doc_terms: Dict[str, Counter] = {}  # chunk ID -> term frequencies, for removal
+        self._doc_len: Dict[str, int] = {}
+        self._total_len = 0
+        self.documents: Dict[str, Tuple[str, dict]] = {}  # chunk ID -> (text, metadata)
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str], metadatas: Sequence[dict | None]) -> None:
+        """Insert or replace chunks."""
+        with self._lock:
+            for cid, text, meta in zip(ids, texts, metadatas):
+                self._remove(cid)
+                terms = Counter(tokenize_terms(text))
+                for term, tf in terms.items():
+                    self._postings.setdefault(term, {})[cid] = tf
+                self._doc_terms[cid] = terms
+                length = sum(terms.values())
+                self._doc_len[cid] = length
+                self._total_len += length
+                self.documents[cid] = (text, meta or {})
+
+    def remove(self, ids: Sequence[str]) -> None:
+        with self._lock:
+            for cid in ids:
+                self._remove(cid)
+
+    def _remove(self, cid: str) -> None:
+        terms = self._doc_terms.pop(cid, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(cid, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(cid, 0)
+        self.documents.pop(cid, None)
+
+    def search(self, terms: List[str], k: int) -> List[Tuple[str, float]]:
+        """Top-k (chunk ID, score) pairs for the query terms; only chunks sharing a term score."""
+        with self._lock:
+            n = len(self._doc_len)
+            if n == 0 or not terms:
+                return []
+            avg_len = self._total_len / n or 1.0
+            scores: Dict[str, float] = {}
+            for term in dict.fromkeys(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1.0 + (n - df + 0.5) / (df + 0.5))
+                for cid, tf in postings.items():
+                    norm = self.k1 * (1.0 - self.b + self.b * self._doc_len[cid] / avg_len)
+                    scores[cid] = scores.get(cid, 0.0) + idf * tf * (self.k1 + 1.0) / (tf + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists: each list contributes 1 / (k + rank) to an ID's score.
+
+    Only ranks are used, so BM25 scores and vector distances never need a common scale.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, cid in enumerate(ranking, start=1):
+            scores[cid] = scores.get(cid, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def mmr_select(vectors: np.ndarray, relevance: np.ndarray, k: int, lambda_mult: float = 0.7) -> List[int]:
+    """Maximal Marginal Relevance over candidate rows; returns the selected row indices in order.
+
+    Each step picks the row maximising ``lambda * relevance - (1 - lambda) * max cosine similarity
+    to the rows already picked``. One (n x n) matmul up front, then O(n) vector ops per pick.
+    """
+    n = len(relevance)
+    if n == 0 or k <= 0:
+        return []
+    unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True).clip(min=1e-12)
+    similarity = unit @ unit.T
+    selected = [int(np.argmax(relevance))]
+    max_sim = similarity[selected[0]].copy()
+    taken = np.zeros(n, dtype=bool)
+    taken[selected[0]] = True
+    while len(selected) < min(k, n):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * max_sim
+        scores[taken] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        taken[pick] = True
+        np.maximum(max_sim, similarity[pick], out=max_sim)
+    return selected
@@ -0,0 +1,133 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Optional
+
+import config  # type: ignore[attr-defined]
+from backend import forward_progress  # type: ignore[attr-defined]
+from mcp.client.session import ClientSession
+from mcp.client.sse import sse_client
+
+from utils import SESSION_INIT_TIMEOUT, logger  # type: ignore[attr-defined]
+
+# Long-lived, initialized MCP sessions shared by run_rag_agent and the UI handlers.
+# Opening the SSE stream and running the MCP handshake costs several round trips;
+# a pooled session skips both and is reused for as long as it passes a health check.
+
+
+class PooledSession:
+    """One initialized MCP session, kept open by its own task.
+
+    sse_client and ClientSession are anyio context managers that must be exited by the
+    task that entered them, so a background task owns them until close() is called
+    or the connection drops.
+    """
+
+    def __init__(self) -> None:
+        self.session: Optional[ClientSession] = None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    async def open(self) -> None:
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    async def _run(self) -> None:
+        try:
+            async with sse_client(url=config.MCP_URL, headers={"Connection": "keep-alive"}) as (read, write):
+                async with ClientSession(read, write, message_handler=forward_progress) as session:
+                    await asyncio.wait_for(session.initialize(), timeout=SESSION_INIT_TIMEOUT)
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            if self.session is not None:
+                logger.warning(f"Pooled MCP session dropped: {type(e).__name__}: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def healthy(self) -> bool:
+        """Health check before reuse: the server must answer a ping.
+
+        A dropped SSE stream is not always visible locally (e.g. after a server restart the
+        session looks open but its requests are never answered), so liveness alone is not enough.
+        """
+        if not self.alive:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=config.MCP_POOL_PING_TIMEOUT)  # type: ignore
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled MCP session failed its health check: {type(e).__name__}: {e}")
+            return False
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.wait([self._task], timeout=5.0)
+
+
+class MCPSessionPool:
+    """Hands out initialized MCP sessions and keeps up to ``size`` idle ones for reuse.
+
+    Concurrency is not capped: when no idle session is available a new one is opened,
+    and sessions returned while the pool is full are closed.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._idle: Deque[PooledSession] = deque()
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[ClientSession]:
+        pooled = await self._checkout()
+        reusable = False
+        try:
+            yield pooled.session  # type: ignore[misc]
+            reusable = True
+        finally:
+            # A session whose caller failed may still have requests in flight; never reuse it.
+            if reusable and pooled.alive and len(self._idle) < self.size:
+                self._idle.append(pooled)
+            else:
+                await pooled.close()
+
+    async def _checkout(self) -> PooledSession:
+        while self._idle:
+            pooled = self._idle.pop()  # Most recently used first: the likeliest to be healthy
+            if await pooled.healthy():
+                return pooled
+            await pooled.close()
+        pooled = PooledSession()
+        await pooled.open()
+        return pooled
+
+    async def close(self) -> None:
+        while self._idle:
+            await self._idle.pop().close()
+
+
+_pools: dict = {}
+
+
+def get_session_pool() -> MCPSessionPool:
+    """The pool for the running event loop (sessions cannot be shared across loops)."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = MCPSessionPool(config.MCP_POOL_SIZE)
+    return pool
@@ -2,16 +2,20 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import json
 from typing import List
 
 import uvicorn
 from backend import KnowledgeBase
-from mcp.server.fastmcp import FastMCP
+from config import DEFAULT_NAMESPACE, MCP_PORT  # type: ignore[attr-defined]
+from mcp.server.fastmcp import Context, FastMCP
 
 from utils import setup_logging  # type: ignore[attr-defined]
 
 # This file defines the MCP (Model Context Protocol) server.
-# It exposes tools (build, retrieve, clear, stats) that the agent calls over SSE.
+# It exposes tools (build, sync, retrieve, clear, stats) that the agent calls over SSE.
+# Every tool takes a `namespace`; the agent fills it in, so the LLM never sees it.
 # The agent discovers these tools via the MCP handshake and uses them at runtime.
 
 logger = setup_logging("mcp_server")
@@ -22,29 +26,76 @@ kb = KnowledgeBase()  # Singleton DB wrapper, shared across all tool calls.
 
 
 @mcp.tool(description="Indexes text chunks into the vector database. Use this when new files are uploaded.")
-def build_knowledge_base(texts: List[str], source_name: str = "default") -> str:
+def build_knowledge_base(texts: List[str], source_name: str = "default", namespace: str = DEFAULT_NAMESPACE) -> str:
     """
     Indexes text chunks into the vector database.
     Use this when new files are uploaded or information needs to be stored.
     """
     logger.info(f"MCP Tool Call: [build_knowledge_base] Source: {source_name}")
     try:
-        result = kb.build_from_texts(texts, source_name)  # type: ignore[attr-defined]
+        result = kb.build_from_texts(texts, source_name, namespace)  # type: ignore[attr-defined]
         return result
     except Exception as e:
         logger.error(f"Failed to build knowledge base: {e}")
         return f"Error: {str(e)}"
 
 
+@mcp.tool(description="Incrementally syncs one source document: embeds new chunks and removes stale ones.")
+def sync_document(text: str, source_name: str, file_hash: str = "", namespace: str = DEFAULT_NAMESPACE) -> str:
+    """
+    Brings one source document up to date in the vector database.
+    Unchanged documents are a no-op; changed ones only upsert their new chunks.
+    """
+    logger.info(f"MCP Tool Call: [sync_document] Source: {source_name}")
+    try:
+        stats = kb.sync_document(text, source_name, file_hash, namespace)
+        return f"Added {stats['added']}, removed {stats['removed']}, kept {stats['kept']} chunks."
+    except Exception as e:
+        logger.error(f"Failed to sync document {source_name}: {e}")
+        return f"Error: {str(e)}"
+
+
+@mcp.tool(description="Like sync_document, but embeds in batches and reports progress notifications as it goes.")
+async def sync_document_stream(
+    text: str, source_name: str, ctx: Context, file_hash: str = "", namespace: str = DEFAULT_NAMESPACE
+) -> str:
+    """
+    Streaming variant of sync_document for large documents: reports (embedded, total) new chunks
+    as progress, and runs off the event loop so several documents can sync at once.
+    """
+    logger.info(f"MCP Tool Call: [sync_document_stream] Source: {source_name}")
+
+    async def on_progress(done: int, total: int) -> None:
+        await ctx.report_progress(done, total)
+
+    try:
+        stats = await kb.sync_document_stream(text, source_name, file_hash, namespace, on_progress)
+        return f"Added {stats['added']}, removed {stats['removed']}, kept {stats['kept']} chunks."
+    except Exception as e:
+        logger.error(f"Failed to sync document {source_name}: {e}")
+        return f"Error: {str(e)}"
+
+
+@mcp.tool(description="Returns the file hash each named source was last indexed with, as a JSON object.")
+def get_document_hashes(source_names: List[str], namespace: str = DEFAULT_NAMESPACE) -> str:
+    """Document manifest lookup; sources that are not indexed are omitted."""
+    try:
+        return json.dumps(kb.document_hashes(source_names, namespace))
+    except Exception as e:
+        logger.error(f"Manifest lookup failed: {e}")
+        return "{}"
+
+
 @mcp.tool(description="Performs a semantic search to find relevant document snippets to gather facts.")
-def retrieve_documents(query: str) -> str:
+async def retrieve_documents(query: str, namespace: str = DEFAULT_NAMESPACE) -> str:
     """
     Performs a semantic search to find relevant document snippets.
     Use this to gather facts before answering a user's question.
     """
     logger.info(f"MCP Tool Call: [retrieve_documents] Query: {query[:50]}...")
     try:
-        context = kb.retrieve(query)
+        # Off the event loop, so the agent's parallel fan-out queries are served concurrently.
+        context = await asyncio.to_thread(kb.retrieve, query, namespace=namespace)
         return context
     except Exception as e:
         logger.error(f"Retrieval tool error: {e}")
@@ -52,26 +103,27 @@ def retrieve_documents(query: str) -> str:
 
 
 @mcp.tool(description="Wipes all indexed documents. Use this only when a fresh start is requested.")
-def clear_database() -> str:
+def clear_database(namespace: str = DEFAULT_NAMESPACE) -> str:
     """
     Wipes all indexed documents. Use this only when a fresh start is requested.
     """
     logger.warning("MCP Tool Call: [clear_database] Wiping collection.")
     try:
-        kb.clear()
+        kb.clear(namespace)
         return "Database successfully cleared."
     except Exception as e:
         return f"Error clearing database: {str(e)}"
 
 
-@mcp.tool(description="Returns the current number of chunks in the vector database.")
-def get_database_stats() -> str:
-    """Returns the total count of documents in the vector store."""
+@mcp.tool(description="Returns the current number of chunks in the vector database and cache hit rates.")
+def get_database_stats(namespace: str = DEFAULT_NAMESPACE) -> str:
+    """Returns the total count of documents in the vector store, plus server-side cache hit rates."""
+    caches = " | ".join(f"{name} cache: {stats}" for name, stats in kb.cache_stats().items())
     try:
-        count = kb.count()  # type: ignore[attr-defined]
-        return f"ChromaDB Status: {count} chunks indexed."
+        count = kb.count(namespace)  # type: ignore[attr-defined]
+        return f"ChromaDB Status: {count} chunks indexed. | {caches}"
     except Exception:
-        return "ChromaDB Status: Empty / Not Initialized"
+        return f"ChromaDB Status: Empty / Not Initialized | {caches}"
 
 
 class MCPNetworkMiddleware:
@@ -99,10 +151,15 @@ if __name__ == "__main__":
     # Create the Starlette/FastAPI app from FastMCP
     app = mcp.sse_app()
 
-    logger.info("Starting Agentic RAG MCP Server on port 8000")
+    logger.info(f"Starting Agentic RAG MCP Server on port {MCP_PORT}")
 
     # We use a 65s keep-alive timeout to stay alive just longer than the Agent's 60s
     # request_timeout. This prevents the SSE session from being torn down mid-request.
     uvicorn.run(
-        MCPNetworkMiddleware(app), host="0.0.0.0", port=8000, log_level="info", timeout_keep_alive=65, access_log=True
+        MCPNetworkMiddleware(app),
+        host="0.0.0.0",
+        port=MCP_PORT,
+        log_level="info",
+        timeout_keep_alive=65,
+        access_log=True,
     )
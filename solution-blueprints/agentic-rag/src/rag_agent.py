@@ -4,15 +4,17 @@
 
 import asyncio
 import re
-from typing import Annotated, Any, AsyncGenerator, Dict, List, Optional, TypedDict, cast
+from typing import Annotated, Any, AsyncGenerator, Dict, List, Optional, Set, Tuple, TypedDict, cast
 
 import config  # type: ignore[attr-defined]
 from backend import ingest_files  # type: ignore[attr-defined]
+from context_packer import ContextPacker  # type: ignore[attr-defined]
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_openai import ChatOpenAI
+from langgraph.config import get_config
 from langgraph.graph import END, START, StateGraph
 from mcp.client.session import ClientSession
-from mcp.client.sse import sse_client
+from mcp_pool import get_session_pool  # type: ignore[attr-defined]
 from pydantic import SecretStr
 from rag_prompts import (  # type: ignore[attr-defined]
     ANSWER_SYSTEM_PROMPT,
@@ -23,23 +25,23 @@ from rag_prompts import (  # type: ignore[attr-defined]
     MULTI_CHUNK_GRADER_PROMPT,
     NOT_FOUND_MESSAGE,
     SEARCH_FAILED_ADDENDUM,
+    SEARCH_FANOUT_ADDENDUM,
     SEARCH_FORCE_NUDGE,
     SEARCH_PARTIAL_ADDENDUM,
     SEARCH_SYSTEM_PROMPT,
 )
 
 from utils import (  # type: ignore[attr-defined]
+    CHUNK_SEP,
     COMPLETENESS_CHECK_TIMEOUT,
-    COMPLETENESS_CONTEXT_LIMIT,
     FOUND_PREVIEW_LIMIT,
-    GRADER_CHUNK_LIMIT,
-    GRADER_TEXT_LIMIT,
     GRADER_TIMEOUT,
     LLM_REQUEST_TIMEOUT,
     RETRIEVAL_TIMEOUT,
-    SESSION_INIT_TIMEOUT,
     content_hash,
+    extract_key_terms,
     logger,
+    merge_retrievals,
     stream_agent_events,
     strip_tool_calls,
 )
@@ -50,6 +52,13 @@ from utils import (  # type: ignore[attr-defined]
 MAX_SEARCHES = 3
 
 
+def _add_scores(x: Dict[str, float], y: Dict[str, float]) -> Dict[str, float]:
+    merged = dict(x)
+    for key, score in y.items():
+        merged[key] = merged.get(key, 0.0) + score
+    return merged
+
+
 # LangGraph state is the shared memory across all graph nodes.
 # Annotated fields with lambda x, y: x + y are ADDITIVE (each node appends, never overwrites).
 class AgentState(TypedDict):
@@ -58,6 +67,7 @@ class AgentState(TypedDict):
     search_count: Annotated[int, lambda x, y: x + y]  # Total searches so far (retrieve adds 1)
     context_pool: Annotated[List[str], lambda x, y: x + y]  # ALL retrieved text (for debugging)
     relevant_contexts: Annotated[List[str], lambda x, y: x + y]  # Only grader-approved text (used for answering)
+    chunk_scores: Annotated[Dict[str, float], _add_scores]  # Grader score per approved chunk (by content hash)
     past_queries: Annotated[List[str], lambda x, y: x + y]  # Previous search queries (for retry diversity)
     completeness_verdict: str  # Latest completeness check: "FULLY", "PARTIALLY", or ""
 
@@ -69,12 +79,25 @@ class RAGAgent:
     Dependencies (session, llm, tools_spec) are provided at construction time,
     making individual node methods independently testable.
     Use the async factory ``create()`` to build an instance with auto-discovered tools.
+    ``namespace`` selects the knowledge base the MCP tools operate on.
+
+    One agent and its compiled graph can serve many runs: a run's graph config may carry
+    ``configurable={"session": ..., "namespace": ...}``, which override the constructor's.
     """
 
-    def __init__(self, session: ClientSession, llm: ChatOpenAI, tools_spec: List[Dict[str, Any]]) -> None:
+    def __init__(
+        self,
+        session: Optional[ClientSession],
+        llm: ChatOpenAI,
+        tools_spec: List[Dict[str, Any]],
+        namespace: str = config.DEFAULT_NAMESPACE,
+    ) -> None:
         self.session = session
         self.llm = llm
         self.tools_spec = tools_spec
+        self.namespace = namespace
+        self.namespaced_tools: Set[str] = set()  # Tools whose `namespace` argument is filled in by the agent
+        self.packer = ContextPacker(config.get_context_tokenizer)  # Fits contexts into prompt token budgets
 
     @staticmethod
     async def discover_tools(session: ClientSession) -> List[Dict[str, Any]]:
@@ -95,24 +118,48 @@ class RAGAgent:
             specs.append(spec)
         return specs
 
+    @staticmethod
+    def hide_namespace(spec: Dict[str, Any]) -> bool:
+        """Remove the `namespace` parameter from a tool spec so the LLM never chooses it.
+        Returns True if the tool takes one."""
+        properties = spec.get("parameters", {}).get("properties", {})
+        if "namespace" not in properties:
+            return False
+        parameters = dict(spec["parameters"])
+        parameters["properties"] = {k: v for k, v in properties.items() if k != "namespace"}
+        if "required" in parameters:
+            parameters["required"] = [r for r in parameters["required"] if r != "namespace"]
+        spec["parameters"] = parameters
+        return True
+
     @classmethod
-    async def create(cls, session: ClientSession, llm: ChatOpenAI) -> "RAGAgent":
+    async def create(
+        cls, session: ClientSession, llm: ChatOpenAI, namespace: str = config.DEFAULT_NAMESPACE
+    ) -> "RAGAgent":
         """Async factory: discovers MCP tools and returns a ready-to-use agent."""
         tools_spec = await cls.discover_tools(session)
         logger.info(f"Discovered {len(tools_spec)} MCP tools: {[t['name'] for t in tools_spec]}")
-        return cls(session=session, llm=llm, tools_spec=tools_spec)
+        agent = cls(session=session, llm=llm, tools_spec=tools_spec, namespace=namespace)
+        agent.namespaced_tools = {spec["name"] for spec in tools_spec if cls.hide_namespace(spec)}
+        return agent
 
-    async def _check_completeness(self, user_question: str, relevant_contexts: List[str]) -> Optional[str]:
+    def _rank_contexts(self, relevant_contexts: List[str], chunk_scores: Dict[str, float]) -> List[str]:
+        """Grader-approved chunks best first (highest grader score, then earliest approved), without overlap."""
+        unique = list(dict.fromkeys(relevant_contexts))
+        ranked = sorted(unique, key=lambda c: -chunk_scores.get(content_hash(c), 0.0))
+        return self.packer.dedupe(ranked)
+
+    async def _check_completeness(self, user_question: str, ranked_contexts: List[str]) -> Optional[str]:
         """Ask the LLM whether the retrieved context fully answers the question.
 
         Returns:
             "FULLY" if the context is sufficient, "PARTIALLY" if more searching
             is needed, or None if the check failed (timeout/error).
         """
-        combined_check = "\n---\n".join(relevant_contexts)
+        packed = self.packer.pack(ranked_contexts, config.COMPLETENESS_CONTEXT_TOKENS)
         completeness_prompt = COMPLETENESS_PROMPT_TEMPLATE.format(
             question=user_question,
-            context=combined_check[:COMPLETENESS_CONTEXT_LIMIT],
+            context="\n---\n".join(packed),
         )
         try:
             check_res = await asyncio.wait_for(
@@ -132,13 +179,13 @@ class RAGAgent:
             logger.warning(f"Reasoner: Completeness check failed: {e}, proceeding to answer")
             return None
 
-    async def _synthesize_answer(self, user_question: str, relevant_contexts: List[str]) -> AIMessage:
+    async def _synthesize_answer(self, user_question: str, ranked_contexts: List[str]) -> AIMessage:
         """Generate a grounded answer using only grader-approved contexts.
 
         Uses a strict anti-hallucination prompt to ensure the answer
-        is derived solely from the retrieved context.
+        is derived solely from the retrieved context, packed best-first into ANSWER_CONTEXT_TOKENS.
         """
-        combined = "\n---\n".join(relevant_contexts)
+        combined = "\n---\n".join(self.packer.pack(ranked_contexts, config.ANSWER_CONTEXT_TOKENS))
         answer_prompt = [
             SystemMessage(content=ANSWER_SYSTEM_PROMPT),
             HumanMessage(content=user_question),
@@ -168,6 +215,8 @@ class RAGAgent:
                 )
             else:
                 search_instruction += SEARCH_FAILED_ADDENDUM.format(past_queries=past_list)
+        if config.FANOUT_QUERIES > 1:
+            search_instruction += SEARCH_FANOUT_ADDENDUM.format(n=config.FANOUT_QUERIES)
         search_prompt = [
             SystemMessage(content=search_instruction),
             HumanMessage(content=user_question),
@@ -206,6 +255,35 @@ class RAGAgent:
                 ],
             )
 
+        return self._fan_out(response, user_question, past_queries)
+
+    @staticmethod
+    def _fan_out(response: AIMessage, user_question: str, past_queries: List[str]) -> AIMessage:
+        """Top the search step up to FANOUT_QUERIES distinct retrieve_documents calls.
+
+        Models that emit a single tool call get cheap rewrites (the raw question, its key terms)
+        instead of another LLM round trip. Queries already tried in earlier steps are dropped.
+        """
+        limit = config.FANOUT_QUERIES
+        if limit <= 1:
+            return response
+        seen = {q.strip().lower() for q in past_queries}
+        calls = []
+        for call in response.tool_calls:
+            if call["name"] == "retrieve_documents":
+                query = str(call["args"].get("query", "")).strip().lower()
+                if not query or query in seen:
+                    continue
+                seen.add(query)
+            calls.append(call)
+        for i, query in enumerate([user_question, " ".join(extract_key_terms(user_question))]):
+            if query.strip() and query.strip().lower() not in seen:
+                seen.add(query.strip().lower())
+                calls.append(
+                    {"name": "retrieve_documents", "args": {"query": query}, "id": f"fanout_{i}", "type": "tool_call"}
+                )
+        if calls:
+            response.tool_calls = calls[:limit]
         return response
 
     async def reasoner(self, state: AgentState) -> Dict[str, Any]:
@@ -234,9 +312,10 @@ class RAGAgent:
         # Completeness check: only runs on the FIRST relevant hit (search_count < 2)
         # to decide if multi-part questions need more searching.
         # After 2 searches, we skip this check and answer with what we have.
+        ranked_contexts = self._rank_contexts(relevant_contexts, state.get("chunk_scores", {}))
         completeness_verdict = None
         if has_relevant and not hit_limit and search_count < 2:
-            completeness_verdict = await self._check_completeness(user_question, relevant_contexts)
+            completeness_verdict = await self._check_completeness(user_question, ranked_contexts)
             if completeness_verdict == "PARTIALLY":
                 has_relevant = False  # Force another search
 
@@ -257,7 +336,7 @@ class RAGAgent:
                     "completeness_verdict": completeness_verdict or "",
                 }
 
-            response = await self._synthesize_answer(user_question, relevant_contexts)
+            response = await self._synthesize_answer(user_question, ranked_contexts)
             return {
                 "messages": [response],
                 "completeness_verdict": completeness_verdict or "",
@@ -273,32 +352,51 @@ class RAGAgent:
             "completeness_verdict": completeness_verdict or "",
         }
 
-    async def tool_executor(self, state: AgentState) -> Dict[str, Any]:
-        """Generic MCP tool dispatcher - executes whatever tool the LLM chose.
-
-        Adding a new tool to the MCP server is all you need; this node
-        routes any tool_call to session.call_tool(name, args) automatically.
-        Returns the tool result and increments search_count by 1.
-        """
-        tool_call = cast(AIMessage, state["messages"][-1]).tool_calls[0]
+    def _run_context(self) -> Tuple[ClientSession, str]:
+        """MCP session and namespace of the current graph run."""
+        try:
+            configurable = get_config().get("configurable", {})
+        except RuntimeError:  # Called outside a graph run
+            configurable = {}
+        session = configurable.get("session") or self.session
+        if session is None:
+            raise RuntimeError("No MCP session: pass one to RAGAgent or in the run's configurable")
+        return session, configurable.get("namespace") or self.namespace
+
+    async def _call_tool(self, tool_call: Dict[str, Any]) -> str:
+        """Run one tool call over MCP; failures become an error string the grader will reject."""
         tool_name = tool_call["name"]
         tool_args = tool_call["args"]
         logger.info(f"ToolExecutor: calling '{tool_name}' with args={tool_args}")
         try:
+            session, namespace = self._run_context()
+            call_args = {**tool_args, "namespace": namespace} if tool_name in self.namespaced_tools else tool_args
             res = await asyncio.wait_for(
-                self.session.call_tool(tool_name, tool_args),
+                session.call_tool(tool_name, call_args),
                 timeout=RETRIEVAL_TIMEOUT,
             )
-            content = res.content[0].text  # type: ignore[union-attr]
+            return res.content[0].text  # type: ignore[union-attr]
         except Exception as e:
-            content = f"Error during {tool_name}: {str(e)}"
+            return f"Error during {tool_name}: {str(e)}"
+
+    async def tool_executor(self, state: AgentState) -> Dict[str, Any]:
+        """Generic MCP tool dispatcher - executes whatever tool(s) the LLM chose.
+
+        Adding a new tool to the MCP server is all you need; this node
+        routes any tool_call to session.call_tool(name, args) automatically.
+        A fan-out step carries several tool calls: they run concurrently over the
+        MCP session and their results are merged into one deduplicated retrieval.
+        Returns the tool results and increments search_count by 1.
+        """
+        tool_calls = cast(AIMessage, state["messages"][-1]).tool_calls
+        contents = await asyncio.gather(*(self._call_tool(call) for call in tool_calls))
+        merged = contents[0] if len(contents) == 1 else merge_retrievals(contents, config.FANOUT_MAX_CHUNKS)
 
-        search_query = tool_args.get("query", str(tool_args))
         return {
-            "messages": [ToolMessage(content=content, tool_call_id=tool_call["id"])],
-            "context_pool": [content],  # Keeps ALL retrievals (even grader-rejected) for log inspection
+            "messages": [ToolMessage(content=c, tool_call_id=call["id"]) for call, c in zip(tool_calls, contents)],
+            "context_pool": [merged],  # Keeps ALL retrievals (even grader-rejected) for log inspection
             "search_count": 1,  # Additive: LangGraph adds this to the running total
-            "past_queries": [search_query],  # Track for retry diversity
+            "past_queries": [call["args"].get("query", str(call["args"])) for call in tool_calls],  # Retry diversity
         }
 
     async def grader_node(self, state: AgentState) -> Dict[str, Any]:
@@ -309,12 +407,13 @@ class RAGAgent:
         On timeout/error -> defaults to YES to avoid losing good content.
         """
         user_q = state["messages"][0].content
-        last_message = state["messages"][-1]
-        last_retrieval = last_message.content if hasattr(last_message, "content") else ""
+        # The latest retrieval, merged across all queries of a fan-out step.
+        context_pool = state.get("context_pool", [])
+        last_retrieval = context_pool[-1] if context_pool else ""
 
         # Deduplication: if the same content was retrieved in a previous attempt,
         # skip the LLM grading call entirely and force a different search strategy.
-        prev_retrievals = state.get("context_pool", [])[:-1]  # all but the current retrieval
+        prev_retrievals = context_pool[:-1]  # all but the current retrieval
         current_sig = content_hash(last_retrieval[:500])
         prev_sigs = {content_hash(r[:500]) for r in prev_retrievals}
         if current_sig in prev_sigs:
@@ -327,7 +426,6 @@ class RAGAgent:
         # Split the retrieval blob into individual chunks for per-chunk grading.
         # This prevents a single off-topic chunk from causing the entire batch to be
         # rejected - each chunk is scored independently and only relevant ones are kept.
-        CHUNK_SEP = "\n\n---\n\n"
         chunks = [c.strip() for c in last_retrieval.split(CHUNK_SEP) if c.strip()]
 
         relevant_chunks: List[str] = []
@@ -336,7 +434,7 @@ class RAGAgent:
                 # Single chunk: use simple YES/NO grader (avoids the overhead of numbered format)
                 grader_prompt = GRADER_PROMPT_TEMPLATE.format(
                     question=user_q,
-                    text=(chunks[0] if chunks else last_retrieval)[:GRADER_TEXT_LIMIT],
+                    text=self.packer.truncate(chunks[0] if chunks else last_retrieval, config.GRADER_CONTEXT_TOKENS),
                 )
                 res = await asyncio.wait_for(self.llm.ainvoke(grader_prompt), timeout=GRADER_TIMEOUT)
                 raw = str(res.content).strip()
@@ -349,10 +447,14 @@ class RAGAgent:
             else:
                 # Multiple chunks: one LLM call scores all chunks at once.
                 # The LLM returns the indices of relevant chunks (e.g. "1, 3") or "NONE".
-                numbered = "\n\n".join(f"[{i + 1}]\n{chunk[:GRADER_CHUNK_LIMIT]}" for i, chunk in enumerate(chunks))
+                # Chunks arrive in retrieval rank order; the ones that do not fit the budget go ungraded.
+                graded = self.packer.pack(
+                    chunks, config.GRADER_CONTEXT_TOKENS, config.GRADER_CHUNK_TOKENS, separator="\n\n"
+                )
+                numbered = "\n\n".join(f"[{i + 1}]\n{chunk}" for i, chunk in enumerate(graded))
                 multi_prompt = MULTI_CHUNK_GRADER_PROMPT.format(
                     question=user_q,
-                    n=len(chunks),
+                    n=len(graded),
                     passages=numbered,
                 )
                 res = await asyncio.wait_for(self.llm.ainvoke(multi_prompt), timeout=GRADER_TIMEOUT)
@@ -362,7 +464,7 @@ class RAGAgent:
                     for token in re.split(r"[,\s]+", raw):
                         if token.isdigit():
                             idx = int(token) - 1
-                            if 0 <= idx < len(chunks):
+                            if 0 <= idx < len(graded) and chunks[idx] not in relevant_chunks:
                                 relevant_chunks.append(chunks[idx])
                 logger.info(f"Grader: {len(relevant_chunks)}/{len(chunks)} chunks passed")
         except Exception as e:
@@ -381,8 +483,11 @@ class RAGAgent:
         }
         # Only grader-approved chunks go into relevant_contexts, not the full blob.
         # This keeps the final answer grounded in the specific relevant passages.
+        # Each approval scores 1, plus up to 1 for the chunk's retrieval rank; scores add up across
+        # searches, so chunks approved more than once are packed first.
         if is_relevant:
             result["relevant_contexts"] = relevant_chunks
+            result["chunk_scores"] = {content_hash(c): 2.0 - chunks.index(c) / len(chunks) for c in relevant_chunks}
 
         return result
 
@@ -437,53 +542,72 @@ def create_llm() -> ChatOpenAI:
     )
 
 
-async def run_rag_agent(query: str, file_paths: Optional[List[str]] = None) -> AsyncGenerator[str, None]:
-    """Connect to MCP, optionally ingest files, and run the RAG agent graph.
+# The agent, its compiled graph and the ChatOpenAI client (with its connection pool) are built once
+# and shared by every question; each run passes its own MCP session and namespace in the graph config.
+_agent_cache: Dict[str, Any] = {}
+_agent_lock = asyncio.Lock()
+
+
+async def get_agent_app(session: ClientSession) -> Tuple[RAGAgent, Any]:
+    """Return the shared agent and compiled graph, discovering tools over ``session`` on first use."""
+    async with _agent_lock:
+        if "app" not in _agent_cache:
+            agent = await RAGAgent.create(session=session, llm=create_llm())
+            agent.session = None  # Runs supply their own session
+            await asyncio.to_thread(agent.packer.load)  # May download the tokenizer; keep it off the loop
+            _agent_cache["agent"] = agent
+            _agent_cache["app"] = agent.build_graph()
+        return _agent_cache["agent"], _agent_cache["app"]
 
+
+def reset_agent_cache() -> None:
+    """Forget the shared agent, so the next run rediscovers MCP tools (e.g. after a server redeploy)."""
+    _agent_cache.clear()
+
+
+async def run_rag_agent(
+    query: str, file_paths: Optional[List[str]] = None, namespace: str = config.DEFAULT_NAMESPACE
+) -> AsyncGenerator[str, None]:
+    """Run the RAG agent graph over the namespace's knowledge base, optionally ingesting files first.
+
+    Uses a pooled, already-initialized MCP session and the shared compiled graph.
     Yields trace events and the final answer as formatted strings.
     Retries on transient SSE/TaskGroup errors.
     """
-    mcp_headers = {"Connection": "keep-alive"}
     MAX_SESSION_RETRIES = 4
     RETRY_DELAY = 3.0  # seconds; doubles each attempt
 
     for attempt in range(1, MAX_SESSION_RETRIES + 1):
         try:
-            async with sse_client(url=config.MCP_URL, headers=mcp_headers) as (  # type: ignore[attr-defined]
-                read_stream,
-                write_stream,
-            ):
-                async with ClientSession(read_stream, write_stream) as session:
-                    await asyncio.wait_for(session.initialize(), timeout=SESSION_INIT_TIMEOUT)
-
-                    # STEP 1: INITIAL DATA SYNC
-                    if file_paths:
-                        async for event in ingest_files(session, file_paths):
-                            yield event
-
-                    # STEP 2: BUILD AGENT (tools auto-discovered from MCP)
-                    llm = create_llm()
-                    agent = await RAGAgent.create(session=session, llm=llm)
-                    agent_app = agent.build_graph()
-
-                    # HARD SAFETY NET: LangGraph recursion limit.
-                    # Each search cycle = 3 steps (reasoner + tool_executor + grader).
-                    # 3 cycles * 3 steps + 5 buffer = 14 max steps before LangGraph aborts.
-                    recursion_limit = (MAX_SEARCHES * 3) + 5
-
-                    # STEP 3: STREAM RESULTS
-                    initial_input = {
-                        "messages": [HumanMessage(content=query)],
-                        "context_pool": [],
-                        "relevant_contexts": [],
-                        "search_count": 0,
-                        "past_queries": [],
-                        "completeness_verdict": "",
-                    }
-
-                    async for event in stream_agent_events(agent_app, initial_input, recursion_limit):
+            async with get_session_pool().session() as session:
+                # STEP 1: INITIAL DATA SYNC
+                if file_paths:
+                    async for event in ingest_files(session, file_paths, namespace):
                         yield event
-                    return  # Completed successfully - exit retry loop
+
+                # STEP 2: GET AGENT (tools auto-discovered from MCP once, graph compiled once)
+                _, agent_app = await get_agent_app(session)
+
+                # HARD SAFETY NET: LangGraph recursion limit.
+                # Each search cycle = 3 steps (reasoner + tool_executor + grader).
+                # 3 cycles * 3 steps + 5 buffer = 14 max steps before LangGraph aborts.
+                recursion_limit = (MAX_SEARCHES * 3) + 5
+
+                # STEP 3: STREAM RESULTS
+                initial_input = {
+                    "messages": [HumanMessage(content=query)],
+                    "context_pool": [],
+                    "relevant_contexts": [],
+                    "chunk_scores": {},
+                    "search_count": 0,
+                    "past_queries": [],
+                    "completeness_verdict": "",
+                }
+
+                configurable = {"session": session, "namespace": namespace}
+                async for event in stream_agent_events(agent_app, initial_input, recursion_limit, configurable):
+                    yield event
+                return  # Completed successfully - exit retry loop
 
         except (KeyboardInterrupt, SystemExit):
             raise
@@ -491,6 +615,8 @@ async def run_rag_agent(query: str, file_paths: Optional[List[str]] = None) -> A
             # ExceptionGroup (raised by anyio's TaskGroup in Python 3.11+) inherits from
             # Exception, so it is caught here. KeyboardInterrupt/SystemExit are already
             # re-raised above. Log inner sub-exceptions for debugging.
+            # The failed session is not returned to the pool; tools are rediscovered on retry.
+            reset_agent_cache()
             inner = getattr(e, "exceptions", None)
             inner_str = f" | inner: {[type(x).__name__ + ': ' + str(x) for x in inner]}" if inner else ""
             delay = RETRY_DELAY * (2 ** (attempt - 1))
@@ -2,17 +2,15 @@
 #
 # SPDX-License-Identifier: MIT
 
-import asyncio
 import html
 
 import gradio as gr
 import uvicorn
 from backend import ingest_files  # type: ignore[attr-defined]
-from config import GRADIO_PORT, MCP_URL, TITLE  # type: ignore[attr-defined]
+from config import DEFAULT_NAMESPACE, GRADIO_PORT, MCP_URL, TITLE, kb_namespace  # type: ignore[attr-defined]
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
-from mcp.client.session import ClientSession
-from mcp.client.sse import sse_client
+from mcp_pool import get_session_pool  # type: ignore[attr-defined]
 from rag_agent import run_rag_agent
 
 from utils import get_service_health, setup_logging  # type: ignore[attr-defined]
@@ -38,9 +36,10 @@ async def api_process(request: Request):
     try:
         data = await request.json()
         question = data.get("question", "")
+        namespace = data.get("namespace") or DEFAULT_NAMESPACE
         final_answer = ""
 
-        async for chunk in run_rag_agent(question):
+        async for chunk in run_rag_agent(question, namespace=namespace):
             if "**Final Answer:**" in chunk:
                 final_answer = chunk.split("**Final Answer:**")[1].strip()
 
@@ -50,8 +49,9 @@ async def api_process(request: Request):
         return JSONResponse(status_code=500, content={"error": "Internal server error"})
 
 
-async def upload_to_kb(files):
-    """Upload files to the Knowledge Base without asking a question."""
+async def upload_to_kb(files, request: gr.Request):
+    """Upload files to the Knowledge Base without asking a question.
+    Only new or changed files are indexed; the existing knowledge base is kept."""
     if not files:
         return "<div style='color:red;'>No files selected. Please upload files first.</div>"
 
@@ -60,14 +60,11 @@ async def upload_to_kb(files):
 
     file_paths = [f.name for f in files]
     status_html = ""
-    mcp_headers = {"Connection": "keep-alive"}
 
     try:
-        async with sse_client(url=MCP_URL, headers=mcp_headers) as (read_stream, write_stream):
-            async with ClientSession(read_stream, write_stream) as session:
-                await asyncio.wait_for(session.initialize(), timeout=30.0)
-                async for event in ingest_files(session, file_paths):
-                    status_html += event
+        async with get_session_pool().session() as session:
+            async for event in ingest_files(session, file_paths, kb_namespace(request.session_hash)):
+                status_html += event
     except Exception as e:
         logger.error(f"Upload error: {e}")
         status_html += f"<div style='color:red;'>❌ Upload failed: {html.escape(str(e))}</div>"
@@ -75,24 +72,21 @@ async def upload_to_kb(files):
     return status_html
 
 
-async def clear_kb():
+async def clear_kb(request: gr.Request):
     """Clear the Knowledge Base."""
     if not get_service_health(MCP_URL):
         return "<div style='padding:10px; background:rgba(255,152,0,0.15); border-left:4px solid #ff9800;'>⚠️ <b>MCP Server not reachable.</b> Please wait and try again.</div>"
 
-    mcp_headers = {"Connection": "keep-alive"}
     try:
-        async with sse_client(url=MCP_URL, headers=mcp_headers) as (read_stream, write_stream):
-            async with ClientSession(read_stream, write_stream) as session:
-                await asyncio.wait_for(session.initialize(), timeout=30.0)
-                await session.call_tool("clear_database", {})
+        async with get_session_pool().session() as session:
+            await session.call_tool("clear_database", {"namespace": kb_namespace(request.session_hash)})
         return "<div style='padding:8px; background:rgba(76,175,80,0.15); border-left:3px solid #4caf50;'>✅ Knowledge Base cleared.</div>"
     except Exception as e:
         logger.error(f"Clear KB error: {e}")
         return f"<div style='color:red;'>❌ Failed to clear: {html.escape(str(e))}</div>"
 
 
-async def run_rag_ui(question):
+async def run_rag_ui(question, request: gr.Request):
     """The main UI bridge for the Agentic RAG generator.
     Files are NOT ingested here - use 'Upload to Knowledge Base' first."""
     q_text = question if question else ""
@@ -112,7 +106,7 @@ async def run_rag_ui(question):
     yield q_text, "🚀 <b>Agent Initializing...</b>", "", ""
 
     try:
-        async for chunk in run_rag_agent(q_text):
+        async for chunk in run_rag_agent(q_text, namespace=kb_namespace(request.session_hash)):
             # Check for final answer in the chunk
             if "**Final Answer:**" in chunk:
                 parts = chunk.split("**Final Answer:**")
@@ -95,6 +95,14 @@ SEARCH_SYSTEM_PROMPT = (
     "Do NOT answer from memory. Use the tool now."
 )
 
+# Appended in fan-out mode so one reasoner step yields several searches that run concurrently.
+# Placeholder: {n} - maximum number of parallel queries.
+SEARCH_FANOUT_ADDENDUM = (
+    "\n\nCall 'retrieve_documents' up to {n} times IN PARALLEL in this single response, "
+    "each with a differently phrased query: e.g. one close to the question's wording, "
+    "one using only its key nouns, and one using synonyms or related terms."
+)
+
 # Appended when we already have PARTIAL info and need more.
 # Placeholders: {past_queries} - comma-separated quoted list, {found_preview} - snippet.
 SEARCH_PARTIAL_ADDENDUM = (
@@ -2,12 +2,20 @@
 #
 # SPDX-License-Identifier: MIT
 
+import asyncio
+import concurrent.futures
 import hashlib
 import html
 import logging
-import time
-from typing import Any, AsyncGenerator, Dict, List
-
+import multiprocessing
+import os
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, List, Tuple
+
+import httpx
 import requests
 from langchain_community.document_loaders import PyMuPDFLoader, TextLoader
 
@@ -51,7 +59,7 @@ def get_service_health(mcp_url: str) -> bool:
 # TEXT PROCESSING:
 
 # Common English stop words filtered out during keyword extraction to improve retrieval quality.
-# Not exhaustive - the `len(w) > 2` check in extract_key_terms() also filters short words
+# Not exhaustive - the `len(w) > 2` check in tokenize_terms() also filters short words
 # like "a", "an", "as", "at", "be", "by", "do", "go", "if", "in", "is", "it", "no", "of",
 # "on", "or", "so", "to", "up", "we".
 STOP_WORDS = frozenset(
@@ -122,15 +130,21 @@ STOP_WORDS = frozenset(
 )
 
 
+def tokenize_terms(text: str) -> List[str]:
+    """
+    Splits text into meaningful lowercase terms, repeats included.
+    Shared by keyword extraction and the BM25 index so queries and chunks are tokenized alike.
+    """
+    clean = "".join(c if c.isalnum() else " " for c in text.lower())  # Remove punctuation
+    return [w for w in clean.split() if len(w) > 2 and w not in STOP_WORDS]  # Skip short/common words
+
+
 def extract_key_terms(text: str) -> List[str]:
     """
     Extracts deduplicated, meaningful keywords from text.
-    Used by the retrieval pipeline for logging and query analysis.
+    Used by the retrieval pipeline as the lexical (BM25) query and for logging.
     """
-    clean = "".join(c if c.isalnum() else " " for c in text.lower())  # Remove punctuation
-    words = clean.split()
-    important = [w for w in words if len(w) > 2 and w not in STOP_WORDS]  # Skip short/common words
-    return list(dict.fromkeys(important))  # Deduplicate while preserving insertion order
+    return list(dict.fromkeys(tokenize_terms(text)))  # Deduplicate while preserving insertion order
 
 
 def content_hash(text: str) -> str:
@@ -138,36 +152,258 @@ def content_hash(text: str) -> str:
     return hashlib.md5(text.encode()).hexdigest()
 
 
+# Separator between chunks in a retrieve_documents result.
+CHUNK_SEP = "\n\n---\n\n"
+
+
+def merge_retrievals(results: List[str], max_chunks: int) -> str:
+    """Merge several retrieve_documents results into one, deduplicated by content_hash.
+
+    Results are interleaved rank by rank, so each query's best chunks survive the max_chunks cap.
+    Empty and failed results are dropped; if nothing is left the first result is returned as-is.
+    """
+    ranked = [
+        [c.strip() for c in r.split(CHUNK_SEP) if c.strip()]
+        for r in results
+        if r and not r.startswith(("Error", "No relevant documents found"))
+    ]
+    seen = set()
+    merged: List[str] = []
+    for rank in range(max((len(chunks) for chunks in ranked), default=0)):
+        for chunks in ranked:
+            if rank < len(chunks) and len(merged) < max_chunks:
+                sig = content_hash(chunks[rank])
+                if sig not in seen:
+                    seen.add(sig)
+                    merged.append(chunks[rank])
+    if not merged:
+        return results[0] if results else ""
+    return CHUNK_SEP.join(merged)
+
+
 # DOCUMENT LOADING:
 
 
+def file_hash(path: str) -> str:
+    """MD5 of a file's bytes - the document manifest uses it to skip unchanged uploads."""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_doc(path: str) -> str | None:
+    """Load one PDF / TXT file into a raw text string, or None if it can't be read."""
+    try:
+        loader = PyMuPDFLoader(path) if path.endswith(".pdf") else TextLoader(path)
+        content = "\n".join([d.page_content for d in loader.load()])
+        logger.info(f"Loaded: {path} ({len(content)} chars)")
+        return content
+    except Exception as e:
+        logger.error(f"IO Error on {path}: {e}")
+        return None
+
+
 def load_docs(file_paths: List[str]) -> List[str]:
     """Load PDF / TXT files into raw text strings."""
     texts = []
     for path in file_paths:
-        try:
-            loader = PyMuPDFLoader(path) if path.endswith(".pdf") else TextLoader(path)
-            content = "\n".join([d.page_content for d in loader.load()])
+        content = load_doc(path)
+        if content is not None:
             texts.append(content)
-            logger.info(f"Loaded: {path} ({len(content)} chars)")
-        except Exception as e:
-            logger.error(f"IO Error on {path}: {e}")
     return texts
 
 
+_parse_pool: concurrent.futures.ProcessPoolExecutor | None = None
+
+
+def _get_parse_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Long-lived parser processes, started on first use. "spawn" keeps the UI server's threads out of the workers."""
+    global _parse_pool
+    if _parse_pool is None:
+        from config import INGEST_WORKERS
+
+        _parse_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max(1, INGEST_WORKERS), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _parse_pool
+
+
+async def stream_docs(file_paths: List[str]) -> AsyncGenerator[Tuple[str, str | None], None]:
+    """Parse files in the process pool and yield (path, text) as each one finishes, in completion order.
+
+    At most INGEST_WORKERS + INGEST_QUEUE_SIZE files are parsed ahead of the consumer, so
+    memory stays bounded however many files are uploaded. Unreadable files yield None.
+    """
+    from config import INGEST_QUEUE_SIZE, INGEST_WORKERS
+
+    loop = asyncio.get_running_loop()
+    pool = _get_parse_pool()
+    ahead = max(1, INGEST_WORKERS) + max(1, INGEST_QUEUE_SIZE)
+    pending = iter(file_paths)
+    in_flight: Dict[asyncio.Future, str] = {}
+
+    def submit_next() -> None:
+        path = next(pending, None)
+        if path is not None:
+            in_flight[loop.run_in_executor(pool, load_doc, path)] = path
+
+    for _ in range(ahead):
+        submit_next()
+    try:
+        while in_flight:
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                path = in_flight.pop(future)
+                try:
+                    text = future.result()
+                except Exception as e:  # e.g. a worker killed by a pathological PDF
+                    logger.error(f"Parser failed on {path}: {e}")
+                    text = None
+                submit_next()
+                yield path, text
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+# CACHING:
+
+
+class LRUCache:
+    """Bounded in-memory LRU map with hit/miss counters. Safe to share across threads."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: OrderedDict[Any, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any | None:
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> str:
+        lookups = self.hits + self.misses
+        rate = f"{100 * self.hits / lookups:.0f}%" if lookups else "n/a"
+        return f"{self.hits}/{lookups} hits ({rate}), {len(self._items)} entries"
+
+
+def normalize_query(query: str) -> str:
+    """Cache key form of a query: case-folded, with whitespace collapsed."""
+    return " ".join(query.split()).casefold()
+
+
 # EMBEDDING (reusable across DB backends):
 
 
+class EmbeddingCache:
+    """
+    Persistent embedding store keyed by (model, content_hash(text)), backed by SQLite.
+    Vectors are stored as float32 blobs. Safe to share across threads.
+    """
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL, PRIMARY KEY (model, hash)"
+            ") WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            # Stay well under SQLite's bound-parameter limit.
+            for i in range(0, len(hashes), 500):
+                part = hashes[i : i + 500]
+                placeholders = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    (model, *part),
+                ).fetchall()
+                for h, blob in rows:
+                    vec = array("f")
+                    vec.frombytes(blob)
+                    found[h] = vec.tolist()
+            self.hits += len(found)
+            self.misses += len(hashes) - len(found)
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        rows = [(model, h, array("f", vec).tobytes()) for h, vec in items.items()]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings (model, hash, vector) VALUES (?, ?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # Autocommit connection: without this the open transaction breaks every later BEGIN.
+                self._conn.execute("ROLLBACK")
+                raise
+
+
 class RemoteEmbeddingFunction:
     """
     Calls an OpenAI-compatible embedding endpoint (e.g. vLLM).
     Implements both the ChromaDB EmbeddingFunction protocol and
-    the LangChain Embeddings interface.
+    the LangChain Embeddings interface (sync and async).
+
+    Requests go through one pooled httpx.AsyncClient owned by a background
+    event loop, so sync callers (Chroma, LangChain) and async callers share
+    the same connections. Inputs are split into batches of EMBED_BATCH_SIZE
+    and sent with at most EMBED_MAX_CONCURRENCY requests in flight.
+
+    Inputs already in the EmbeddingCache (EMBED_CACHE_PATH) are never re-sent,
+    and recent query embeddings are kept in an in-memory LRU.
     """
 
     def __init__(self, url: str, model: str):
+        from config import EMBED_BATCH_SIZE, EMBED_CACHE_PATH, EMBED_MAX_CONCURRENCY, EMBED_QUERY_CACHE_SIZE
+
         self.url = url  # OpenAI-compatible /embeddings endpoint
         self.model = model  # Model name served by the endpoint (e.g. "intfloat/multilingual-e5-large-instruct")
+        self.batch_size = max(1, EMBED_BATCH_SIZE)
+        self.max_concurrency = max(1, EMBED_MAX_CONCURRENCY)
+        self._loop: asyncio.AbstractEventLoop | None = None  # Background loop that owns the HTTP pool
+        self._client: httpx.AsyncClient | None = None  # Created lazily on the background loop
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop_lock = threading.Lock()
+
+        self.cache: EmbeddingCache | None = None
+        if EMBED_CACHE_PATH:
+            try:
+                self.cache = EmbeddingCache(EMBED_CACHE_PATH)
+            except Exception as e:
+                logger.warning(f"Embedding cache disabled, could not open {EMBED_CACHE_PATH}: {e}")
+        self.query_cache = LRUCache(EMBED_QUERY_CACHE_SIZE)
 
     # ChromaDB protocol - called when Chroma needs to embed documents internally
     def __call__(self, input: List[str]) -> List[List[float]]:
@@ -178,6 +414,25 @@ class RemoteEmbeddingFunction:
         return self._embed(texts)
 
     def embed_query(self, text: str) -> List[float]:
+        text = self._query_text(text)
+        vec = self.query_cache.get(text)
+        if vec is None:
+            vec = self._embed([text])[0]
+            self.query_cache.put(text, vec)
+        return vec
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await asyncio.wrap_future(self._submit(texts))
+
+    async def aembed_query(self, text: str) -> List[float]:
+        text = self._query_text(text)
+        vec = self.query_cache.get(text)
+        if vec is None:
+            vec = (await asyncio.wrap_future(self._submit([text])))[0]
+            self.query_cache.put(text, vec)
+        return vec
+
+    def _query_text(self, text: str) -> str:
         # E5-instruct queries require a task instruction; passages stay raw.
         # See https://huggingface.co/intfloat/multilingual-e5-large-instruct
         if "e5" in self.model.lower() and "instruct" in self.model.lower():
@@ -185,40 +440,104 @@ class RemoteEmbeddingFunction:
                 "Instruct: Given a question, retrieve passages from the "
                 "knowledge base that answer it\nQuery: " + text
             )
-        return self._embed([text])[0]
+        return text
 
     def _embed(self, texts: List[str]) -> List[List[float]]:
-        from config import BACKOFF_FACTOR, INITIAL_DELAY, MAX_RETRIES, get_embed_tokenizer
+        # Blocks the calling thread only; the batches themselves run concurrently on the background loop.
+        return self._submit(texts).result()
+
+    def _submit(self, texts: List[str]) -> concurrent.futures.Future:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="embedding-client", daemon=True).start()
+                self._loop = loop
+        return asyncio.run_coroutine_threadsafe(self._embed_async(list(texts)), self._loop)
+
+    async def _embed_async(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        if self._client is None:
+            from config import EMBEDDING_TIMEOUT
+
+            self._client = httpx.AsyncClient(
+                timeout=EMBEDDING_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency, max_keepalive_connections=self.max_concurrency
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Identical inputs (re-uploads, repeated chunks) are embedded once and served from the cache afterwards.
+        hashes = [content_hash(t) for t in texts]
+        unique = dict(zip(hashes, texts))
+        known: Dict[str, List[float]] = {}
+        if self.cache is not None:
+            known = await asyncio.to_thread(self.cache.get_many, self.model, list(unique))
+        missing = [h for h in unique if h not in known]
+        if missing:
+            pending = [unique[h] for h in missing]
+            batches = [pending[i : i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+            results = await asyncio.gather(*(self._embed_batch(batch) for batch in batches))
+            fresh = dict(zip(missing, (emb for batch in results for emb in batch)))
+            if self.cache is not None:
+                try:
+                    await asyncio.to_thread(self.cache.put_many, self.model, fresh)
+                except Exception as e:
+                    # The cache is best-effort; the fresh vectors are still returned.
+                    logger.warning(f"Embedding cache write failed, {len(fresh)} vectors not cached: {e}")
+            known.update(fresh)
+        if len(texts) > 1:
+            logger.info(f"Embedded {len(texts)} inputs: {len(unique) - len(missing)} cached, {len(missing)} sent")
+        return [known[h] for h in hashes]
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        assert self._semaphore is not None
+        async with self._semaphore:
+            # Tokenize off the loop so the next batch's tokenization overlaps in-flight requests.
+            texts = await asyncio.to_thread(self._truncate, texts)
+            return await self._post(texts)
+
+    @staticmethod
+    def _truncate(texts: List[str]) -> List[str]:
+        """Defensive truncation: caps each input under the embedding model's max
+        tokens so a single oversize string can't crash the whole batch."""
+        from config import EMBED_MAX_TOKENS, get_embed_tokenizer
 
-        # Defensive truncation: caps each input under the embedding model's max
-        # tokens so a single oversize string can't crash the whole batch.
         tok = get_embed_tokenizer()
-        if tok is not None:
-            from config import EMBED_MAX_TOKENS
-
-            budget = EMBED_MAX_TOKENS - 16  # margin for special / instruction tokens
-            truncated: List[str] = []
-            for t in texts:
-                ids = tok.encode(t, add_special_tokens=False)
-                if len(ids) > budget:
-                    t = tok.decode(ids[:budget], skip_special_tokens=True)
-                truncated.append(t)
-            texts = truncated
-
+        if tok is None:
+            return texts
+        budget = EMBED_MAX_TOKENS - 16  # margin for special / instruction tokens
+        # One batched call: fast (Rust) tokenizers encode the whole list in parallel.
+        encoded = tok(texts, add_special_tokens=False)["input_ids"]
+        over = [i for i, ids in enumerate(encoded) if len(ids) > budget]
+        if not over:
+            return texts
+        truncated = list(texts)
+        decoded = tok.batch_decode([encoded[i][:budget] for i in over], skip_special_tokens=True)
+        for i, text in zip(over, decoded):
+            truncated[i] = text
+        return truncated
+
+    async def _post(self, texts: List[str]) -> List[List[float]]:
+        from config import BACKOFF_FACTOR, INITIAL_DELAY, MAX_RETRIES
+
+        assert self._client is not None
         payload = {"model": self.model, "input": texts}
         delay = INITIAL_DELAY
         for attempt in range(1, MAX_RETRIES + 1):
             try:
-                resp = requests.post(self.url, json=payload, timeout=60)
+                resp = await self._client.post(self.url, json=payload)
                 resp.raise_for_status()
-                return [item["embedding"] for item in resp.json()["data"]]
-            except requests.RequestException:
+                data = sorted(resp.json()["data"], key=lambda item: item.get("index", 0))
+                return [item["embedding"] for item in data]
+            except httpx.HTTPError:
                 if attempt == MAX_RETRIES:
                     raise
                 logger.warning(
                     "Embedding request failed (attempt %d/%d), retrying in %.1fs", attempt, MAX_RETRIES, delay
                 )
-                time.sleep(delay)
+                await asyncio.sleep(delay)
                 delay *= BACKOFF_FACTOR
         raise RuntimeError("Unreachable")
 
@@ -231,11 +550,8 @@ COMPLETENESS_CHECK_TIMEOUT = 10.0
 GRADER_TIMEOUT = 15.0
 RETRIEVAL_TIMEOUT = 20.0
 
-# TRUNCATION LIMITS (characters):
+# PREVIEW LIMITS (characters; prompt context is budgeted in tokens by context_packer.py):
 
-COMPLETENESS_CONTEXT_LIMIT = 4000
-GRADER_TEXT_LIMIT = 8000
-GRADER_CHUNK_LIMIT = 2000  # Per-chunk character limit when grading individual passages
 FOUND_PREVIEW_LIMIT = 300
 RETRIEVAL_PREVIEW_LIMIT = 75
 
@@ -320,18 +636,18 @@ def format_trace_event(event_type: str, data: Dict[str, Any]) -> str:
 
 
 async def stream_agent_events(
-    agent_app, initial_input: Dict[str, Any], recursion_limit: int
+    agent_app, initial_input: Dict[str, Any], recursion_limit: int, configurable: Dict[str, Any] | None = None
 ) -> AsyncGenerator[str, None]:
     """Stream graph execution events, yielding formatted trace strings for the UI.
 
     Handles both "values" events (state snapshots for tracking search_count)
     and "updates" events (per-node diffs for trace display).
+    ``configurable`` carries per-run dependencies (MCP session, namespace) into a shared compiled graph.
     """
     search_count = 0
+    run_config = {"recursion_limit": recursion_limit, "configurable": configurable or {}}
 
-    async for mode, event in agent_app.astream(
-        initial_input, stream_mode=["updates", "values"], config={"recursion_limit": recursion_limit}
-    ):
+    async for mode, event in agent_app.astream(initial_input, stream_mode=["updates", "values"], config=run_config):
         if mode == "values":
             search_count = event.get("search_count", 0)
             continue
@@ -360,13 +676,15 @@ async def stream_agent_events(
                     if not (hasattr(msg, "tool_calls") and msg.tool_calls):
                         yield f"\n**Final Answer:**\n{msg.content}"
                     else:
+                        n_calls = len(msg.tool_calls)
+                        searches = f"{n_calls} searches in parallel" if n_calls > 1 else "search"
                         yield format_trace_event(
-                            "status", {"message": f"Executing search... (Attempt {search_count + 1})"}
+                            "status", {"message": f"Executing {searches}... (Attempt {search_count + 1})"}
                         )
 
             elif node_name == "tool_executor":
-                if "messages" in update_data:
-                    content = update_data["messages"][0].content
+                if update_data.get("context_pool"):
+                    content = update_data["context_pool"][-1]  # Merged result of all queries in this step
                     preview = (
                         (content[:RETRIEVAL_PREVIEW_LIMIT] + "...")
                         if len(content) > RETRIEVAL_PREVIEW_LIMIT
@@ -0,0 +1,14 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import sys
+from pathlib import Path
+
+# The services run from src/ with flat imports, see templates/configmap.yaml
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+# Read at import time; the tests never reach these services.
+os.environ.setdefault("EMBEDDING_URL", "http://embedding.invalid/v1/embeddings")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
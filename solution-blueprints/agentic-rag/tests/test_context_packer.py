@@ -0,0 +1,72 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+from context_packer import CHARS_PER_TOKEN, MIN_PARTIAL_TOKENS, TRUNCATION_MARK, ContextPacker
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word."""
+
+    def encode(self, text, add_special_tokens=False):
+        return text.split()
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+
+def _words(n: int, word: str = "word") -> str:
+    return " ".join(f"{word}{i}" for i in range(n))
+
+
+def test_counts_with_tokenizer_or_character_estimate():
+    estimating = ContextPacker()
+    estimating.load()
+    assert estimating.count("x" * 10) == -(-10 // CHARS_PER_TOKEN)
+
+    packer = ContextPacker(WordTokenizer)
+    packer.load()
+    assert packer.count(_words(7)) == 7
+
+
+def test_tokenizer_load_failure_falls_back_to_estimate():
+    def broken():
+        raise OSError("no tokenizer")
+
+    packer = ContextPacker(broken)
+    packer.load()
+    assert packer.count("x" * 9) == 3
+
+
+def test_truncate_marks_the_cut():
+    packer = ContextPacker(WordTokenizer)
+    packer.load()
+    text = _words(100)
+    assert packer.truncate(text, 200) == text
+    cut = packer.truncate(text, 10)
+    assert cut.endswith(TRUNCATION_MARK)
+    assert packer.count(cut) <= 10
+
+
+def test_dedupe_drops_contained_chunks_and_trims_overlap():
+    shared = "The accelerator ships with 192 GB of HBM3 memory on package."
+    first = f"[Source: a.txt] Intro text. {shared}"
+    second = f"[Source: a.txt] {shared} Bandwidth reaches 5.3 TB/s."
+    other_source = f"[Source: b.txt] {shared}"
+    deduped = ContextPacker.dedupe([first, second, first, other_source])
+    assert deduped == [first, "[Source: a.txt] Bandwidth reaches 5.3 TB/s.", other_source]
+
+
+def test_pack_respects_budget_and_truncates_the_first_misfit():
+    packer = ContextPacker(WordTokenizer)
+    packer.load()
+    chunks = [_words(100, "a"), _words(100, "b"), _words(100, "c")]
+    separator = "\n---\n"  # one token for WordTokenizer
+    packed = packer.pack(chunks, budget=100 + 1 + MIN_PARTIAL_TOKENS + 10, separator=separator)
+    assert packed[0] == chunks[0]
+    assert len(packed) == 2 and packed[1].endswith(TRUNCATION_MARK)
+    assert sum(packer.count(c) for c in packed) + 1 <= 100 + 1 + MIN_PARTIAL_TOKENS + 10
+
+    # Too little room left for a useful partial chunk: the rest is dropped.
+    assert packer.pack(chunks, budget=100 + 10, separator=separator) == [chunks[0]]
+    assert all(packer.count(c) <= 20 for c in packer.pack(chunks, budget=1000, chunk_budget=20))
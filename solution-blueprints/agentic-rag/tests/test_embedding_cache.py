@@ -0,0 +1,50 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import sqlite3
+
+import config
+import pytest
+from utils import EmbeddingCache, RemoteEmbeddingFunction, content_hash  # type: ignore[attr-defined]
+
+MODEL = "test-model"
+
+
+def _fail_inserts_of(cache: EmbeddingCache, bad_hash: str) -> None:
+    cache._conn.execute(
+        "CREATE TRIGGER fail_insert BEFORE INSERT ON embeddings "
+        f"WHEN NEW.hash = '{bad_hash}' BEGIN SELECT RAISE(ABORT, 'injected failure'); END"
+    )
+
+
+def test_failed_put_rolls_back_and_next_put_succeeds(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "embeddings.sqlite"))
+    _fail_inserts_of(cache, "bad")
+
+    with pytest.raises(sqlite3.DatabaseError):
+        cache.put_many(MODEL, {"good": [1.0, 2.0], "bad": [3.0, 4.0]})
+    assert not cache._conn.in_transaction
+    assert cache.get_many(MODEL, ["good"]) == {}
+
+    cache.put_many(MODEL, {"good": [1.0, 2.0]})
+    assert cache.get_many(MODEL, ["good"]) == {"good": [1.0, 2.0]}
+
+
+def test_embedding_survives_cache_write_failure(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "EMBED_CACHE_PATH", str(tmp_path / "embeddings.sqlite"))
+    embedder = RemoteEmbeddingFunction("http://embedding.invalid/v1/embeddings", MODEL)
+    sent = []
+
+    async def embed_batch(texts):
+        sent.extend(texts)
+        return [[float(len(t))] for t in texts]
+
+    monkeypatch.setattr(embedder, "_embed_batch", embed_batch)
+    _fail_inserts_of(embedder.cache, content_hash("broken"))
+
+    assert embedder.embed_documents(["ok", "broken"]) == [[2.0], [6.0]]
+    # The failed write left nothing behind; the retry is sent again and then cached.
+    assert embedder.embed_documents(["ok"]) == [[2.0]]
+    assert embedder.embed_documents(["ok"]) == [[2.0]]
+    assert sent == ["ok", "broken", "ok"]
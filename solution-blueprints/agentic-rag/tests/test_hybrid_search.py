@@ -0,0 +1,61 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import numpy as np
+from hybrid_search import BM25Index, mmr_select, reciprocal_rank_fusion
+
+
+def _index() -> BM25Index:
+    index = BM25Index()
+    index.add(
+        ["gpu", "cpu", "mixed"],
+        [
+            "The MI300X accelerator has HBM3 memory and runs ROCm kernels",
+            "The EPYC processor has many cores for server workloads",
+            "ROCm also supports EPYC hosts that drive MI300X accelerators",
+        ],
+        [{"source": "gpu.txt"}, {"source": "cpu.txt"}, None],
+    )
+    return index
+
+
+def test_bm25_ranks_matching_chunks_only():
+    index = _index()
+    results = index.search(["hbm3", "rocm"], k=10)
+    assert [cid for cid, _ in results] == ["gpu", "mixed"]
+    assert results[0][1] > results[1][1]
+    assert index.search(["unrelated"], k=10) == []
+    assert index.search([], k=10) == []
+    assert index.documents["mixed"][1] == {}
+
+
+def test_bm25_replace_and_remove_update_postings():
+    index = _index()
+    index.add(["gpu"], ["Now this chunk is about networking"], [{"source": "gpu.txt"}])
+    assert len(index) == 3
+    assert [cid for cid, _ in index.search(["hbm3"], k=10)] == []
+    assert [cid for cid, _ in index.search(["networking"], k=10)] == ["gpu"]
+
+    index.remove(["gpu", "cpu", "missing"])
+    assert len(index) == 1
+    assert index.search(["networking", "cores"], k=10) == []
+    assert [cid for cid, _ in index.search(["rocm"], k=10)] == ["mixed"]
+    index.remove(["mixed"])
+    assert index.search(["rocm"], k=10) == []  # empty index, no division by zero
+
+
+def test_rrf_rewards_agreement_between_rankings():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]])
+    assert [cid for cid, _ in fused][:1] == ["b"]
+    assert {cid for cid, _ in fused} == {"a", "b", "c", "d"}
+
+
+def test_mmr_skips_near_duplicates():
+    vectors = np.array([[1.0, 0.0], [0.99, 0.01], [0.0, 1.0]])
+    relevance = np.array([1.0, 0.95, 0.6])
+    assert mmr_select(vectors, relevance, k=2, lambda_mult=0.5) == [0, 2]
+    assert mmr_select(vectors, relevance, k=2, lambda_mult=1.0) == [0, 1]  # pure relevance
+    assert mmr_select(vectors, relevance, k=10) == [0, 2, 1]  # never more than the candidates
+    assert mmr_select(vectors, relevance, k=0) == []
+    assert mmr_select(np.zeros((0, 2)), np.zeros(0), k=3) == []
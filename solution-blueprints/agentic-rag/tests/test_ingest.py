@@ -0,0 +1,54 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import backend
+import pytest
+
+
+class FailingSession:
+    """MCP session whose manifest is empty and whose document syncs fail."""
+
+    async def call_tool(self, name, arguments):
+        return SimpleNamespace(content=[SimpleNamespace(text=json.dumps({}))])
+
+    async def send_request(self, request, result_type):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("sync_document_stream failed")
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"doc{i}.txt"
+        path.write_text(f"document {i}")
+        paths.append(str(path))
+
+    async def stream_docs(file_paths):
+        for path in file_paths:
+            yield path, f"text of {path}"
+
+    monkeypatch.setattr(backend, "stream_docs", stream_docs)
+    monkeypatch.setattr(backend.config, "INGEST_QUEUE_SIZE", 1)
+    monkeypatch.setattr(backend.config, "INGEST_CONCURRENCY", 2)
+    return paths
+
+
+def test_store_failure_stops_the_pipeline(files):
+    async def scenario():
+        events = []
+        async with asyncio.timeout(10):
+            with pytest.raises(RuntimeError, match="sync_document_stream failed"):
+                async for event in backend.ingest_files(FailingSession(), files):
+                    events.append(event)
+        # The parser was blocked on the full queue; it must have been cancelled, not left waiting.
+        return events, asyncio.all_tasks() - {asyncio.current_task()}
+
+    events, leftover = asyncio.run(scenario())
+    assert leftover == set()
+    assert "Processing 20 new or changed files" in events[0]
@@ -0,0 +1,112 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import hashlib
+import uuid
+
+import backend
+import chromadb
+import pytest
+
+
+class FakeEmbeddings:
+    """Deterministic embeddings; raises once ``fail_after`` documents have been embedded."""
+
+    batch_size = 2
+    max_concurrency = 1
+
+    def __init__(self, fail_after: int | None = None):
+        self.fail_after = fail_after
+        self.embedded = 0
+
+    def _vector(self, text: str) -> list[float]:
+        digest = hashlib.sha256(text.encode()).digest()
+        return [b / 255 for b in digest[:8]]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        if self.fail_after is not None and self.embedded + len(texts) > self.fail_after:
+            raise RuntimeError("embedding server down")
+        self.embedded += len(texts)
+        return [self._vector(t) for t in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._vector(text)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embed_documents(texts)
+
+
+@pytest.fixture
+def kb(monkeypatch) -> backend.KnowledgeBase:
+    monkeypatch.setattr(backend.config, "get_embed_model", lambda: "test-model")
+    monkeypatch.setattr(backend.config, "get_embed_tokenizer", lambda: None)
+    monkeypatch.setattr(backend.config, "CHUNK_SIZE", 50)  # 100 characters without a tokenizer
+    monkeypatch.setattr(backend.config, "CHUNK_OVERLAP", 0)
+    monkeypatch.setattr(backend.config, "KB_READY_TIMEOUT", 0)
+    kb = backend.KnowledgeBase()
+    kb._client = chromadb.EphemeralClient()
+    kb.collection_name = f"test_{uuid.uuid4().hex}"
+    kb.embedding_function = FakeEmbeddings()
+    return kb
+
+
+def _text(*paragraphs: str) -> str:
+    # One chunk per paragraph
+    return "\n\n".join(p * 15 for p in paragraphs)
+
+
+def _chunks(kb: backend.KnowledgeBase, source: str) -> dict[str, str]:
+    found = kb._get_vector_store()._collection.get(where={"source": source}, include=["metadatas"])
+    return {cid: meta["file_hash"] for cid, meta in zip(found["ids"], found["metadatas"])}
+
+
+V1 = _text("alpha ", "beta ", "gamma ")
+V2 = _text("alpha ", "delta ", "gamma ", "epsilon ")
+
+
+def test_sync_replaces_stale_chunks_and_updates_kept(kb):
+    kb.sync_document(V1, "doc.txt", file_hash="v1")
+    stats = kb.sync_document(V2, "doc.txt", file_hash="v2")
+    assert stats["added"] > 0 and stats["removed"] > 0 and stats["kept"] > 0
+    assert set(_chunks(kb, "doc.txt").values()) == {"v2"}
+    assert kb.document_hashes(["doc.txt", "missing.txt"]) == {"doc.txt": "v2"}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_failed_embedding_keeps_previous_version(kb, stream):
+    kb.sync_document(V1, "doc.txt", file_hash="v1")
+    before = _chunks(kb, "doc.txt")
+
+    kb.embedding_function.fail_after = kb.embedding_function.embedded
+    with pytest.raises(RuntimeError):
+        if stream:
+            asyncio.run(kb.sync_document_stream(V2, "doc.txt", file_hash="v2"))
+        else:
+            kb.sync_document(V2, "doc.txt", file_hash="v2")
+
+    assert _chunks(kb, "doc.txt") == before
+    assert kb.document_hashes(["doc.txt"]) == {"doc.txt": "v1"}
+
+
+def test_interrupted_stream_is_not_reported_as_synced(kb):
+    kb.sync_document(V1, "doc.txt", file_hash="v1")
+    kb.embedding_function.fail_after = kb.embedding_function.embedded + FakeEmbeddings.batch_size  # 2nd window fails
+    with pytest.raises(RuntimeError):
+        asyncio.run(kb.sync_document_stream(_text("one ", "two ", "three ", "four ", "five "), "doc.txt", "v2"))
+
+    assert {"v1", "v2"} <= set(_chunks(kb, "doc.txt").values())
+    assert kb.document_hashes(["doc.txt"]) == {}  # synced again on the next ingest
+
+
+def test_failed_stream_leaves_no_write_in_flight(kb):
+    kb.embedding_function.fail_after = FakeEmbeddings.batch_size  # second window fails
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            await kb.sync_document_stream(V2, "doc.txt", file_hash="v2")
+        return asyncio.all_tasks() - {asyncio.current_task()}
+
+    assert asyncio.run(scenario()) == set()
+    assert len(_chunks(kb, "doc.txt")) == FakeEmbeddings.batch_size  # the first window's write completed
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""Micro-benchmark for embedding-classifier scoring as the policy class count grows.
+
+Compares the previous per-request path (``class_names.index`` loop plus ``np.array`` over the
+filtered rows) with the precomputed per-policy ``ClassView`` used by ``classifierApp.embeddingClient``.
+Only scoring is timed; the embedding call is excluded.
+
+Usage: class_scoring_bench.py [--dim 1024] [--classes 2,4,8,...] [--iterations 20000] [--json out.json]
+Requires the classifier requirements (numpy, httpx, pydantic) to be installed.
+"""
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "classifier"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from classifierApp import embeddingClient as ec  # noqa: E402
+
+
+def legacy_scores(query_emb, classes):
+    filtered_embs_list = []
+    for cls in classes:
+        if cls in ec.class_names:
+            idx = ec.class_names.index(cls)
+            filtered_embs_list.append(ec.class_embeddings[idx])
+    filtered_embs = np.array(filtered_embs_list)
+    similarities = np.dot(filtered_embs, query_emb)
+    return int(np.argmax(similarities))
+
+
+def view_scores(query_emb, classes):
+    view = ec.get_class_view(classes)
+    similarities = view.matrix @ query_emb
+    return int(np.argmax(similarities))
+
+
+def run(dim, class_counts, iterations, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for n_classes in class_counts:
+        names = [f"class-{i}" for i in range(n_classes)]
+        embs = ec.normalize_embeddings(rng.standard_normal((n_classes, dim)).astype(np.float32))
+        ec.class_names = names
+        ec.class_embeddings = np.ascontiguousarray(embs, dtype=np.float32)
+        ec.class_index = {name: i for i, name in enumerate(names)}
+        ec.class_views = {}
+        ec.get_class_view(names)
+
+        query = ec.normalize_embeddings(rng.standard_normal((1, dim)).astype(np.float32))[0]
+        assert legacy_scores(query, names) == view_scores(query, names)
+
+        legacy = min(timeit.repeat(lambda: legacy_scores(query, names), number=iterations, repeat=3)) / iterations
+        cached = min(timeit.repeat(lambda: view_scores(query, names), number=iterations, repeat=3)) / iterations
+        rows.append(
+            {
+                "classes": n_classes,
+                "legacy_us": legacy * 1e6,
+                "precomputed_us": cached * 1e6,
+                "speedup": legacy / cached if cached else None,
+            }
+        )
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dim", type=int, default=1024, help="embedding dimension")
+    parser.add_argument("--classes", default="2,4,8,16,32,64,128,256", help="comma-separated class counts")
+    parser.add_argument("--iterations", type=int, default=20000, help="classifications per timing run")
+    parser.add_argument("--json", dest="json_path", help="write results to this JSON file")
+    args = parser.parse_args()
+
+    class_counts = [int(c) for c in args.classes.split(",") if c.strip()]
+    rows = run(args.dim, class_counts, args.iterations)
+
+    print(f"{'classes':>8} {'legacy (us)':>12} {'precomputed (us)':>17} {'speedup':>8}")
+    for row in rows:
+        print(f"{row['classes']:>8} {row['legacy_us']:>12.2f} {row['precomputed_us']:>17.2f} {row['speedup']:>7.1f}x")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump({"dim": args.dim, "iterations": args.iterations, "results": rows}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
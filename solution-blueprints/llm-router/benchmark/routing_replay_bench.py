@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""Replay recorded chat traces through the router and measure its overhead.
+
+Starts ``stub_servers.py`` (embeddings, classifier LLM and generation backend), the real router-classifier and
+router-controller as local processes, then replays a JSONL trace at each concurrency level: once straight to the
+stub backend as a baseline and once through the controller. Reported per classifier approach and concurrency:
+
+* ``routing_overhead_ms`` / ``classifier_ms`` - from the controller's ``Server-Timing`` header, i.e. time from
+  request receipt to the upstream call and the part of it spent classifying;
+* ``ttft_ms`` / ``direct_ttft_ms`` / ``ttft_added_ms`` - client-observed time to first streamed byte through the
+  router, straight to the backend, and the difference per percentile;
+* ``throughput`` - completed requests and streamed tokens per second, plus errors and the classes chosen.
+
+Trace lines are OpenAI chat request bodies (``messages`` plus optional ``stream``/``max_tokens``); an
+``llm-router`` field is added when missing.
+
+Usage: routing_replay_bench.py [--trace traces/sample_chat.jsonl] [--approaches embedding,llm]
+                               [--concurrency 1,8,32] [--requests 200] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import httpx
+import numpy as np
+import yaml
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROUTER_DIR = os.path.dirname(HERE)
+POLICY = "benchmark"
+# Descriptions share vocabulary with the sample trace, since the stub embeds text as a bag of words.
+CLASSES = {
+    "code": (
+        "Programming and software: write or fix code, a function, program, query or API in Python, JavaScript, "
+        "Go, Rust, SQL or FastAPI; debug errors, compile, git merge conflict, process and thread."
+    ),
+    "math": (
+        "Mathematics: solve an equation for x, roots, derivative, integral, probability, dice, prove, "
+        "square root, irrational, matrix eigenvalues."
+    ),
+    "Unknown": "General chat: recommend a book or hobby, plan a trip, cook dinner, tell a story.",
+}
+
+
+@dataclass
+class Sample:
+    ok: bool
+    status: int
+    total_s: float
+    ttft_s: float | None = None
+    tokens: int = 0
+    route_ms: float | None = None
+    classify_ms: float | None = None
+    chosen: str | None = None
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(values) -> dict:
+    values = [v for v in values if v is not None]
+    if not values:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {"count": len(values), "mean": float(np.mean(values)), "p50": p50, "p95": p95, "p99": p99}
+
+
+def parse_server_timing(header: str | None) -> dict:
+    timings = {}
+    for metric in (header or "").split(","):
+        name, _, params = metric.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "dur":
+                timings[name] = float(value)
+    return timings
+
+
+class Service:
+    """One local server process whose output goes to a log file."""
+
+    def __init__(self, name: str, args: list, env: dict, cwd: str, url: str, log_dir: str):
+        self.name = name
+        self.url = url
+        self.log_path = os.path.join(log_dir, f"{name}.log")
+        self._log = open(self.log_path, "w")
+        self.proc = subprocess.Popen(
+            args, cwd=cwd, env={**os.environ, **env}, stdout=self._log, stderr=subprocess.STDOUT
+        )
+
+    def wait_ready(self, path: str = "/openapi.json", timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"{self.name} exited with code {self.proc.returncode}, see {self.log_path}")
+            try:
+                if httpx.get(f"{self.url}{path}", timeout=1.0).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"{self.name} not ready after {timeout:.0f}s, see {self.log_path}")
+
+    def stop(self):
+        if self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+        self._log.close()
+
+
+def uvicorn_service(name, module, app_dir, port, env, log_dir) -> Service:
+    args = [sys.executable, "-m", "uvicorn", module, "--host", "127.0.0.1", "--port", str(port)]
+    args += ["--log-level", "warning", "--no-access-log"]
+    env = {**env, "PYTHONPATH": app_dir}
+    return Service(name, args, env, app_dir, f"http://127.0.0.1:{port}", log_dir)
+
+
+def write_config(path: str, classifier_url: str, backend_url: str, replicas: int):
+    models = [
+        {"name": name, "description": description, "base_url_path": backend_url, "model_name": "stub-model"}
+        for name, description in CLASSES.items()
+        for _ in range(replicas)
+    ]
+    rule = {"rule_name": POLICY, "classifier_endpoint": f"{classifier_url}/classify", "models": models}
+    if replicas > 1:
+        rule["routing_strategy"] = "least_loaded"
+    with open(path, "w") as fh:
+        yaml.safe_dump({"routing_rules": [rule]}, fh, sort_keys=False)
+
+
+def parse_env(pairs: list) -> dict:
+    env = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"Expected KEY=VALUE, got '{pair}'")
+        env[key] = value
+    return env
+
+
+def load_trace(path: str) -> list:
+    with open(path) as fh:
+        trace = [json.loads(line) for line in fh if line.strip()]
+    if not trace:
+        raise SystemExit(f"Trace {path} is empty")
+    return trace
+
+
+async def send(client: httpx.AsyncClient, url: str, body: dict) -> Sample:
+    started = time.perf_counter()
+    try:
+        if not body.get("stream"):
+            resp = await client.post(url, json=body)
+            sample = Sample(ok=resp.status_code == 200, status=resp.status_code, total_s=time.perf_counter() - started)
+            if sample.ok:
+                sample.tokens = resp.json().get("usage", {}).get("completion_tokens", 0)
+        else:
+            async with client.stream("POST", url, json=body) as resp:
+                sample = Sample(ok=resp.status_code == 200, status=resp.status_code, total_s=0.0)
+                async for chunk in resp.aiter_raw():
+                    if chunk and sample.ttft_s is None:
+                        sample.ttft_s = time.perf_counter() - started
+                    sample.tokens += chunk.count(b"data:")
+                # The final "[DONE]" event is not a token.
+                sample.tokens = max(0, sample.tokens - 1)
+                sample.total_s = time.perf_counter() - started
+    except httpx.HTTPError:
+        return Sample(ok=False, status=0, total_s=time.perf_counter() - started)
+
+    timings = parse_server_timing(resp.headers.get("server-timing"))
+    sample.route_ms = timings.get("route")
+    sample.classify_ms = timings.get("classify")
+    sample.chosen = resp.headers.get("x-chosen-classifier")
+    return sample
+
+
+async def replay(url: str, bodies: list, concurrency: int, n_requests: int) -> tuple[list, float]:
+    queue = itertools.islice(itertools.cycle(bodies), n_requests)
+    samples: list[Sample] = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=httpx.Timeout(120.0)) as client:
+
+        async def worker():
+            for body in queue:
+                samples.append(await send(client, url, body))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return samples, elapsed
+
+
+def summarize(routed: list, direct: list, elapsed: float) -> dict:
+    ok = [s for s in routed if s.ok]
+    ttft = percentiles([s.ttft_s * 1000 for s in ok if s.ttft_s is not None])
+    direct_ttft = percentiles([s.ttft_s * 1000 for s in direct if s.ok and s.ttft_s is not None])
+    added = {q: ttft[q] - direct_ttft[q] for q in ("p50", "p95", "p99") if q in ttft and q in direct_ttft}
+    return {
+        "requests": len(routed),
+        "errors": len(routed) - len(ok),
+        "routing_overhead_ms": percentiles([s.route_ms for s in ok]),
+        "classifier_ms": percentiles([s.classify_ms for s in ok]),
+        "ttft_ms": ttft,
+        "direct_ttft_ms": direct_ttft,
+        "ttft_added_ms": added,
+        "latency_ms": percentiles([s.total_s * 1000 for s in ok]),
+        "throughput": {
+            "requests_per_second": len(ok) / elapsed if elapsed else 0.0,
+            "tokens_per_second": sum(s.tokens for s in ok) / elapsed if elapsed else 0.0,
+        },
+        "chosen": dict(Counter(s.chosen for s in ok)),
+    }
+
+
+async def run_approach(approach: str, args, trace: list, stub_url: str, log_dir: str) -> dict:
+    controller_port, classifier_port = free_port(), free_port()
+    controller_url = f"http://127.0.0.1:{controller_port}"
+    classifier_url = f"http://127.0.0.1:{classifier_port}"
+    config_path = os.path.join(log_dir, f"config-{approach}.yaml")
+    write_config(config_path, classifier_url, stub_url, args.replicas)
+
+    controller_env = {
+        "ROUTER_CONTROLLER_CONFIG": config_path,
+        "ROUTER_CONFIG_RELOAD_INTERVAL_SECONDS": "0",
+        # Replaying a short trace repeatedly would otherwise measure the routing cache, not the classifier.
+        "ROUTING_CACHE_ENABLED": "false",
+        **parse_env(args.controller_env),
+    }
+    classifier_env = {
+        "CLASSIFIER_APPROACH": approach,
+        "CONTROLLER_URL": controller_url,
+        "EMBEDDING_URL": f"{stub_url}/v1/embeddings",
+        "CLASSIFIER_EMBEDDING_MODEL_NAME": "stub-model",
+        "CLASSIFIER_BASE_URL": stub_url,
+        "CLASSIFIER_MODEL_NAME": "stub-model",
+        "LOG_LEVEL": "WARNING",
+        **parse_env(args.classifier_env),
+    }
+    controller = uvicorn_service(
+        f"controller-{approach}",
+        "controllerApp.main:app",
+        os.path.join(ROUTER_DIR, "controller"),
+        controller_port,
+        controller_env,
+        log_dir,
+    )
+    classifier = uvicorn_service(
+        f"classifier-{approach}",
+        "classifierApp.main:app",
+        os.path.join(ROUTER_DIR, "classifier"),
+        classifier_port,
+        classifier_env,
+        log_dir,
+    )
+    try:
+        controller.wait_ready("/config")
+        classifier.wait_ready()
+
+        routed_bodies = []
+        for body in trace:
+            body = {"model": "", **body}
+            body.setdefault("llm-router", {"policy": POLICY, "routing_strategy": "auto"})
+            routed_bodies.append(body)
+        direct_bodies = [{k: v for k, v in body.items() if k != "llm-router"} for body in routed_bodies]
+
+        await replay(f"{controller_url}/v1/chat/completions", routed_bodies, 1, args.warmup)
+        levels = []
+        for concurrency in args.concurrency:
+            direct, _ = await replay(f"{stub_url}/v1/chat/completions", direct_bodies, concurrency, args.requests)
+            routed, elapsed = await replay(
+                f"{controller_url}/v1/chat/completions", routed_bodies, concurrency, args.requests
+            )
+            summary = {"concurrency": concurrency, **summarize(routed, direct, elapsed)}
+            levels.append(summary)
+            print_level(approach, summary)
+        return {"approach": approach, "levels": levels}
+    finally:
+        classifier.stop()
+        controller.stop()
+
+
+def print_level(approach: str, s: dict):
+    def fmt(stats, q):
+        return f"{stats[q]:8.1f}" if q in stats else f"{'-':>8}"
+
+    print(
+        f"{approach:>9} c={s['concurrency']:<4} req/s={s['throughput']['requests_per_second']:8.1f} "
+        f"errors={s['errors']:<4} route p50/p99={fmt(s['routing_overhead_ms'], 'p50')}"
+        f"{fmt(s['routing_overhead_ms'], 'p99')} ms  classify p50={fmt(s['classifier_ms'], 'p50')} ms  "
+        f"ttft added p50={fmt(s['ttft_added_ms'], 'p50')} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trace", default=os.path.join(HERE, "traces", "sample_chat.jsonl"), help="JSONL trace")
+    parser.add_argument("--approaches", default="embedding,llm", help="classifier approaches to benchmark")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrent client counts")
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    parser.add_argument("--warmup", type=int, default=20, help="requests sent before measuring")
+    parser.add_argument("--replicas", type=int, default=1, help="backend replicas per class (least_loaded if > 1)")
+    parser.add_argument("--backend-ttft-ms", type=float, default=50.0)
+    parser.add_argument("--backend-token-ms", type=float, default=5.0)
+    parser.add_argument("--backend-tokens", type=int, default=32)
+    parser.add_argument("--embedding-ms", type=float, default=5.0)
+    parser.add_argument("--classifier-llm-ms", type=float, default=30.0)
+    parser.add_argument("--controller-env", action="append", help="extra KEY=VALUE for the controller")
+    parser.add_argument("--classifier-env", action="append", help="extra KEY=VALUE for the classifier")
+    parser.add_argument("--log-dir", help="where service logs and configs go (default: a temporary directory)")
+    parser.add_argument("--output", default="routing_replay_results.json", help="JSON results file")
+    args = parser.parse_args()
+    args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    trace = load_trace(args.trace)
+    log_dir = args.log_dir or tempfile.mkdtemp(prefix="llm-router-bench-")
+    os.makedirs(log_dir, exist_ok=True)
+    print(f"Service logs: {log_dir}")
+
+    stub_port = free_port()
+    stub_args = [sys.executable, os.path.join(HERE, "stub_servers.py"), "--port", str(stub_port)]
+    stub_args += ["--ttft-ms", str(args.backend_ttft_ms), "--token-ms", str(args.backend_token_ms)]
+    stub_args += ["--tokens", str(args.backend_tokens), "--embedding-ms", str(args.embedding_ms)]
+    stub_args += ["--classifier-ms", str(args.classifier_llm_ms)]
+    stub = Service("stub", stub_args, {}, HERE, f"http://127.0.0.1:{stub_port}", log_dir)
+    results = []
+    try:
+        stub.wait_ready("/v1/models")
+        for approach in [a.strip() for a in args.approaches.split(",") if a.strip()]:
+            results.append(asyncio.run(run_approach(approach, args, trace, stub.url, log_dir)))
+    finally:
+        stub.stop()
+
+    report = {
+        "trace": os.path.abspath(args.trace),
+        "trace_requests": len(trace),
+        "requests_per_level": args.requests,
+        "replicas": args.replicas,
+        "stub": {
+            "backend_ttft_ms": args.backend_ttft_ms,
+            "backend_token_ms": args.backend_token_ms,
+            "backend_tokens": args.backend_tokens,
+            "embedding_ms": args.embedding_ms,
+            "classifier_llm_ms": args.classifier_llm_ms,
+        },
+        "controller_env": parse_env(args.controller_env),
+        "classifier_env": parse_env(args.classifier_env),
+        "results": results,
+    }
+    with open(args.output, "w") as fh:
+        json.dump(report, fh, indent=2, default=float)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
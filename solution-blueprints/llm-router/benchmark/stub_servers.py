@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""OpenAI-compatible stub upstream for the routing replay benchmark.
+
+Serves everything the router talks to from one process, with configurable latencies:
+
+* ``POST /v1/embeddings`` - deterministic bag-of-words vectors, so the embedding classifier picks sensible classes;
+* ``POST /v1/chat/completions`` - classifier prompts (``CLASSIFIER_APPROACH=llm``) get a JSON class answer,
+  every other request is a generation answered after ``--ttft-ms`` and streamed one token per ``--token-ms``;
+* ``GET /v1/models`` - a single ``stub-model`` entry.
+
+Usage: stub_servers.py --port 18000 [--ttft-ms 50] [--token-ms 5] [--tokens 32] [--embedding-ms 5] [--classifier-ms 30]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import time
+
+import numpy as np
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+EMBEDDING_DIM = 1024
+# Shared component added to every vector: unrelated texts still score ~0.69 cosine, just under the embedding
+# classifier's confidence threshold, so any word overlap decides the class much like a real embedding model.
+EMBEDDING_BIAS = 1.5
+CLASSIFIER_SYSTEM_PREFIX = "You are a router classifier"
+MODEL_ID = "stub-model"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOP_WORDS = frozenset(
+    "a an and are between do does for how i in is it me my of on or that the this to user what when why with".split()
+)
+_CLASS_LINE = re.compile(r"^\s*-\s*([^:\n]+?)(?::\s*(.*))?$", re.MULTILINE)
+
+_BASELINE_SIMILARITY = EMBEDDING_BIAS**2 / (EMBEDDING_BIAS**2 + 1) + 1e-6
+
+app = FastAPI(title="Router benchmark stub")
+settings = argparse.Namespace(ttft_ms=50.0, token_ms=5.0, tokens=32, embedding_ms=5.0, classifier_ms=30.0)
+
+
+def embed(text: str) -> np.ndarray:
+    # Instruction-tuned embedders condition on the "Instruct: ... Query:" prefix rather than matching its words.
+    text = text.rsplit("Query:", 1)[-1]
+    vec = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in _WORD.findall(text.lower()):
+        if word in _STOP_WORDS:
+            continue
+        bucket = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=4).digest(), "little")
+        vec[bucket % EMBEDDING_DIM] += 1.0
+    norm = np.linalg.norm(vec)
+    if norm:
+        vec /= norm
+    vec[0] += EMBEDDING_BIAS
+    return vec / np.linalg.norm(vec)
+
+
+def pick_class(prompt: str) -> str:
+    """Answer a classifier prompt: the listed class whose name and description best overlap the conversation."""
+    conversation, _, listing = prompt.partition("Available classes")
+    conversation = conversation.split("Conversation:", 1)[-1]
+    listing = listing.split("Respond ONLY", 1)[0]
+    candidates = [(name.strip(), f"{name} {desc or ''}") for name, desc in _CLASS_LINE.findall(listing)]
+    if not candidates:
+        return "Unknown"
+    query = embed(conversation)
+    scores = [float(embed(text) @ query) for _, text in candidates]
+    best = int(np.argmax(scores))
+    return candidates[best][0] if scores[best] > _BASELINE_SIMILARITY else "Unknown"
+
+
+@app.get("/v1/models")
+async def models():
+    return {"object": "list", "data": [{"id": MODEL_ID, "object": "model"}]}
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    texts = body.get("input") or []
+    if isinstance(texts, str):
+        texts = [texts]
+    await asyncio.sleep(settings.embedding_ms / 1000)
+    data = [{"object": "embedding", "index": i, "embedding": embed(text).tolist()} for i, text in enumerate(texts)]
+    return {"object": "list", "model": body.get("model") or MODEL_ID, "data": data}
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    messages = body.get("messages") or []
+    if messages and str(messages[0].get("content", "")).startswith(CLASSIFIER_SYSTEM_PREFIX):
+        await asyncio.sleep(settings.classifier_ms / 1000)
+        answer = json.dumps({"class": pick_class(messages[-1].get("content", ""))})
+        return _completion(body, answer, 1)
+
+    n_tokens = min(settings.tokens, body.get("max_tokens") or settings.tokens)
+    if not body.get("stream"):
+        await asyncio.sleep((settings.ttft_ms + settings.token_ms * max(n_tokens - 1, 0)) / 1000)
+        return _completion(body, " ".join(f"tok{i}" for i in range(n_tokens)), n_tokens)
+    return StreamingResponse(_stream(n_tokens), media_type="text/event-stream")
+
+
+def _completion(body: dict, content: str, n_tokens: int) -> JSONResponse:
+    return JSONResponse(
+        {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model") or MODEL_ID,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 0, "completion_tokens": n_tokens, "total_tokens": n_tokens},
+        }
+    )
+
+
+async def _stream(n_tokens: int):
+    await asyncio.sleep(settings.ttft_ms / 1000)
+    for i in range(n_tokens):
+        if i:
+            await asyncio.sleep(settings.token_ms / 1000)
+        chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "model": MODEL_ID}
+        chunk["choices"] = [{"index": 0, "delta": {"content": f"tok{i} "}, "finish_reason": None}]
+        yield f"data: {json.dumps(chunk)}\n\n".encode()
+    yield b"data: [DONE]\n\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--ttft-ms", type=float, default=50.0, help="delay before the first generated token")
+    parser.add_argument("--token-ms", type=float, default=5.0, help="delay between streamed tokens")
+    parser.add_argument("--tokens", type=int, default=32, help="tokens per generation, capped by max_tokens")
+    parser.add_argument("--embedding-ms", type=float, default=5.0, help="latency of one /v1/embeddings call")
+    parser.add_argument("--classifier-ms", type=float, default=30.0, help="latency of one classifier LLM call")
+    args = parser.parse_args()
+    for key in ("ttft_ms", "token_ms", "tokens", "embedding_ms", "classifier_ms"):
+        setattr(settings, key, getattr(args, key))
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,8 @@
 import asyncio
 import logging
 import os
-from typing import Any, Dict, List
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
 
 import httpx
 import numpy as np
@@ -13,7 +14,7 @@ import numpy as np
 from .schemas import Message
 
 logger = logging.getLogger(__name__)
-log_level = os.getenv("LOG_LEVEL", "DEBUG").upper()
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 
 logging.basicConfig(
     level=getattr(logging, log_level),
@@ -56,16 +57,33 @@ def _sanitize_for_log(value: Any) -> str:
 
 
 MODEL_NAME = os.getenv("CLASSIFIER_EMBEDDING_MODEL_NAME", "").strip("\"'").strip()
+EMBEDDING_MAX_BATCH_SIZE = int(os.getenv("CLASSIFIER_EMBEDDING_MAX_BATCH_SIZE", "64"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("CLASSIFIER_EMBEDDING_MAX_CONCURRENCY", "4"))
+CLASS_VIEW_CACHE_SIZE = int(os.getenv("CLASSIFIER_CLASS_VIEW_CACHE_SIZE", "256"))
+
+
+@dataclass(frozen=True)
+class ClassView:
+    """Contiguous embedding matrix for one ordered set of classes, e.g. one routing policy."""
+
+    names: Tuple[str, ...]
+    rows: np.ndarray
+    matrix: np.ndarray
+    index: Dict[str, int]
+
 
 class_embeddings: np.ndarray | None = None
 class_names: List[str] = []
 class_descriptions: List[str] = []
+class_index: Dict[str, int] = {}
+class_views: Dict[Tuple[str, ...], ClassView] = {}
 
 _init_lock = asyncio.Lock()
+_embedding_slots = asyncio.Semaphore(max(1, EMBEDDING_MAX_CONCURRENCY))
 
 
-async def fetch_classes_config(controller_url: str) -> Dict[str, str]:
-    """Load class names and descriptions from controller service"""
+async def fetch_classes_config(controller_url: str) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """Load class names and descriptions, plus each policy's class list, from controller service"""
     url = f"{controller_url.rstrip('/')}/config"
     async with httpx.AsyncClient() as client:
         try:
@@ -73,7 +91,11 @@ async def fetch_classes_config(controller_url: str) -> Dict[str, str]:
             resp.raise_for_status()
             data = resp.json()
             classes_dict: Dict[str, str] = {}
+            policies: Dict[str, List[str]] = {}
             for rule in data.get("routing_rules", []):
+                # Replicas share a class name; the controller sends each name once, in config order.
+                names = [m.get("name") for m in rule.get("models", []) if m.get("name")]
+                policies[rule.get("rule_name", "")] = list(dict.fromkeys(names))
                 for model in rule.get("models", []):
                     name = model.get("name")
                     desc = model.get("description", "").strip()
@@ -83,25 +105,40 @@ async def fetch_classes_config(controller_url: str) -> Dict[str, str]:
                         classes_dict[name] = desc
             if not classes_dict:
                 raise ValueError("No classes with descriptions found in config")
-            return classes_dict
+            return classes_dict, policies
         except Exception as e:
             raise RuntimeError(f"Failed to load config from {url}: {e}")
 
 
-async def get_embeddings(embedding_url: str, texts: List[str]) -> np.ndarray:
-    """Fetch embeddings from the OpenAI-compatible embedding server"""
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=30.0)
+    return _http_client
+
+
+async def _post_embeddings(embedding_url: str, texts: List[str]) -> List[List[float]]:
     payload = {
         "model": MODEL_NAME,
         "input": texts,
         "encoding_format": "float",
         "truncate_prompt_tokens": 512,
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(embedding_url, json=payload, timeout=30.0)
-        resp.raise_for_status()
-        data = resp.json()["data"]
-        embs = [item["embedding"] for item in data]
-        return np.array(embs)
+    async with _embedding_slots:
+        resp = await _get_http_client().post(embedding_url, json=payload)
+    resp.raise_for_status()
+    data = sorted(resp.json()["data"], key=lambda item: item.get("index", 0))
+    return [item["embedding"] for item in data]
+
+
+async def get_embeddings(embedding_url: str, texts: List[str]) -> np.ndarray:
+    """Fetch embeddings from the OpenAI-compatible embedding server, in bounded batches with bounded concurrency"""
+    chunks = [texts[i : i + EMBEDDING_MAX_BATCH_SIZE] for i in range(0, len(texts), EMBEDDING_MAX_BATCH_SIZE)]
+    results = await asyncio.gather(*(_post_embeddings(embedding_url, chunk) for chunk in chunks))
+    return np.array([emb for chunk in results for emb in chunk], dtype=np.float32)
 
 
 def normalize_embeddings(embs: np.ndarray) -> np.ndarray:
@@ -109,11 +146,34 @@ def normalize_embeddings(embs: np.ndarray) -> np.ndarray:
     return embs / norms.clip(min=1e-12)
 
 
+def build_class_view(classes: Tuple[str, ...]) -> ClassView | None:
+    """Gather the rows of ``classes`` known to the classifier into a contiguous float32 matrix"""
+    if class_embeddings is None:
+        return None
+    names = tuple(dict.fromkeys(cls for cls in classes if cls in class_index))
+    if not names:
+        return None
+    rows = np.fromiter((class_index[name] for name in names), dtype=np.intp, count=len(names))
+    matrix = np.ascontiguousarray(class_embeddings[rows], dtype=np.float32)
+    return ClassView(names=names, rows=rows, matrix=matrix, index={name: i for i, name in enumerate(names)})
+
+
+def get_class_view(classes: List[str] | None) -> ClassView | None:
+    """Return the precomputed view for ``classes``, building and memoizing views for unseen class lists"""
+    key = tuple(classes) if classes else tuple(class_names)
+    view = class_views.get(key)
+    if view is None:
+        view = build_class_view(key)
+        if view is not None and len(class_views) < CLASS_VIEW_CACHE_SIZE:
+            class_views[key] = view
+    return view
+
+
 async def load_class_embeddings(embedding_url: str, controller_url: str):
     """Load config and compute embeddings for class descriptions (called once)"""
-    global class_embeddings, class_names, class_descriptions
+    global class_embeddings, class_names, class_descriptions, class_index, class_views
 
-    config = await fetch_classes_config(controller_url)
+    config, policies = await fetch_classes_config(controller_url)
     class_descriptions = list(config.values())
     class_names = list(config.keys())
 
@@ -121,12 +181,19 @@ async def load_class_embeddings(embedding_url: str, controller_url: str):
         raise RuntimeError("No class descriptions loaded")
 
     raw_embs = await get_embeddings(embedding_url, class_descriptions)
-    class_embeddings = normalize_embeddings(raw_embs)
+    class_embeddings = np.ascontiguousarray(normalize_embeddings(raw_embs), dtype=np.float32)
+    class_index = {name: i for i, name in enumerate(class_names)}
+
+    # The controller sends a policy's model names in config order, so these keys match incoming requests.
+    class_views = {}
+    for policy_classes in [class_names, *policies.values()]:
+        get_class_view(policy_classes)
 
     logger.info("Loaded classes:")
     for name, desc in zip(class_names, class_descriptions):
         logger.info("  - %s: %s...", name, desc[:120])
     logger.info("Embeddings shape: %s", class_embeddings.shape if class_embeddings is not None else "None")
+    logger.info("Precomputed %d class view(s) for %d policies", len(class_views), len(policies))
 
 
 class EmbeddingClassifierClient:
@@ -157,67 +224,79 @@ class EmbeddingClassifierClient:
         messages: List[Message],
         classes: List[str] | None = None,
     ) -> Dict[str, Any]:
+        results = await self.classify_batch([(messages, classes)])
+        return results[0]
+
+    async def classify_batch(self, requests: List[Tuple[List[Message], List[str] | None]]) -> List[Dict[str, Any]]:
+        """
+        Embed all queries in one call and score them against the precomputed class views:
+        one (n_queries x n_classes) matmul per distinct class list, usually a single policy.
+        """
         if not self.initialized:
             await self.initialize()
 
         if class_embeddings is None or not class_names:
-            return {"class": "Unknown"}
-
-        dialogue = "\n".join(f"{m.role.upper()}: {m.content}" for m in messages)
-        logger.debug("Dialogue (first 200 chars): %s...", dialogue[:200])
-
-        instruct_text = (
-            "Instruct: Given the user message, select the most appropriate category from the available options.\n"
-            f"Query: {dialogue}"
-        )
-        logger.debug("Instruct text: %s", instruct_text)
-
-        query_emb_raw = await get_embeddings(self.embedding_url, [instruct_text])
-        query_emb = normalize_embeddings(query_emb_raw)[0]
-
-        if classes:
-            filtered_indices = []
-            filtered_names = []
-            filtered_embs_list = []
-            for cls in classes:
-                if cls in class_names:
-                    idx = class_names.index(cls)
-                    filtered_indices.append(idx)
-                    filtered_names.append(cls)
-                    filtered_embs_list.append(class_embeddings[idx])
-            if not filtered_embs_list:
-                safe_classes = _sanitize_for_logging(classes)
-                logger.warning("No matching classes found for %s", safe_classes)
-                return {"class": "Unknown"}
-            filtered_embs = np.array(filtered_embs_list)
-            active_classes = filtered_names
-        else:
-            filtered_embs = class_embeddings
-            active_classes = class_names
-
-        similarities = np.dot(filtered_embs, query_emb)
-        sim_dict = {name: f"{sim:.4f}" for name, sim in zip(active_classes, similarities)}
-        sanitized_sim_dict = {_sanitize_for_log(name): _sanitize_for_log(score) for name, score in sim_dict.items()}
+            return [{"class": "Unknown"} for _ in requests]
+        if not requests:
+            return []
+
+        instruct_texts = [_instruct_text(messages) for messages, _ in requests]
+        query_embs = normalize_embeddings(await get_embeddings(self.embedding_url, instruct_texts))
+
+        results: List[Dict[str, Any]] = [{"class": "Unknown"} for _ in requests]
+        groups: Dict[int, Tuple[ClassView, List[int]]] = {}
+        for i, (_, classes) in enumerate(requests):
+            view = get_class_view(classes)
+            if view is None:
+                logger.warning("No matching classes found for %s", _sanitize_for_logging(classes or []))
+                continue
+            groups.setdefault(id(view), (view, []))[1].append(i)
+
+        for view, indices in groups.values():
+            if len(indices) == 1:
+                results[indices[0]] = _choose_class(view.matrix @ query_embs[indices[0]], view)
+                continue
+            similarities = query_embs[indices] @ view.matrix.T
+            for row, i in enumerate(indices):
+                results[i] = _choose_class(similarities[row], view)
+        return results
+
+
+def _instruct_text(messages: List[Message]) -> str:
+    dialogue = "\n".join(f"{m.role.upper()}: {m.content}" for m in messages)
+    logger.debug("Dialogue (first 200 chars): %s...", _sanitize_for_log(dialogue[:200]))
+    return (
+        "Instruct: Given the user message, select the most appropriate category from the available options.\n"
+        f"Query: {dialogue}"
+    )
+
+
+def _choose_class(similarities: np.ndarray, view: ClassView) -> Dict[str, Any]:
+    active_classes = view.names
+    if logger.isEnabledFor(logging.DEBUG):
+        sanitized_sim_dict = {
+            _sanitize_for_log(name): _sanitize_for_log(f"{sim:.4f}") for name, sim in zip(active_classes, similarities)
+        }
         logger.debug("Similarities: %s", sanitized_sim_dict)
-        max_idx = int(np.argmax(similarities))
-        max_sim = float(similarities[max_idx])
-
-        THRESHOLD = 0.70 if len(active_classes) <= 5 else 0.68
-
-        if max_sim < THRESHOLD:
-            chosen = "Unknown"
-            logger.debug(
-                "Low confidence (%.4f) < %.2f for %d active classes -> Unknown",
-                max_sim,
-                THRESHOLD,
-                len(active_classes),
-            )
-        else:
-            chosen = active_classes[max_idx]
-            logger.debug(
-                "Selected class with similarity=%.4f from %d active classes",
-                max_sim,
-                len(active_classes),
-            )
-
-        return {"class": chosen}
+    max_idx = int(np.argmax(similarities))
+    max_sim = float(similarities[max_idx])
+
+    THRESHOLD = 0.70 if len(active_classes) <= 5 else 0.68
+
+    if max_sim < THRESHOLD:
+        chosen = "Unknown"
+        logger.debug(
+            "Low confidence (%.4f) < %.2f for %d active classes -> Unknown",
+            max_sim,
+            THRESHOLD,
+            len(active_classes),
+        )
+    else:
+        chosen = active_classes[max_idx]
+        logger.debug(
+            "Selected class with similarity=%.4f from %d active classes",
+            max_sim,
+            len(active_classes),
+        )
+
+    return {"class": chosen}
@@ -7,7 +7,7 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import aiohttp
 
@@ -19,9 +19,10 @@ CLASSIFIER_MODEL_NAME = os.getenv("CLASSIFIER_MODEL_NAME", "").strip("\"'").stri
 CLASSIFIER_LLM_TIMEOUT_SECONDS = float(os.getenv("CLASSIFIER_LLM_TIMEOUT_SECONDS", "15"))
 CLASSIFIER_MODEL_DISCOVERY_TIMEOUT_SECONDS = float(os.getenv("CLASSIFIER_MODEL_DISCOVERY_TIMEOUT_SECONDS", "2"))
 CLASSIFIER_MODEL_DISCOVERY_MAX_ATTEMPTS = int(os.getenv("CLASSIFIER_MODEL_DISCOVERY_MAX_ATTEMPTS", "8"))
+CLASSIFIER_LLM_MAX_CONCURRENCY = int(os.getenv("CLASSIFIER_LLM_MAX_CONCURRENCY", "8"))
 
 logger = logging.getLogger(__name__)
-log_level = os.getenv("LOG_LEVEL", "DEBUG").upper()
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
 
 logging.basicConfig(
     level=getattr(logging, log_level),
@@ -49,6 +50,7 @@ class ClassificationLLMClient:
         self.model_name = None
         self._initialized = False
         self.class_descriptions: Dict[str, str] = {}
+        self._batch_slots = asyncio.Semaphore(max(1, CLASSIFIER_LLM_MAX_CONCURRENCY))
 
     async def initialize(self):
         if not self._initialized:
@@ -142,7 +144,7 @@ class ClassificationLLMClient:
             raise RuntimeError("Model name is not set")
 
         dialogue = "\n".join(f"{m.role.upper()}: {m.content}" for m in messages)
-        logger.debug(f" Dialogue (first 200 chars): {dialogue[:200]}...")
+        logger.debug("Dialogue (first 200 chars): %s...", _sanitize_log(dialogue[:200]))
 
         if classes:
             class_list = []
@@ -179,8 +181,9 @@ class ClassificationLLMClient:
         Do not add any explanation, only the JSON.
         """
 
-        logger.debug(f" Sending to LLM model={self.model_name}, api_url={self.api_url}")
-        logger.debug(f" User prompt (first 500 chars): {_sanitize_log(user_msg[:500])}...")
+        logger.debug("Sending to LLM model=%s, api_url=%s", self.model_name, self.api_url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("User prompt (first 500 chars): %s...", _sanitize_log(user_msg[:500]))
 
         body = {
             "model": self.model_name,
@@ -220,10 +223,11 @@ class ClassificationLLMClient:
 
         if content is None:
             logger.error("Content is None in response")
-            logger.debug(f" Full response: {json.dumps(data, indent=2)}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Full response: %s", json.dumps(data))
             return {"class": classes[0] if classes else "Unknown", "confidence": 0.0}
 
-        logger.debug(f" Classifier raw response content: {content}")
+        logger.debug("Classifier raw response content: %s", _sanitize_log(content))
 
         try:
             result = json.loads(content)
@@ -234,5 +238,26 @@ class ClassificationLLMClient:
                 logger.warning(f"Failed to parse model output: {e}")
                 result = {"class": classes[0] if classes else "Unknown"}
 
-        logger.debug(f" Selected: {_sanitize_log(str(result.get('class')))} from classes {_sanitize_log(str(classes))}")
+        logger.debug(
+            "Selected: %s from classes %s", _sanitize_log(str(result.get("class"))), _sanitize_log(str(classes))
+        )
         return result
+
+    async def classify_batch(self, requests: List[Tuple[List[Message], List[str] | None]]) -> List[Dict[str, Any]]:
+        # Each classification is its own chat completion; run them concurrently, at most
+        # CLASSIFIER_LLM_MAX_CONCURRENCY at a time across batches, and keep per-item failures local.
+        async def classify_item(messages: List[Message], classes: List[str] | None) -> Dict[str, Any]:
+            async with self._batch_slots:
+                return await self.classify(messages, classes)
+
+        results = await asyncio.gather(
+            *(classify_item(messages, classes) for messages, classes in requests), return_exceptions=True
+        )
+        out: List[Dict[str, Any]] = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Batch item classification failed: %s", result)
+                out.append({"class": "Unknown"})
+            else:
+                out.append(result)
+        return out
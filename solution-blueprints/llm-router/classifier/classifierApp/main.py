@@ -5,22 +5,35 @@
 import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Protocol
+import time
+from typing import Any, Dict, List, Protocol, Tuple
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
 
-from .schemas import ClassifierRequest, ClassifierResponse, Message
+from .metrics import observe_batch, observe_classification
+from .metrics import render as render_metrics
+from .microBatcher import MicroBatcher
+from .schemas import ClassifierBatchRequest, ClassifierBatchResponse, ClassifierRequest, ClassifierResponse, Message
 
 
 class ClassifierClientProtocol(Protocol):
     async def classify(self, messages: List[Message], classes: List[str] | None) -> Dict[str, Any]:
         pass
 
+    async def classify_batch(self, requests: List[Tuple[List[Message], List[str] | None]]) -> List[Dict[str, Any]]:
+        pass
+
 
 CLASSIFIER_APPROACH = os.getenv("CLASSIFIER_APPROACH", "embedding")
 CLASSIFIER_REQUEST_TIMEOUT_SECONDS = float(os.getenv("CLASSIFIER_REQUEST_TIMEOUT_SECONDS", "20"))
+CLASSIFIER_BATCH_WINDOW_MS = float(os.getenv("CLASSIFIER_BATCH_WINDOW_MS", "5"))
+CLASSIFIER_BATCH_MAX_SIZE = int(os.getenv("CLASSIFIER_BATCH_MAX_SIZE", "32"))
+CLASSIFIER_BATCH_REQUEST_MAX_ITEMS = int(os.getenv("CLASSIFIER_BATCH_REQUEST_MAX_ITEMS", "256"))
 
 logger = logging.getLogger(__name__)
+# httpx logs every embedding request at INFO, which is per-request noise in the classification hot path.
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 app = FastAPI(title="Routing Classifier Service", version="1.0.0")
 
@@ -38,20 +51,74 @@ else:
     raise RuntimeError(f"Unknown CLASSIFIER_APPROACH: '{CLASSIFIER_APPROACH}'. Use 'embedding' or 'llm'.")
 
 
+async def _classify_batch(items: List[Tuple[List[Message], List[str] | None]]) -> List[Dict[str, Any]]:
+    observe_batch(CLASSIFIER_APPROACH, len(items))
+    return await client.classify_batch(items)
+
+
+# Coalescing only pays off when a batch shares one upstream call, which is the embedding approach.
+batcher: MicroBatcher | None = None
+if CLASSIFIER_APPROACH == "embedding" and CLASSIFIER_BATCH_WINDOW_MS > 0:
+    batcher = MicroBatcher(_classify_batch, CLASSIFIER_BATCH_WINDOW_MS, CLASSIFIER_BATCH_MAX_SIZE)
+
+
+def _class_label(chosen_class: str, classes: List[str] | None) -> str:
+    # An LLM may answer with any string; keep the metric's label set bounded to the requested classes.
+    if chosen_class == "Unknown" or not classes or chosen_class in classes:
+        return chosen_class
+    return "other"
+
+
 @app.post("/classify", response_model=ClassifierResponse)
 async def classify(request: ClassifierRequest):
+    started = time.perf_counter()
     try:
-        result = await asyncio.wait_for(
-            client.classify(request.messages, request.classes),
-            timeout=CLASSIFIER_REQUEST_TIMEOUT_SECONDS,
-        )
+        if batcher is not None:
+            pending = batcher.submit(request.messages, request.classes)
+        else:
+            pending = client.classify(request.messages, request.classes)
+        result = await asyncio.wait_for(pending, timeout=CLASSIFIER_REQUEST_TIMEOUT_SECONDS)
         chosen_class = result.get("class") or "Unknown"
+        observe_classification(
+            CLASSIFIER_APPROACH, _class_label(chosen_class, request.classes), time.perf_counter() - started
+        )
         return ClassifierResponse(chosen_class=chosen_class)
     except Exception as e:
         logger.exception("Classifier request failed, returning Unknown fallback: %s", e)
+        observe_classification(CLASSIFIER_APPROACH, "Unknown", time.perf_counter() - started, failed=True)
         return ClassifierResponse(chosen_class="Unknown")
 
 
+@app.post("/classify/batch", response_model=ClassifierBatchResponse)
+async def classify_batch(request: ClassifierBatchRequest):
+    if len(request.requests) > CLASSIFIER_BATCH_REQUEST_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.requests)} items exceeds the limit of {CLASSIFIER_BATCH_REQUEST_MAX_ITEMS}",
+        )
+    items = [(item.messages, item.classes) for item in request.requests]
+    started = time.perf_counter()
+    try:
+        results = await asyncio.wait_for(_classify_batch(items), timeout=CLASSIFIER_REQUEST_TIMEOUT_SECONDS)
+        elapsed = time.perf_counter() - started
+        chosen = [result.get("class") or "Unknown" for result in results]
+        for chosen_class, (_, classes) in zip(chosen, items):
+            observe_classification(CLASSIFIER_APPROACH, _class_label(chosen_class, classes), elapsed)
+        return ClassifierBatchResponse(results=[ClassifierResponse(chosen_class=c) for c in chosen])
+    except Exception as e:
+        logger.exception("Batch classifier request failed, returning Unknown fallback: %s", e)
+        elapsed = time.perf_counter() - started
+        for _ in items:
+            observe_classification(CLASSIFIER_APPROACH, "Unknown", elapsed, failed=True)
+        return ClassifierBatchResponse(results=[ClassifierResponse(chosen_class="Unknown") for _ in items])
+
+
+@app.get("/metrics")
+async def metrics():
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,39 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+CLASSIFICATION_SECONDS = Histogram(
+    "llm_router_classifier_classification_seconds",
+    "Time to answer one classification, batching wait included, by approach and chosen class.",
+    ["approach", "chosen_class"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0),
+)
+BATCH_SIZE = Histogram(
+    "llm_router_classifier_batch_size",
+    "Classifications handled per classify_batch call.",
+    ["approach"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+UNKNOWN_FALLBACKS = Counter(
+    "llm_router_classifier_unknown_fallbacks_total",
+    "Classifications answered with 'Unknown', because classification failed or no class was chosen.",
+    ["approach", "reason"],
+)
+
+
+def observe_classification(approach: str, chosen_class: str, seconds: float, failed: bool = False):
+    CLASSIFICATION_SECONDS.labels(approach, chosen_class).observe(seconds)
+    if failed:
+        UNKNOWN_FALLBACKS.labels(approach, "error").inc()
+    elif chosen_class == "Unknown":
+        UNKNOWN_FALLBACKS.labels(approach, "no_class").inc()
+
+
+def observe_batch(approach: str, size: int):
+    BATCH_SIZE.labels(approach).observe(size)
+
+
+def render() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
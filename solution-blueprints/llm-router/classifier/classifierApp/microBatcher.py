@@ -0,0 +1,76 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from .schemas import Message
+
+logger = logging.getLogger(__name__)
+
+ClassifyItem = Tuple[List[Message], List[str] | None]
+ClassifyBatchFn = Callable[[List[ClassifyItem]], Awaitable[List[Dict[str, Any]]]]
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent classify calls arriving within a short window into a single
+    ``classify_batch`` call, so N requests cost one embedding round-trip instead of N.
+    """
+
+    def __init__(self, classify_batch: ClassifyBatchFn, window_ms: float, max_size: int):
+        self._classify_batch = classify_batch
+        self.window_s = window_ms / 1000.0
+        self.max_size = max(1, max_size)
+        self._pending: List[Tuple[ClassifyItem, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches_total = 0
+        self.items_total = 0
+
+    async def submit(self, messages: List[Message], classes: List[str] | None) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append(((messages, classes), future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_s, self._flush)
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches_total": self.batches_total,
+            "items_total": self.items_total,
+            "mean_batch_size": self.items_total / self.batches_total if self.batches_total else 0.0,
+        }
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # Callers that already timed out cancelled their futures; don't spend an embedding slot on them.
+        batch = [(item, future) for item, future in self._pending if not future.done()]
+        self._pending = []
+        if not batch:
+            return
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[ClassifyItem, asyncio.Future]]):
+        self.batches_total += 1
+        self.items_total += len(batch)
+        logger.debug("Flushing classify micro-batch of %d request(s)", len(batch))
+        try:
+            results = await self._classify_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
@@ -19,3 +19,11 @@ class ClassifierRequest(BaseModel):
 
 class ClassifierResponse(BaseModel):
     chosen_class: str = "Unknown"
+
+
+class ClassifierBatchRequest(BaseModel):
+    requests: List[ClassifierRequest]
+
+
+class ClassifierBatchResponse(BaseModel):
+    results: List[ClassifierResponse]
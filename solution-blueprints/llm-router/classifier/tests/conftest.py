@@ -0,0 +1,14 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import sys
+from pathlib import Path
+
+# The classifier runs with PYTHONPATH=classifier, see templates/router-classifier-deployment.yaml
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Required by the embedding client at import time; the tests never reach these services.
+os.environ.setdefault("EMBEDDING_URL", "http://embedding.invalid/v1/embeddings")
+os.environ.setdefault("CONTROLLER_URL", "http://controller.invalid")
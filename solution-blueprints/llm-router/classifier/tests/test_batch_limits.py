@@ -0,0 +1,80 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import numpy as np
+from classifierApp import embeddingClient, main
+from classifierApp.llmClient import ClassificationLLMClient
+from classifierApp.schemas import Message
+from fastapi.testclient import TestClient
+
+
+class ConcurrencyProbe:
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def hold(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+
+
+def test_oversized_batch_is_rejected(monkeypatch):
+    monkeypatch.setattr(main, "CLASSIFIER_BATCH_REQUEST_MAX_ITEMS", 2)
+    item = {"messages": [{"role": "user", "content": "hi"}], "classes": ["a"]}
+    response = TestClient(main.app).post("/classify/batch", json={"requests": [item] * 3})
+    assert response.status_code == 413
+
+
+def test_embedding_chunks_are_bounded(monkeypatch):
+    probe = ConcurrencyProbe()
+
+    class FakeResponse:
+        def __init__(self, texts):
+            self.texts = texts
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"data": [{"index": i, "embedding": [1.0, 0.0]} for i, _ in enumerate(self.texts)]}
+
+    class FakeClient:
+        async def post(self, url, json):
+            await probe.hold()
+            return FakeResponse(json["input"])
+
+    monkeypatch.setattr(embeddingClient, "EMBEDDING_MAX_BATCH_SIZE", 1)
+    monkeypatch.setattr(embeddingClient, "_embedding_slots", asyncio.Semaphore(2))
+    monkeypatch.setattr(embeddingClient, "_get_http_client", lambda: FakeClient())
+
+    embeddings = asyncio.run(embeddingClient.get_embeddings("http://embedding", [str(i) for i in range(10)]))
+    assert embeddings.shape == (10, 2)
+    assert np.all(embeddings[:, 0] == 1.0)
+    assert probe.peak == 2
+
+
+def test_llm_batch_fan_out_is_bounded(monkeypatch):
+    monkeypatch.setenv("CLASSIFIER_BASE_URL", "http://llm")
+    monkeypatch.setattr("classifierApp.llmClient.CLASSIFIER_LLM_MAX_CONCURRENCY", 3)
+    probe = ConcurrencyProbe()
+
+    async def classify(messages, classes):
+        await probe.hold()
+        if messages[0].content == "bad":
+            raise RuntimeError("upstream error")
+        return {"class": classes[0]}
+
+    async def scenario():
+        client = ClassificationLLMClient()
+        client.classify = classify
+        items = [([Message(role="user", content="bad" if i == 4 else "ok")], ["a"]) for i in range(12)]
+        return await client.classify_batch(items)
+
+    results = asyncio.run(scenario())
+    assert probe.peak == 3
+    assert [r["class"] for r in results] == ["a"] * 4 + ["Unknown"] + ["a"] * 7
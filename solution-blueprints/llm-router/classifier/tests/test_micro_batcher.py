@@ -0,0 +1,72 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from classifierApp.microBatcher import MicroBatcher
+from classifierApp.schemas import Message
+
+
+def _messages(text: str):
+    return [Message(role="user", content=text)]
+
+
+class RecordingBatch:
+    def __init__(self, fail: bool = False):
+        self.batches: list[list[str]] = []
+        self.fail = fail
+
+    async def __call__(self, items):
+        self.batches.append([messages[0].content for messages, _ in items])
+        if self.fail:
+            raise RuntimeError("embedding server down")
+        return [{"class": messages[0].content.upper()} for messages, _ in items]
+
+
+def test_concurrent_calls_share_one_batch():
+    async def scenario():
+        classify = RecordingBatch()
+        batcher = MicroBatcher(classify, window_ms=20, max_size=32)
+        results = await asyncio.gather(*(batcher.submit(_messages(t), None) for t in ("a", "b", "c")))
+        assert [r["class"] for r in results] == ["A", "B", "C"]
+        assert classify.batches == [["a", "b", "c"]]
+        assert batcher.stats()["mean_batch_size"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_full_batch_flushes_before_window():
+    async def scenario():
+        classify = RecordingBatch()
+        batcher = MicroBatcher(classify, window_ms=60_000, max_size=2)
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit(_messages("a"), None), batcher.submit(_messages("b"), None)), timeout=1
+        )
+        assert [r["class"] for r in results] == ["A", "B"]
+
+    asyncio.run(scenario())
+
+
+def test_failure_reaches_every_caller():
+    async def scenario():
+        batcher = MicroBatcher(RecordingBatch(fail=True), window_ms=1, max_size=32)
+        results = await asyncio.gather(
+            batcher.submit(_messages("a"), None), batcher.submit(_messages("b"), None), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    asyncio.run(scenario())
+
+
+def test_timed_out_callers_are_dropped_from_batch():
+    async def scenario():
+        classify = RecordingBatch()
+        batcher = MicroBatcher(classify, window_ms=50, max_size=32)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(batcher.submit(_messages("late"), None), timeout=0.001)
+        assert (await batcher.submit(_messages("b"), None))["class"] == "B"
+        assert classify.batches == [["b"]]
+
+    asyncio.run(scenario())
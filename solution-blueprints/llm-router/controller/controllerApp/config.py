@@ -3,6 +3,8 @@
 # SPDX-License-Identifier: MIT
 
 import copy
+import hashlib
+import json
 import logging
 import os
 
@@ -56,3 +58,9 @@ def mask_config(config: dict) -> dict:
             if "api_key" in llm:
                 llm["api_key"] = "[REDACTED]"
     return config_out
+
+
+def config_version(config: dict) -> str:
+    """Stable fingerprint of the routing rules, used to invalidate state derived from them."""
+    payload = json.dumps(config.get("routing_rules", []), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
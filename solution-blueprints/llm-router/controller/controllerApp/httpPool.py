@@ -0,0 +1,158 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+POOL_MAX_CONNECTIONS = int(os.getenv("ROUTER_POOL_MAX_CONNECTIONS", "200"))
+POOL_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ROUTER_POOL_MAX_KEEPALIVE_CONNECTIONS", "50"))
+POOL_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("ROUTER_POOL_KEEPALIVE_EXPIRY_SECONDS", "30"))
+POOL_CONNECT_TIMEOUT_SECONDS = float(os.getenv("ROUTER_POOL_CONNECT_TIMEOUT_SECONDS", "10"))
+POOL_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("ROUTER_POOL_ACQUIRE_TIMEOUT_SECONDS", "30"))
+POOL_HTTP2 = os.getenv("ROUTER_POOL_HTTP2", "true").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class PoolStats:
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    requests_total: int = 0
+    errors_total: int = 0
+    pool_timeouts_total: int = 0
+    last_used: float = 0.0
+
+
+class BackendClientPool:
+    """
+    Long-lived httpx clients, one per upstream base URL, shared by every request
+    so that TCP/TLS setup is paid once and keep-alive connections are reused.
+    """
+
+    def __init__(self, limits: httpx.Limits, timeout: httpx.Timeout, http2: bool = False):
+        self.limits = limits
+        self.timeout = timeout
+        self.http2 = http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, PoolStats] = {}
+        self._closed = False
+
+    @classmethod
+    def from_env(cls) -> "BackendClientPool":
+        http2 = POOL_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("ROUTER_POOL_HTTP2 is enabled but the 'h2' package is missing, falling back to HTTP/1.1")
+            http2 = False
+        limits = httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY_SECONDS,
+        )
+        # Reads are unbounded by default because completions may stream for minutes;
+        # callers pass a per-request timeout where a tighter bound is needed.
+        timeout = httpx.Timeout(None, connect=POOL_CONNECT_TIMEOUT_SECONDS, pool=POOL_ACQUIRE_TIMEOUT_SECONDS)
+        return cls(limits=limits, timeout=timeout, http2=http2)
+
+    def client_for(self, key: str) -> httpx.AsyncClient:
+        client = self._clients.get(key)
+        if client is None:
+            if self._closed:
+                raise RuntimeError("Backend client pool is closed")
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, http2=self.http2)
+            self._clients[key] = client
+            self._stats.setdefault(key, PoolStats())
+            logger.info(
+                "Opened pooled client for %s (max_connections=%s, http2=%s)",
+                key,
+                self.limits.max_connections,
+                self.http2,
+            )
+        return client
+
+    @asynccontextmanager
+    async def track(self, key: str) -> AsyncIterator[None]:
+        """Account one upstream request against the pool of ``key`` for saturation metrics."""
+        stats = self._stats.setdefault(key, PoolStats())
+        stats.in_flight += 1
+        stats.requests_total += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        try:
+            yield
+        except httpx.PoolTimeout:
+            stats.pool_timeouts_total += 1
+            stats.errors_total += 1
+            raise
+        except httpx.HTTPError:
+            stats.errors_total += 1
+            raise
+        finally:
+            stats.in_flight -= 1
+            stats.last_used = time.monotonic()
+
+    def is_warm(self, key: str) -> bool:
+        """True while ``key`` is likely to hold an open keep-alive connection."""
+        stats = self._stats.get(key)
+        if stats is None or key not in self._clients:
+            return False
+        if stats.in_flight > 0:
+            return True
+        expiry = self.limits.keepalive_expiry
+        return bool(stats.last_used) and (expiry is None or time.monotonic() - stats.last_used < expiry)
+
+    def stats(self) -> dict:
+        out = {}
+        for key, stats in self._stats.items():
+            entry = asdict(stats)
+            entry.pop("last_used")
+            entry["max_connections"] = self.limits.max_connections
+            entry["utilization"] = stats.in_flight / self.limits.max_connections if self.limits.max_connections else 0.0
+            entry.update(_connection_counts(self._clients.get(key)))
+            out[key] = entry
+        return out
+
+    async def aclose(self):
+        self._closed = True
+        clients = list(self._clients.items())
+        self._clients.clear()
+        results = await asyncio.gather(*(client.aclose() for _, client in clients), return_exceptions=True)
+        for (key, _), result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to close pooled client for %s: %s", key, result)
+
+
+def _connection_counts(client: httpx.AsyncClient | None) -> dict:
+    # httpx does not expose pool occupancy publicly; read it from the transport when available.
+    connections = getattr(getattr(getattr(client, "_transport", None), "_pool", None), "connections", None)
+    if connections is None:
+        return {"connections_open": None, "connections_idle": None}
+    return {
+        "connections_open": len(connections),
+        "connections_idle": sum(1 for conn in connections if conn.is_idle()),
+    }
+
+
+_pool: BackendClientPool | None = None
+
+
+def get_pool() -> BackendClientPool:
+    global _pool
+    if _pool is None:
+        _pool = BackendClientPool.from_env()
+    return _pool
+
+
+async def close_pool():
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
@@ -0,0 +1,147 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Sequence
+
+from .routingTable import STRATEGY_POWER_OF_TWO, STRATEGY_STATIC, BackendRoute
+
+logger = logging.getLogger(__name__)
+
+LOAD_EWMA_ALPHA = float(os.getenv("ROUTER_LOAD_EWMA_ALPHA", "0.2"))
+EJECT_TTFT_SECONDS = float(os.getenv("ROUTER_EJECT_TTFT_SECONDS", "0"))
+EJECT_CONSECUTIVE_FAILURES = int(os.getenv("ROUTER_EJECT_CONSECUTIVE_FAILURES", "3"))
+EJECT_BASE_BACKOFF_SECONDS = float(os.getenv("ROUTER_EJECT_BASE_BACKOFF_SECONDS", "5"))
+EJECT_MAX_BACKOFF_SECONDS = float(os.getenv("ROUTER_EJECT_MAX_BACKOFF_SECONDS", "120"))
+
+
+@dataclass
+class BackendLoad:
+    in_flight: int = 0
+    ewma_ttft_seconds: float | None = None
+    ewma_tokens_per_second: float | None = None
+    ewma_bytes_per_second: float | None = None
+    streams_cancelled_total: int = 0
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    backoff_seconds: float = 0.0
+    ejections_total: int = 0
+
+    def cost(self) -> float:
+        # Expected wait for one more request: queue depth scaled by how slowly this replica starts streaming.
+        return (self.in_flight + 1) * (self.ewma_ttft_seconds or 1.0)
+
+
+def _ewma(current: float | None, sample: float) -> float:
+    return sample if current is None else LOAD_EWMA_ALPHA * sample + (1 - LOAD_EWMA_ALPHA) * current
+
+
+class LoadTracker:
+    """
+    Per-backend in-flight counts and EWMA TTFT / tokens-per-second, fed by the proxied
+    streams, used to pick among equivalent replicas and to eject slow or failing ones.
+    """
+
+    def __init__(self):
+        self._loads: dict[str, BackendLoad] = {}
+
+    def get(self, key: str) -> BackendLoad:
+        load = self._loads.get(key)
+        if load is None:
+            load = self._loads[key] = BackendLoad()
+        return load
+
+    def pick(self, replicas: Sequence[BackendRoute], strategy: str) -> BackendRoute:
+        if len(replicas) == 1 or strategy == STRATEGY_STATIC:
+            return replicas[0]
+
+        now = time.monotonic()
+        healthy = [llm for llm in replicas if self._is_available(llm.base_url, now)]
+        # With every replica ejected, degrade to plain load balancing rather than failing the request.
+        candidates = healthy or list(replicas)
+
+        if strategy == STRATEGY_POWER_OF_TWO and len(candidates) > 2:
+            candidates = random.sample(candidates, 2)
+        return min(candidates, key=lambda llm: self.get(llm.base_url).cost())
+
+    def start(self, key: str):
+        self.get(key).in_flight += 1
+
+    def first_token(self, key: str, ttft_seconds: float):
+        load = self.get(key)
+        load.ewma_ttft_seconds = _ewma(load.ewma_ttft_seconds, ttft_seconds)
+        if EJECT_TTFT_SECONDS > 0 and load.ewma_ttft_seconds > EJECT_TTFT_SECONDS:
+            self._eject(key, load, f"EWMA TTFT {load.ewma_ttft_seconds:.2f}s > {EJECT_TTFT_SECONDS:.2f}s")
+
+    def finish(
+        self,
+        key: str,
+        ok: bool,
+        tokens: int = 0,
+        generation_seconds: float = 0.0,
+        n_bytes: int = 0,
+        cancelled: bool = False,
+    ):
+        load = self.get(key)
+        load.in_flight = max(0, load.in_flight - 1)
+        if cancelled:
+            load.streams_cancelled_total += 1
+        if not ok:
+            load.consecutive_failures += 1
+            if load.consecutive_failures >= EJECT_CONSECUTIVE_FAILURES:
+                self._eject(key, load, f"{load.consecutive_failures} consecutive failures")
+            return
+        load.consecutive_failures = 0
+        if load.ejected_until <= time.monotonic():
+            load.backoff_seconds = 0.0
+        # A stream cut short by its client says little about the replica's generation speed.
+        if generation_seconds > 0 and not cancelled:
+            if tokens > 0:
+                load.ewma_tokens_per_second = _ewma(load.ewma_tokens_per_second, tokens / generation_seconds)
+            if n_bytes > 0:
+                load.ewma_bytes_per_second = _ewma(load.ewma_bytes_per_second, n_bytes / generation_seconds)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        out = {}
+        for key, load in self._loads.items():
+            entry = asdict(load)
+            entry.pop("ejected_until")
+            entry["ejected"] = load.ejected_until > now
+            entry["ejected_for_seconds"] = max(0.0, load.ejected_until - now)
+            out[key] = entry
+        return out
+
+    def _is_available(self, key: str, now: float) -> bool:
+        load = self.get(key)
+        if load.ejected_until == 0.0:
+            return True
+        if load.ejected_until > now:
+            return False
+        # Back on probation: forget the latency that got it ejected so new samples decide.
+        load.ejected_until = 0.0
+        load.ewma_ttft_seconds = None
+        load.consecutive_failures = 0
+        return True
+
+    def _eject(self, key: str, load: BackendLoad, reason: str):
+        if load.ejected_until > time.monotonic():
+            return
+        load.backoff_seconds = min(
+            EJECT_MAX_BACKOFF_SECONDS, load.backoff_seconds * 2 if load.backoff_seconds else EJECT_BASE_BACKOFF_SECONDS
+        )
+        load.ejected_until = time.monotonic() + load.backoff_seconds
+        load.ejections_total += 1
+        logger.warning("Ejecting backend %s for %.0fs: %s", key, load.backoff_seconds, reason)
+
+
+_tracker = LoadTracker()
+
+
+def get_load_tracker() -> LoadTracker:
+    return _tracker
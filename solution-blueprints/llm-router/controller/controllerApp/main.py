@@ -7,36 +7,72 @@ import os
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import ValidationError
 
-from .config import load_config, mask_config
-from .proxy import proxy_chat_completion
+from .httpPool import close_pool, get_pool
+from .loadTracker import get_load_tracker
+from .metrics import render as render_metrics
+from .proxy import open_backend_clients, proxy_chat_completion
+from .routingCache import get_routing_cache
+from .routingTable import CONFIG_RELOAD_INTERVAL_SECONDS, ConfigWatcher, RoutingSnapshot, load_snapshot
 from .schemas import ChatCompletionRequest
 
 load_dotenv()
 
 app = FastAPI()
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.DEBUG)
-_config = None
+logging.basicConfig(
+    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper()),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+)
+# httpx logs every upstream request at INFO, which is per-request noise in the routing hot path.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+_snapshot: RoutingSnapshot | None = None
+_watcher: ConfigWatcher | None = None
 
 CONFIG_PATH = os.getenv("ROUTER_CONTROLLER_CONFIG", "/config/config.yaml")
 
 
-def get_config():
-    global _config
-    if _config is None:
+def get_snapshot() -> RoutingSnapshot:
+    global _snapshot
+    if _snapshot is None:
         logger.debug("Reading config file: %s", CONFIG_PATH)
-        _config = load_config(CONFIG_PATH)
+        _snapshot = load_snapshot(CONFIG_PATH)
         logger.info("Config loaded successfully")
-        if _config.get("routing_rules"):
-            logger.info("Loaded %d routing rules", len(_config.get("routing_rules", [])))
-            for rule in _config.get("routing_rules", []):
-                logger.info("  Rule: %s with %d models", rule.get("rule_name"), len(rule.get("models", [])))
-                for model in rule.get("models", [])[:1]:  # Log just the first model of each rule
-                    logger.info("    First model: %s", model.get("name"))
-    return _config
+    return _snapshot
+
+
+def _swap_snapshot(snapshot: RoutingSnapshot):
+    global _snapshot
+    if _snapshot is not None and _snapshot.version == snapshot.version:
+        return
+    # A single reference assignment: in-flight requests keep the snapshot they started with.
+    _snapshot = snapshot
+    logger.info("Routing config reloaded, now serving snapshot %s", snapshot.version)
+    try:
+        open_backend_clients(snapshot)
+    except Exception:
+        logger.exception("Could not pre-open backend clients for reloaded config")
+
+
+@app.on_event("startup")
+async def startup():
+    global _watcher
+    get_pool()
+    try:
+        open_backend_clients(get_snapshot())
+    except Exception:
+        logger.exception("Could not pre-open backend clients, they will be created on first use")
+    _watcher = ConfigWatcher(CONFIG_PATH, _swap_snapshot, CONFIG_RELOAD_INTERVAL_SECONDS)
+    _watcher.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    if _watcher is not None:
+        await _watcher.stop()
+    await close_pool()
 
 
 @app.get("/health")
@@ -46,8 +82,23 @@ async def health():
 
 @app.get("/config")
 async def config():
-    config = get_config()
-    return mask_config(config)
+    return Response(content=get_snapshot().masked_json, media_type="application/json")
+
+
+@app.get("/stats")
+async def stats():
+    routing_cache = get_routing_cache()
+    return {
+        "pool": get_pool().stats(),
+        "backends": get_load_tracker().stats(),
+        "routing_cache": routing_cache.stats() if routing_cache is not None else None,
+    }
+
+
+@app.get("/metrics")
+async def metrics():
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
 
 
 @app.post("/v1/chat/completions")
@@ -55,8 +106,7 @@ async def chat_completions(request: Request):
     try:
         data = await request.json()
         req = ChatCompletionRequest(**data)
-        config = get_config()
-        return await proxy_chat_completion(req, config, request.headers.get("authorization"))
+        return await proxy_chat_completion(req, get_snapshot(), request.headers.get("authorization"))
     except ValidationError as e:
         logger.warning("Invalid chat completion request payload: %s", e)
         return JSONResponse(
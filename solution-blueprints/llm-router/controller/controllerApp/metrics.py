@@ -0,0 +1,73 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import os
+import random
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+LOG_SAMPLE_RATE = float(os.getenv("ROUTER_LOG_SAMPLE_RATE", "0.01"))
+
+_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_TTFT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_REQUEST_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+CLASSIFICATION_SECONDS = Histogram(
+    "llm_router_classification_seconds",
+    "Time spent waiting for the classifier, by policy and chosen model.",
+    ["policy", "model"],
+    buckets=_FAST_BUCKETS,
+)
+ROUTING_OVERHEAD_SECONDS = Histogram(
+    "llm_router_routing_overhead_seconds",
+    "Time from request receipt to the upstream call, classification included.",
+    ["policy", "model"],
+    buckets=_FAST_BUCKETS,
+)
+UPSTREAM_TTFT_SECONDS = Histogram(
+    "llm_router_upstream_ttft_seconds",
+    "Time from opening the upstream stream to its first byte.",
+    ["policy", "model"],
+    buckets=_TTFT_BUCKETS,
+)
+REQUEST_SECONDS = Histogram(
+    "llm_router_request_seconds",
+    "Total chat completion latency through the router, until the last byte for streams.",
+    ["policy", "model", "stream"],
+    buckets=_REQUEST_BUCKETS,
+)
+UNKNOWN_FALLBACKS = Counter(
+    "llm_router_unknown_fallbacks_total",
+    "Requests routed to 'Unknown', because the classifier failed or because it chose 'Unknown'.",
+    ["policy", "reason"],
+)
+
+
+def observe_classification(policy: str, model: str, seconds: float):
+    CLASSIFICATION_SECONDS.labels(policy, model).observe(seconds)
+
+
+def observe_routing(policy: str, model: str, seconds: float):
+    ROUTING_OVERHEAD_SECONDS.labels(policy, model).observe(seconds)
+
+
+def observe_ttft(policy: str, model: str, seconds: float):
+    UPSTREAM_TTFT_SECONDS.labels(policy, model).observe(seconds)
+
+
+def observe_request(policy: str, model: str, stream: bool, seconds: float):
+    REQUEST_SECONDS.labels(policy, model, "true" if stream else "false").observe(seconds)
+
+
+def count_unknown_fallback(policy: str, reason: str):
+    UNKNOWN_FALLBACKS.labels(policy, reason).inc()
+
+
+def sampled() -> bool:
+    """Whether this event should be logged, so per-request detail stays affordable at high request rates."""
+    return LOG_SAMPLE_RATE >= 1.0 or (LOG_SAMPLE_RATE > 0.0 and random.random() < LOG_SAMPLE_RATE)
+
+
+def render() -> tuple[bytes, str]:
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,47 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from .httpPool import get_pool
+from .routingTable import normalize_openai_base_url
+
+_MODEL_CACHE: dict[str, str] = {}
+_MODEL_LOCKS: dict[str, asyncio.Lock] = {}
+
+
+def cached_model_name(base_url: str) -> str | None:
+    return _MODEL_CACHE.get(normalize_openai_base_url(base_url))
+
+
+async def fetch_model_name(base_url: str, auth_header: str | None = None) -> str:
+    base_url = normalize_openai_base_url(base_url)
+    models_url = f"{base_url}/v1/models"
+
+    # One lock per backend: a slow discovery (possibly a speculative one) must not stall other backends.
+    async with _MODEL_LOCKS.setdefault(base_url, asyncio.Lock()):
+        if base_url in _MODEL_CACHE:
+            return _MODEL_CACHE[base_url]
+
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if auth_header:
+            headers["Authorization"] = auth_header
+
+        pool = get_pool()
+        async with pool.track(base_url):
+            resp = await pool.client_for(base_url).get(models_url, headers=headers, timeout=5)
+
+        if resp.status_code != 200:
+            raise RuntimeError(f"Failed to fetch models from {models_url}: {resp.status_code} {resp.text}")
+
+        data = resp.json()
+        if not data.get("data"):
+            raise RuntimeError(f"No models returned from {base_url}")
+
+        model_name = data["data"][0]["id"]
+        _MODEL_CACHE[base_url] = model_name
+        return model_name
@@ -2,121 +2,92 @@
 #
 # SPDX-License-Identifier: MIT
 
-import asyncio
 import logging
 import os
+import time
+from contextlib import AsyncExitStack
 
 import httpx
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import Response
 
 from .error import error_response
+from .httpPool import get_pool
+from .loadTracker import get_load_tracker
+from .metrics import count_unknown_fallback, observe_classification, observe_request, observe_routing
+from .modelDiscovery import fetch_model_name
 from .routerClassifier import classify
+from .routingCache import get_routing_cache
+from .routingTable import RoutingSnapshot
+from .speculation import SPECULATIVE_MODE, race_classifiers, record_decision, start_warmup
+from .streaming import RelayStreamingResponse, UpstreamRelay
 
 logger = logging.getLogger(__name__)
 
 CONTEXT_MODE = os.getenv("CLASSIFIER_CONTEXT_MODE", "user_only").lower()
 CONTEXT_TURNS = int(os.getenv("CLASSIFIER_CONTEXT_TURNS", "5"))
 
-_MODEL_CACHE: dict[str, str] = {}
-_MODEL_LOCK = asyncio.Lock()
 
+def open_backend_clients(snapshot: RoutingSnapshot):
+    """Create pooled clients for every backend in the routing snapshot so the first request finds them ready."""
+    pool = get_pool()
+    for llm in snapshot.backends:
+        pool.client_for(llm.base_url)
 
-def _normalize_openai_base_url(base_url: str) -> str:
-    normalized = base_url.rstrip("/")
-    if normalized.endswith("/v1"):
-        normalized = normalized[: -len("/v1")]
-    if not normalized.startswith("http://") and not normalized.startswith("https://"):
-        normalized = "http://" + normalized
-    return normalized
 
+def server_timing(classify_seconds: float, route_seconds: float) -> str:
+    """``Server-Timing`` value exposing classification and total routing time before the upstream call."""
+    return f"classify;dur={classify_seconds * 1000:.2f}, route;dur={route_seconds * 1000:.2f}"
 
-def _auth_header_from_api_key(api_key: str | None) -> str | None:
-    if api_key:
-        normalized = api_key.strip()
-        if not normalized:
-            return None
-        if normalized.lower().startswith("bearer "):
-            token = normalized[7:].strip()
-            return f"Bearer {token}" if token else None
-        return f"Bearer {normalized}"
-    return None
 
-
-async def fetch_model_name(base_url: str, auth_header: str | None = None) -> str:
-    base_url = _normalize_openai_base_url(base_url)
-    models_url = f"{base_url}/v1/models"
-
-    async with _MODEL_LOCK:
-        if base_url in _MODEL_CACHE:
-            return _MODEL_CACHE[base_url]
-
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        }
-        if auth_header:
-            headers["Authorization"] = auth_header
-
-        async with httpx.AsyncClient(timeout=5) as client:
-            resp = await client.get(models_url, headers=headers)
-
-        if resp.status_code != 200:
-            raise RuntimeError(f"Failed to fetch models from {models_url}: {resp.status_code} {resp.text}")
-
-        data = resp.json()
-        if not data.get("data"):
-            raise RuntimeError(f"No models returned from {base_url}")
-
-        model_name = data["data"][0]["id"]
-        _MODEL_CACHE[base_url] = model_name
-        return model_name
-
-
-async def stream_llm(api_url, body, headers, status, classifier_name):
+async def stream_llm(api_url, body, headers, classifier_name, base_url, timing=None, policy_name="", received=None):
+    """
+    Open the upstream stream before answering, so its status and headers reach the client and a failed
+    upstream becomes a regular error response; then relay the body as raw buffers.
+    """
     exclude = {"content-length", "transfer-encoding", "content-encoding", "connection"}
     response_headers = {"X-Chosen-Classifier": classifier_name}
-
-    async def bytegen():
-        client = httpx.AsyncClient(timeout=None)
-        resp = None
-        try:
-            async with client.stream("POST", api_url, json=body, headers=headers) as resp:
-                if resp.status_code != 200:
-                    content = await resp.aread()
-                    raise RuntimeError(("__LLM_NON_OK__", resp.status_code, content, dict(resp.headers)))
-
-                for k, v in resp.headers.items():
-                    if k.lower() not in exclude:
-                        response_headers[k] = v
-
-                try:
-                    async for chunk in resp.aiter_bytes():
-                        if chunk:
-                            yield chunk
-                        await asyncio.sleep(0)
-                except (httpx.RemoteProtocolError, httpx.StreamError, httpx.ReadTimeout) as e:
-                    logger.warning("LLM stream error while iterating: %s", e)
-                    return
-                except Exception as e:
-                    logger.exception("Unexpected error while streaming from LLM: %s", e)
-                    return
-        finally:
-            if resp is not None:
-                try:
-                    await resp.aclose()
-                except Exception as e:
-                    logger.warning("Failed to close response: %s", e)
-            try:
-                await client.aclose()
-            except Exception as e:
-                logger.warning("Failed to close client: %s", e)
-
-    return StreamingResponse(bytegen(), status_code=status, headers=response_headers, media_type="text/event-stream")
-
-
-async def proxy_chat_completion(req, config: dict, incoming_auth: str | None = None):
+    if timing:
+        response_headers["Server-Timing"] = timing
+    # Raw buffers are forwarded untouched, which is only valid if the upstream does not compress them.
+    headers = {**headers, "Accept": "text/event-stream", "Accept-Encoding": "identity"}
+
+    pool = get_pool()
+    client = pool.client_for(base_url)
+    tracker = get_load_tracker()
+    tracker.start(base_url)
+    started = time.monotonic()
+    received = received if received is not None else time.perf_counter()
+    stack = AsyncExitStack()
+    try:
+        await stack.enter_async_context(pool.track(base_url))
+        resp = await stack.enter_async_context(client.stream("POST", api_url, json=body, headers=headers))
+        if resp.status_code != 200:
+            content = await resp.aread()
+    except BaseException as e:
+        tracker.finish(base_url, ok=False)
+        await stack.__aexit__(type(e), e, e.__traceback__)
+        raise
+
+    for k, v in resp.headers.items():
+        if k.lower() not in exclude:
+            response_headers[k] = v
+
+    if resp.status_code != 200:
+        await stack.aclose()
+        tracker.finish(base_url, ok=resp.status_code < 500)
+        observe_request(policy_name, classifier_name, True, time.perf_counter() - received)
+        logger.warning("LLM stream request to %s failed with status %s", api_url, resp.status_code)
+        return Response(content=content, status_code=resp.status_code, headers=response_headers)
+
+    relay = UpstreamRelay(resp, stack, base_url, started, policy_name, classifier_name, received)
+    return RelayStreamingResponse(relay, status_code=200, headers=response_headers, media_type="text/event-stream")
+
+
+async def proxy_chat_completion(req, snapshot: RoutingSnapshot, incoming_auth: str | None = None):
+    received = time.perf_counter()
+    classify_seconds = 0.0
     llm_router = req.llm_router
-    policy = next((p for p in config["routing_rules"] if p["rule_name"] == llm_router.policy), None)
+    policy = snapshot.policies.get(llm_router.policy)
     if not policy:
         return error_response(
             "routing_error_policy_not_found", f"Policy '{llm_router.policy}' not found", 400, "router"
@@ -126,9 +97,29 @@ async def proxy_chat_completion(req, config: dict, incoming_auth: str | None = N
         llm_name = llm_router.model
     else:
         classifier_messages = build_classifier_messages(req.messages)
-        classes = [llm_def["name"] for llm_def in policy["models"]]
+        classes = list(policy.classes)
+        routing_cache = get_routing_cache()
+        llm_name = None
+        if routing_cache is not None:
+            llm_name, cache_probe = await routing_cache.lookup(
+                llm_router.policy, snapshot.version, classifier_messages, classes
+            )
         try:
-            llm_name = await classify(classifier_messages, classes, policy["classifier_endpoint"])
+            if llm_name is None:
+                classify_started = time.perf_counter()
+                if SPECULATIVE_MODE:
+                    start_warmup(policy, req.model, incoming_auth)
+                    llm_name = await race_classifiers(classifier_messages, classes, policy)
+                    record_decision(policy.rule_name, llm_name)
+                else:
+                    llm_name = await classify(classifier_messages, classes, policy.classifier_endpoint)
+                classify_seconds = time.perf_counter() - classify_started
+                observe_classification(llm_router.policy, llm_name, classify_seconds)
+                if llm_name == "Unknown":
+                    count_unknown_fallback(llm_router.policy, "classifier_unknown")
+                # "Unknown" is also the classifier's own failure fallback, so only cache confident decisions.
+                if routing_cache is not None and llm_name != "Unknown":
+                    routing_cache.store(cache_probe, llm_name)
         except Exception as e:
             logger.exception("Classifier failed for policy '%s'", llm_router.policy)
             if "Unknown" in classes:
@@ -138,35 +129,36 @@ async def proxy_chat_completion(req, config: dict, incoming_auth: str | None = N
                     e,
                 )
                 llm_name = "Unknown"
+                count_unknown_fallback(llm_router.policy, "classifier_error")
             else:
                 return error_response("routing_error_classifier", f"Classifier request failed: {e}", 503, "router")
-    llm = next((llm_def for llm_def in policy["models"] if llm_def["name"] == llm_name), None)
-    if not llm:
+    replicas = policy.replicas.get(llm_name)
+    if not replicas:
         return error_response(
             "routing_error_model_not_found",
-            f"LLM '{llm_name}' not found in policy '{policy['rule_name']}'",
+            f"LLM '{llm_name}' not found in policy '{policy.rule_name}'",
             400,
             "router",
         )
+    llm = get_load_tracker().pick(replicas, policy.routing_strategy)
 
-    base_url = _normalize_openai_base_url(llm["base_url_path"])
-    api_key = llm.get("api_key")
-    logger.debug("LLM config for '%s': api_key_present=%s", llm_name, "yes" if api_key else "no")
+    base_url = llm.base_url
+    logger.debug("LLM config for '%s': api_key_present=%s", llm_name, "yes" if llm.auth_header else "no")
 
     # Check if api_key is still a placeholder
-    if api_key and api_key.startswith("${"):
+    if llm.api_key_placeholder:
         logger.warning("API key is still a placeholder (not expanded by config loader)")
 
-    primary_auth = _auth_header_from_api_key(api_key) or incoming_auth
-    logger.info(
+    primary_auth = llm.auth_header or incoming_auth
+    logger.debug(
         "Using auth: source=%s (api_key=%s, incoming=%s)",
-        "api_key" if _auth_header_from_api_key(api_key) else "incoming",
-        "yes" if api_key else "no",
+        "api_key" if llm.auth_header else "incoming",
+        "yes" if llm.auth_header else "no",
         "yes" if incoming_auth else "no",
     )
-    fallback_auth = incoming_auth if _auth_header_from_api_key(api_key) and incoming_auth else None
+    fallback_auth = incoming_auth if llm.auth_header and incoming_auth else None
 
-    model_name = (llm.get("model_name") or "").strip() or (req.model or "").strip()
+    model_name = llm.model_name or (req.model or "").strip()
     if not model_name:
         try:
             model_name = await fetch_model_name(base_url, primary_auth)
@@ -198,7 +190,7 @@ async def proxy_chat_completion(req, config: dict, incoming_auth: str | None = N
                     "router",
                 )
 
-    api_url = f"{base_url}/v1/chat/completions"
+    api_url = llm.api_url
 
     body = {
         "model": model_name,
@@ -217,22 +209,42 @@ async def proxy_chat_completion(req, config: dict, incoming_auth: str | None = N
     }
     if primary_auth:
         headers["Authorization"] = primary_auth
+    route_seconds = time.perf_counter() - received
+    observe_routing(llm_router.policy, llm_name, route_seconds)
+    timing = server_timing(classify_seconds, route_seconds)
     if req.stream:
-        return await stream_llm(api_url, body, headers, 200, llm_name)
+        try:
+            return await stream_llm(
+                api_url, body, headers, llm_name, base_url, timing, policy_name=llm_router.policy, received=received
+            )
+        except httpx.RequestError as e:
+            logger.exception("Backend stream request failed for model '%s'", llm_name)
+            return error_response(
+                "routing_error_backend_unreachable",
+                f"Backend request failed for '{llm_name}' at {api_url}: {e}",
+                502,
+                "router",
+            )
     else:
+        pool = get_pool()
+        client = pool.client_for(base_url)
+        tracker = get_load_tracker()
+        tracker.start(base_url)
+        backend_ok = False
         try:
-            async with httpx.AsyncClient(timeout=None) as client:
+            async with pool.track(base_url):
                 resp = await client.post(api_url, json=body, headers=headers)
                 if resp.status_code in (401, 403) and fallback_auth and headers.get("Authorization") != fallback_auth:
                     retry_headers = dict(headers)
                     retry_headers["Authorization"] = fallback_auth
                     resp = await client.post(api_url, json=body, headers=retry_headers)
                 exclude = {"content-length", "transfer-encoding", "content-encoding", "connection"}
-                response_headers = {"X-Chosen-Classifier": llm_name}
+                response_headers = {"X-Chosen-Classifier": llm_name, "Server-Timing": timing}
                 for k, v in resp.headers.items():
                     if k.lower() not in exclude:
                         response_headers[k] = v
                 data = await resp.aread()
+                backend_ok = resp.status_code < 500
                 return Response(
                     content=data, status_code=resp.status_code, headers=response_headers, media_type="application/json"
                 )
@@ -244,6 +256,9 @@ async def proxy_chat_completion(req, config: dict, incoming_auth: str | None = N
                 502,
                 "router",
             )
+        finally:
+            tracker.finish(base_url, ok=backend_ok)
+            observe_request(llm_router.policy, llm_name, False, time.perf_counter() - received)
 
 
 def build_classifier_messages(messages):
@@ -3,42 +3,48 @@
 # SPDX-License-Identifier: MIT
 
 import json
+import logging
 import os
+import time
+from urllib.parse import urlsplit
 
 import httpx
 
+from .httpPool import get_pool
+from .metrics import sampled
+
+logger = logging.getLogger(__name__)
+
 
 async def classify(messages: list, classes: list, url: str) -> str:
     payload = {
         "messages": messages,
         "classes": classes,
     }
-
-    print(f"[router_classifier] POST {url} with payload:")
-    print(json.dumps(payload, ensure_ascii=False, indent=2))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("POST %s with payload: %s", url, json.dumps(payload, ensure_ascii=False))
 
     timeout_s = float(os.getenv("CLASSIFIER_HTTP_TIMEOUT_SECONDS", "30"))
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
-        try:
-            response = await client.post(url, json=payload)
-        except httpx.TimeoutException as e:
-            print(f"[router_classifier] Timeout while requesting classifier: {type(e).__name__}: {repr(e)}")
-            raise Exception(f"Classifier HTTP timeout after {timeout_s}s: {type(e).__name__}: {repr(e)}")
-        except Exception as e:
-            print(f"[router_classifier] Exception while requesting classifier: {type(e).__name__}: {repr(e)}")
-            raise Exception(f"Classifier HTTP error: {type(e).__name__}: {repr(e)}")
-
-    print(f"[router_classifier] Classifier status={response.status_code}")
-    print("[router_classifier] Classifier raw response:", response.text)
+    parts = urlsplit(url)
+    pool_key = f"{parts.scheme}://{parts.netloc}"
+    pool = get_pool()
+    started = time.perf_counter()
+    try:
+        async with pool.track(pool_key):
+            response = await pool.client_for(pool_key).post(url, json=payload, timeout=timeout_s)
+    except httpx.TimeoutException as e:
+        logger.warning("Timeout while requesting classifier %s: %r", url, e)
+        raise Exception(f"Classifier HTTP timeout after {timeout_s}s: {type(e).__name__}: {repr(e)}")
+    except Exception as e:
+        logger.warning("Exception while requesting classifier %s: %r", url, e)
+        raise Exception(f"Classifier HTTP error: {type(e).__name__}: {repr(e)}")
 
     try:
         data = response.json()
     except Exception as e:
-        print(f"[router_classifier] Exception during .json(): {e}")
+        logger.warning("Classifier %s returned invalid JSON (status=%s): %s", url, response.status_code, e)
         raise Exception(f"Classifier invalid json: {e}, body={response.text}")
 
-    print("[router_classifier] Classifier decoded response:", data)
-
     if response.status_code != 200:
         raise Exception(f"Classifier service error, status={response.status_code}, body={data}")
 
@@ -46,4 +52,12 @@ async def classify(messages: list, classes: list, url: str) -> str:
     if not chosen_class:
         raise Exception(f"Classifier returned empty selection, body={data}")
 
+    if sampled():
+        logger.info(
+            "Classifier %s chose %r among %d classes in %.1f ms",
+            url,
+            chosen_class,
+            len(classes),
+            (time.perf_counter() - started) * 1000,
+        )
     return chosen_class
@@ -0,0 +1,250 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .httpPool import get_pool
+
+logger = logging.getLogger(__name__)
+
+ROUTING_CACHE_ENABLED = os.getenv("ROUTING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+ROUTING_CACHE_TTL_SECONDS = float(os.getenv("ROUTING_CACHE_TTL_SECONDS", "300"))
+ROUTING_CACHE_MAX_ENTRIES = int(os.getenv("ROUTING_CACHE_MAX_ENTRIES", "4096"))
+ROUTING_CACHE_EMBEDDING_URL = os.getenv("ROUTING_CACHE_EMBEDDING_URL", "").strip("\"'").strip()
+ROUTING_CACHE_EMBEDDING_MODEL = os.getenv("ROUTING_CACHE_EMBEDDING_MODEL", "").strip("\"'").strip()
+ROUTING_CACHE_SIMILARITY_THRESHOLD = float(os.getenv("ROUTING_CACHE_SIMILARITY_THRESHOLD", "0.97"))
+ROUTING_CACHE_EMBEDDING_TIMEOUT_SECONDS = float(os.getenv("ROUTING_CACHE_EMBEDDING_TIMEOUT_SECONDS", "2"))
+
+
+@dataclass
+class CacheStats:
+    hits_exact: int = 0
+    hits_semantic: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+@dataclass
+class CacheProbe:
+    """Lookup state carried from ``lookup`` to ``store`` so the key and embedding are computed once."""
+
+    scope: str
+    key: str
+    dialogue: str
+    embedding: np.ndarray | None = None
+    embedded: bool = False  # lookup already asked for the embedding (even if it failed)
+
+
+@dataclass
+class _Entry:
+    label: str
+    scope: str
+    expires_at: float
+    embedding: np.ndarray | None = None
+
+
+@dataclass
+class _SemanticIndex:
+    keys: list[str] = field(default_factory=list)
+    matrix: np.ndarray | None = None
+    dirty: bool = False
+
+
+class RoutingCache:
+    """
+    Caches classifier decisions per routing policy and class set.
+
+    The exact tier hashes the classifier messages; the optional semantic tier embeds the
+    dialogue and reuses a decision whose cosine similarity exceeds the configured threshold.
+    Entries are bounded by TTL and LRU size and are dropped whenever the routing config changes.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = ROUTING_CACHE_TTL_SECONDS,
+        max_entries: int = ROUTING_CACHE_MAX_ENTRIES,
+        embedding_url: str = ROUTING_CACHE_EMBEDDING_URL,
+        embedding_model: str = ROUTING_CACHE_EMBEDDING_MODEL,
+        similarity_threshold: float = ROUTING_CACHE_SIMILARITY_THRESHOLD,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embedding_url = embedding_url
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._semantic: dict[str, _SemanticIndex] = {}
+        self._config_version: str | None = None
+        self._stats = CacheStats()
+        self._indexing: set[asyncio.Task] = set()
+
+    @property
+    def semantic_enabled(self) -> bool:
+        return bool(self.embedding_url)
+
+    def clear(self):
+        self._entries.clear()
+        self._semantic.clear()
+
+    async def lookup(
+        self, policy: str, config_version: str | None, messages: list[dict], classes: list[str]
+    ) -> tuple[str | None, CacheProbe]:
+        if config_version != self._config_version:
+            if self._entries:
+                logger.info("Routing config changed, dropping %d cached routing decisions", len(self._entries))
+                self._stats.invalidations += 1
+            self.clear()
+            self._config_version = config_version
+
+        scope = _digest([policy, classes])
+        key = _digest([scope, messages])
+        dialogue = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+        probe = CacheProbe(scope=scope, key=key, dialogue=dialogue)
+
+        entry = self._get_live(key)
+        if entry is not None:
+            self._stats.hits_exact += 1
+            return entry.label, probe
+
+        if self.semantic_enabled and scope in self._semantic:
+            probe.embedding = await self._embed(dialogue)
+            probe.embedded = True
+            label = self._nearest(scope, probe.embedding)
+            if label is not None:
+                self._stats.hits_semantic += 1
+                return label, probe
+
+        self._stats.misses += 1
+        return None, probe
+
+    def store(self, probe: CacheProbe, label: str):
+        """
+        Store a decision in the exact tier right away. The semantic tier reuses the lookup's
+        embedding; if lookup did not embed, the embedding is fetched in the background so the
+        request never waits for it.
+        """
+        previous = self._entries.pop(probe.key, None)
+        if previous is not None:
+            self._forget(probe.key, previous)
+        entry = _Entry(label=label, scope=probe.scope, expires_at=time.monotonic() + self.ttl_seconds)
+        self._entries[probe.key] = entry
+
+        while len(self._entries) > self.max_entries:
+            evicted_key, evicted = self._entries.popitem(last=False)
+            self._forget(evicted_key, evicted)
+            self._stats.evictions += 1
+
+        if not self.semantic_enabled:
+            return
+        if probe.embedded:
+            # A failed lookup embedding is not retried: the endpoint just failed for this request.
+            if probe.embedding is not None:
+                self._index(probe.key, entry, probe.embedding)
+            return
+        task = asyncio.create_task(self._index_later(probe, entry))
+        self._indexing.add(task)
+        task.add_done_callback(self._indexing.discard)
+
+    def stats(self) -> dict:
+        out = asdict(self._stats)
+        lookups = self._stats.hits_exact + self._stats.hits_semantic + self._stats.misses
+        out["hit_rate"] = (self._stats.hits_exact + self._stats.hits_semantic) / lookups if lookups else 0.0
+        out["size"] = len(self._entries)
+        out["semantic_enabled"] = self.semantic_enabled
+        return out
+
+    def _get_live(self, key: str) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self._forget(key, entry)
+            self._stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def _index_later(self, probe: CacheProbe, entry: _Entry):
+        embedding = await self._embed(probe.dialogue)
+        # The entry may have been replaced, evicted or dropped by a config change meanwhile.
+        if embedding is not None and self._entries.get(probe.key) is entry:
+            self._index(probe.key, entry, embedding)
+
+    def _index(self, key: str, entry: _Entry, embedding: np.ndarray):
+        entry.embedding = embedding
+        index = self._semantic.setdefault(entry.scope, _SemanticIndex())
+        index.keys.append(key)
+        index.dirty = True
+
+    def _forget(self, key: str, entry: _Entry):
+        index = self._semantic.get(entry.scope)
+        if index is not None and entry.embedding is not None:
+            try:
+                index.keys.remove(key)
+                index.dirty = True
+            except ValueError:
+                pass
+
+    def _nearest(self, scope: str, embedding: np.ndarray | None) -> str | None:
+        index = self._semantic.get(scope)
+        if embedding is None or index is None or not index.keys:
+            return None
+        if index.dirty:
+            index.matrix = np.stack([self._entries[k].embedding for k in index.keys])
+            index.dirty = False
+        similarities = index.matrix @ embedding
+        # Best match first; expired entries are dropped by _get_live and the next best is tried.
+        keys = list(index.keys)
+        candidates = np.flatnonzero(similarities >= self.similarity_threshold)
+        for i in candidates[np.argsort(-similarities[candidates])]:
+            entry = self._get_live(keys[i])
+            if entry is not None:
+                return entry.label
+        return None
+
+    async def _embed(self, text: str) -> np.ndarray | None:
+        parts = urlsplit(self.embedding_url)
+        pool_key = f"{parts.scheme}://{parts.netloc}"
+        pool = get_pool()
+        payload = {"model": self.embedding_model, "input": [text], "encoding_format": "float"}
+        try:
+            async with pool.track(pool_key):
+                resp = await pool.client_for(pool_key).post(
+                    self.embedding_url, json=payload, timeout=ROUTING_CACHE_EMBEDDING_TIMEOUT_SECONDS
+                )
+            resp.raise_for_status()
+            vector = np.asarray(resp.json()["data"][0]["embedding"], dtype=np.float32)
+        except Exception as e:
+            logger.warning("Routing cache embedding failed, semantic tier skipped: %s", e)
+            return None
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+
+def _digest(value) -> str:
+    return hashlib.sha256(json.dumps(value, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+_cache: RoutingCache | None = None
+
+
+def get_routing_cache() -> RoutingCache | None:
+    global _cache
+    if not ROUTING_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = RoutingCache()
+    return _cache
@@ -0,0 +1,176 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Mapping
+
+from .config import config_version, load_config, mask_config
+
+logger = logging.getLogger(__name__)
+
+CONFIG_RELOAD_INTERVAL_SECONDS = float(os.getenv("ROUTER_CONFIG_RELOAD_INTERVAL_SECONDS", "10"))
+
+STRATEGY_STATIC = "static"
+STRATEGY_LEAST_LOADED = "least_loaded"
+STRATEGY_POWER_OF_TWO = "power_of_two"
+ROUTING_STRATEGIES = (STRATEGY_STATIC, STRATEGY_LEAST_LOADED, STRATEGY_POWER_OF_TWO)
+
+
+def normalize_openai_base_url(base_url: str) -> str:
+    normalized = base_url.rstrip("/")
+    if normalized.endswith("/v1"):
+        normalized = normalized[: -len("/v1")]
+    if not normalized.startswith("http://") and not normalized.startswith("https://"):
+        normalized = "http://" + normalized
+    return normalized
+
+
+def auth_header_from_api_key(api_key: str | None) -> str | None:
+    if api_key:
+        normalized = api_key.strip()
+        if not normalized:
+            return None
+        if normalized.lower().startswith("bearer "):
+            token = normalized[7:].strip()
+            return f"Bearer {token}" if token else None
+        return f"Bearer {normalized}"
+    return None
+
+
+@dataclass(frozen=True)
+class BackendRoute:
+    name: str
+    base_url: str
+    api_url: str
+    auth_header: str | None
+    api_key_placeholder: bool
+    model_name: str
+
+
+@dataclass(frozen=True)
+class PolicyRoute:
+    rule_name: str
+    classifier_endpoint: str
+    classifier_race_endpoints: tuple[str, ...]
+    classes: tuple[str, ...]
+    models: Mapping[str, BackendRoute]
+    replicas: Mapping[str, tuple[BackendRoute, ...]]
+    routing_strategy: str
+
+
+@dataclass(frozen=True)
+class RoutingSnapshot:
+    """Immutable, pre-resolved view of one routing config; replaced wholesale on reload."""
+
+    version: str
+    policies: Mapping[str, PolicyRoute]
+    masked_json: bytes
+    loaded_at: float = field(default_factory=time.time)
+
+    @property
+    def backends(self) -> tuple[BackendRoute, ...]:
+        return tuple(llm for policy in self.policies.values() for group in policy.replicas.values() for llm in group)
+
+
+def compile_config(config: dict) -> RoutingSnapshot:
+    policies: dict[str, PolicyRoute] = {}
+    for rule in config.get("routing_rules", []):
+        # Models sharing a name are equivalent replicas of one class; the first one is the static choice.
+        replicas: dict[str, list[BackendRoute]] = {}
+        for llm_def in rule.get("models", []):
+            base_url = normalize_openai_base_url(llm_def["base_url_path"])
+            api_key = llm_def.get("api_key")
+            replicas.setdefault(llm_def["name"], []).append(
+                BackendRoute(
+                    name=llm_def["name"],
+                    base_url=base_url,
+                    api_url=f"{base_url}/v1/chat/completions",
+                    auth_header=auth_header_from_api_key(api_key),
+                    api_key_placeholder=bool(api_key and api_key.startswith("${")),
+                    model_name=(llm_def.get("model_name") or "").strip(),
+                )
+            )
+        routing_strategy = rule.get("routing_strategy") or STRATEGY_STATIC
+        if routing_strategy not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"Unknown routing_strategy '{routing_strategy}' in rule '{rule['rule_name']}', "
+                f"expected one of {', '.join(ROUTING_STRATEGIES)}"
+            )
+        policies.setdefault(
+            rule["rule_name"],
+            PolicyRoute(
+                rule_name=rule["rule_name"],
+                classifier_endpoint=rule.get("classifier_endpoint", ""),
+                classifier_race_endpoints=tuple(rule.get("classifier_race_endpoints") or ()),
+                classes=tuple(replicas),
+                models=MappingProxyType({name: group[0] for name, group in replicas.items()}),
+                replicas=MappingProxyType({name: tuple(group) for name, group in replicas.items()}),
+                routing_strategy=routing_strategy,
+            ),
+        )
+    return RoutingSnapshot(
+        version=config_version(config),
+        policies=MappingProxyType(policies),
+        masked_json=json.dumps(mask_config(config)).encode("utf-8"),
+    )
+
+
+def load_snapshot(path: str) -> RoutingSnapshot:
+    snapshot = compile_config(load_config(path))
+    logger.info("Compiled routing snapshot %s with %d policies", snapshot.version, len(snapshot.policies))
+    for policy in snapshot.policies.values():
+        logger.info("  Rule: %s with %d models", policy.rule_name, len(policy.models))
+    return snapshot
+
+
+class ConfigWatcher:
+    """Polls the config file and swaps in a freshly compiled snapshot when it changes."""
+
+    def __init__(self, path: str, on_change: Callable[[RoutingSnapshot], None], interval_seconds: float):
+        self.path = path
+        self.on_change = on_change
+        self.interval_seconds = interval_seconds
+        self._signature = self._stat()
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self.interval_seconds > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _stat(self):
+        # Mounted ConfigMaps are updated by swapping a symlink, which changes the inode as well as the mtime.
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            signature = self._stat()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            try:
+                snapshot = load_snapshot(self.path)
+            except Exception:
+                logger.exception("Failed to reload routing config from %s, keeping the current snapshot", self.path)
+                continue
+            self.on_change(snapshot)
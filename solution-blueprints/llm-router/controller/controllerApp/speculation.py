@@ -0,0 +1,132 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import logging
+import os
+from collections import Counter
+
+from .httpPool import get_pool
+from .modelDiscovery import cached_model_name, fetch_model_name
+from .routerClassifier import classify
+from .routingTable import BackendRoute, PolicyRoute
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_MODE = os.getenv("ROUTER_SPECULATIVE_MODE", "false").lower() in ("1", "true", "yes")
+SPECULATIVE_CLASSIFIER_DEADLINE_SECONDS = float(os.getenv("ROUTER_SPECULATIVE_CLASSIFIER_DEADLINE_SECONDS", "0.5"))
+SPECULATIVE_WARMUP_TIMEOUT_SECONDS = float(os.getenv("ROUTER_SPECULATIVE_WARMUP_TIMEOUT_SECONDS", "2"))
+SPECULATIVE_HISTORY_SIZE = int(os.getenv("ROUTER_SPECULATIVE_HISTORY_SIZE", "1000"))
+
+_decisions: dict[str, Counter] = {}
+_background: set[asyncio.Task] = set()
+
+
+def record_decision(policy: str, llm_name: str):
+    counts = _decisions.setdefault(policy, Counter())
+    counts[llm_name] += 1
+    if sum(counts.values()) > SPECULATIVE_HISTORY_SIZE:
+        # Halve the history so the prediction follows shifts in traffic.
+        for name in list(counts):
+            counts[name] //= 2
+        counts += Counter()
+
+
+def predict_backend(policy: PolicyRoute) -> BackendRoute | None:
+    """Most frequent recent decision for the policy, else its ``Unknown`` default, else its first model."""
+    counts = _decisions.get(policy.rule_name)
+    if counts:
+        for name, _ in counts.most_common():
+            if name in policy.models:
+                return policy.models[name]
+    if "Unknown" in policy.models:
+        return policy.models["Unknown"]
+    return next(iter(policy.models.values()), None)
+
+
+def start_warmup(policy: PolicyRoute, request_model: str | None, incoming_auth: str | None):
+    """Warm the predicted backend in the background while classification runs."""
+    llm = predict_backend(policy)
+    if llm is None:
+        return
+    needs_discovery = not llm.model_name and not (request_model or "").strip()
+    if needs_discovery and cached_model_name(llm.base_url) is None:
+        coro = _discover(llm, llm.auth_header or incoming_auth)
+    elif not get_pool().is_warm(llm.base_url):
+        coro = _open_connection(llm, llm.auth_header or incoming_auth)
+    else:
+        return
+    task = asyncio.get_running_loop().create_task(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def _discover(llm: BackendRoute, auth_header: str | None):
+    try:
+        await fetch_model_name(llm.base_url, auth_header)
+    except Exception as e:
+        logger.debug("Speculative model discovery for '%s' failed: %s", llm.name, e)
+
+
+async def _open_connection(llm: BackendRoute, auth_header: str | None):
+    # Any cheap request leaves a keep-alive connection in the pool; /v1/models is served by every backend.
+    headers = {"Accept": "application/json"}
+    if auth_header:
+        headers["Authorization"] = auth_header
+    pool = get_pool()
+    try:
+        async with pool.track(llm.base_url):
+            await pool.client_for(llm.base_url).get(
+                f"{llm.base_url}/v1/models", headers=headers, timeout=SPECULATIVE_WARMUP_TIMEOUT_SECONDS
+            )
+    except Exception as e:
+        logger.debug("Speculative connection warm-up for '%s' failed: %s", llm.name, e)
+
+
+async def race_classifiers(messages: list, classes: list, policy: PolicyRoute) -> str:
+    """
+    Query the policy's primary classifier, hedged by its race endpoints.
+
+    The primary classifier is asked alone first and its answer, ``Unknown`` included, is used whenever it
+    arrives within ``SPECULATIVE_CLASSIFIER_DEADLINE_SECONDS``. Only if it fails or misses the deadline are
+    the race endpoints started; then the first confident answer wins, while a race ``Unknown`` is only
+    used once the primary has failed and no race endpoint did better.
+    """
+    if not policy.classifier_race_endpoints:
+        return await classify(messages, classes, policy.classifier_endpoint)
+
+    loop = asyncio.get_running_loop()
+    primary = loop.create_task(classify(messages, classes, policy.classifier_endpoint))
+    pending = {primary}
+    last_error: BaseException | None = None
+    fallback: str | None = None
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=SPECULATIVE_CLASSIFIER_DEADLINE_SECONDS)
+        if primary in done:
+            if primary.exception() is None:
+                return primary.result()
+            last_error = primary.exception()
+            pending.discard(primary)
+            logger.warning(
+                "Primary classifier failed for policy '%s', using race endpoints: %s", policy.rule_name, last_error
+            )
+        else:
+            logger.debug("Primary classifier missed its deadline for policy '%s', hedging", policy.rule_name)
+        pending |= {loop.create_task(classify(messages, classes, url)) for url in policy.classifier_race_endpoints}
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: t is not primary):
+                if task.exception() is not None:
+                    last_error = task.exception()
+                elif task is primary or task.result() != "Unknown":
+                    return task.result()
+                else:
+                    fallback = task.result()
+        if fallback is not None:
+            return fallback
+        raise last_error or RuntimeError("No classifier produced a result")
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,121 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import logging
+import time
+from contextlib import AsyncExitStack
+from typing import AsyncIterator
+
+import httpx
+from fastapi.responses import StreamingResponse
+
+from .loadTracker import get_load_tracker
+from .metrics import observe_request, observe_ttft, sampled
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamRelay:
+    """
+    Forwards an already opened upstream SSE response as the raw buffers read from the socket,
+    and owns its cleanup: closing the relay closes the upstream request and records the stream's metrics.
+    """
+
+    def __init__(
+        self,
+        resp: httpx.Response,
+        stack: AsyncExitStack,
+        base_url: str,
+        started: float,
+        policy: str = "",
+        model: str = "",
+        received: float | None = None,
+    ):
+        self.resp = resp
+        self.base_url = base_url
+        self.policy = policy
+        self.model = model
+        self._received = received
+        self._stack = stack
+        self._started = started
+        self._first_chunk_at: float | None = None
+        self._bytes = 0
+        self._tokens = 0
+        self._outcome: str | None = None
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            # The upstream is asked for identity encoding, so raw buffers are forwarded without decoding or re-chunking.
+            async for chunk in self.resp.aiter_raw():
+                if self._first_chunk_at is None:
+                    self._first_chunk_at = time.monotonic()
+                    ttft = self._first_chunk_at - self._started
+                    get_load_tracker().first_token(self.base_url, ttft)
+                    observe_ttft(self.policy, self.model, ttft)
+                self._bytes += len(chunk)
+                # Each SSE event carries one generated token for OpenAI-compatible servers.
+                self._tokens += chunk.count(b"data:")
+                yield chunk
+            # The final "[DONE]" event is not a token.
+            self._tokens = max(0, self._tokens - 1)
+            self._outcome = "ok"
+        except (httpx.RemoteProtocolError, httpx.StreamError, httpx.ReadTimeout) as e:
+            self._outcome = "failed"
+            logger.warning("LLM stream error while iterating: %s", e)
+        except Exception as e:
+            self._outcome = "failed"
+            logger.exception("Unexpected error while streaming from LLM: %s", e)
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        # Closing before the body was fully read drops the upstream connection, which aborts generation.
+        outcome = self._outcome or "cancelled"
+        try:
+            await self._stack.aclose()
+        except Exception as e:
+            logger.warning("Failed to close upstream stream from %s: %s", self.base_url, e)
+
+        now = time.monotonic()
+        ttft = self._first_chunk_at - self._started if self._first_chunk_at is not None else None
+        streaming_seconds = now - self._first_chunk_at if self._first_chunk_at is not None else 0.0
+        # A client disconnect is not the backend's fault, so only "failed" counts against the replica.
+        get_load_tracker().finish(
+            self.base_url,
+            ok=outcome != "failed",
+            tokens=self._tokens,
+            generation_seconds=streaming_seconds,
+            n_bytes=self._bytes,
+            cancelled=outcome == "cancelled",
+        )
+        if self._received is not None:
+            observe_request(self.policy, self.model, True, time.perf_counter() - self._received)
+        if not sampled():
+            return
+        logger.info(
+            "Stream from %s %s: ttft=%s bytes=%d bytes_per_second=%.0f duration=%.3fs",
+            self.base_url,
+            outcome,
+            f"{ttft:.3f}s" if ttft is not None else "n/a",
+            self._bytes,
+            self._bytes / streaming_seconds if streaming_seconds > 0 else 0.0,
+            now - self._started,
+        )
+
+
+class RelayStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that closes its body iterator as soon as the response ends. On a client disconnect
+    Starlette only cancels the send loop, leaving the iterator (and the upstream request) open until GC.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,9 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import sys
+from pathlib import Path
+
+# The controller runs with PYTHONPATH=controller, see templates/router-controller-deployment.yaml
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
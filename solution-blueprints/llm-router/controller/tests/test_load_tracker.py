@@ -0,0 +1,110 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+from controllerApp import loadTracker
+from controllerApp.loadTracker import LoadTracker
+from controllerApp.routingTable import STRATEGY_LEAST_LOADED, STRATEGY_POWER_OF_TWO, STRATEGY_STATIC, BackendRoute
+
+
+class FakeClock:
+    """Stands in for the ``time`` module used by loadTracker."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(loadTracker, "time", clock)
+    return clock
+
+
+def _replica(name: str) -> BackendRoute:
+    return BackendRoute(
+        name="chat",
+        base_url=f"http://{name}",
+        api_url=f"http://{name}/v1/chat/completions",
+        auth_header=None,
+        api_key_placeholder=False,
+        model_name="model",
+    )
+
+
+A, B, C = _replica("a"), _replica("b"), _replica("c")
+
+
+def test_static_always_picks_first():
+    tracker = LoadTracker()
+    tracker.start(A.base_url)
+    assert tracker.pick([A, B], STRATEGY_STATIC) is A
+
+
+def test_least_loaded_weighs_in_flight_by_ttft(clock):
+    tracker = LoadTracker()
+    tracker.start(A.base_url)
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) is B
+    tracker.first_token(B.base_url, 5.0)
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) is A
+    tracker.finish(A.base_url, ok=True)
+    assert tracker.get(A.base_url).in_flight == 0
+    tracker.finish(A.base_url, ok=True)
+    assert tracker.get(A.base_url).in_flight == 0  # never negative
+
+
+def test_power_of_two_compares_two_candidates(clock):
+    tracker = LoadTracker()
+    for _ in range(3):
+        tracker.start(C.base_url)
+    picks = {tracker.pick([A, B, C], STRATEGY_POWER_OF_TWO).base_url for _ in range(50)}
+    assert C.base_url not in picks
+
+
+def test_failures_eject_with_backoff_and_probation(clock, monkeypatch):
+    monkeypatch.setattr(loadTracker, "EJECT_CONSECUTIVE_FAILURES", 2)
+    monkeypatch.setattr(loadTracker, "EJECT_BASE_BACKOFF_SECONDS", 5.0)
+    tracker = LoadTracker()
+    tracker.finish(A.base_url, ok=False)
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) is A
+    tracker.finish(A.base_url, ok=False)
+    stats = tracker.stats()[A.base_url]
+    assert stats["ejected"] and stats["ejections_total"] == 1
+    for _ in range(3):
+        tracker.start(B.base_url)
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) is B
+
+    clock.now += 6
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) is A  # back on probation
+    tracker.finish(A.base_url, ok=False)
+    tracker.finish(A.base_url, ok=False)
+    assert tracker.get(A.base_url).backoff_seconds == 10.0  # backoff doubles on a repeat ejection
+
+
+def test_every_replica_ejected_still_routes(clock, monkeypatch):
+    monkeypatch.setattr(loadTracker, "EJECT_CONSECUTIVE_FAILURES", 1)
+    tracker = LoadTracker()
+    tracker.finish(A.base_url, ok=False)
+    tracker.finish(B.base_url, ok=False)
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) in (A, B)
+
+
+def test_slow_ttft_ejects_when_configured(clock, monkeypatch):
+    monkeypatch.setattr(loadTracker, "EJECT_TTFT_SECONDS", 1.0)
+    tracker = LoadTracker()
+    tracker.first_token(A.base_url, 3.0)
+    assert tracker.stats()[A.base_url]["ejected"]
+    assert tracker.pick([A, B], STRATEGY_LEAST_LOADED) is B
+
+
+def test_cancelled_stream_does_not_update_throughput(clock):
+    tracker = LoadTracker()
+    tracker.start(A.base_url)
+    tracker.finish(A.base_url, ok=True, tokens=10, generation_seconds=1.0, cancelled=True)
+    load = tracker.get(A.base_url)
+    assert load.ewma_tokens_per_second is None
+    assert load.streams_cancelled_total == 1
@@ -0,0 +1,157 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import numpy as np
+from controllerApp.routingCache import RoutingCache
+
+MESSAGES = [{"role": "user", "content": "Write a haiku about the sea"}]
+OTHER = [{"role": "user", "content": "Write a poem about the sea"}]
+CLASSES = ["coding", "creative"]
+
+
+def _unit(*values) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class FakeEmbeddings:
+    def __init__(self, vectors: dict[str, np.ndarray | None]):
+        self.vectors = vectors
+        self.calls: list[str] = []
+
+    async def __call__(self, text: str) -> np.ndarray | None:
+        self.calls.append(text)
+        for content, vector in self.vectors.items():
+            if content in text:
+                return vector
+        return None
+
+
+def _cache(embeddings: FakeEmbeddings | None = None, **kwargs) -> RoutingCache:
+    cache = RoutingCache(embedding_url="http://embeddings/v1/embeddings" if embeddings else "", **kwargs)
+    if embeddings:
+        cache._embed = embeddings
+    return cache
+
+
+def _expire(cache: RoutingCache, label: str):
+    for entry in cache._entries.values():
+        if entry.label == label:
+            entry.expires_at = 0
+
+
+async def _drain(cache: RoutingCache):
+    while cache._indexing:
+        await asyncio.gather(*cache._indexing)
+
+
+def test_exact_hit_and_config_invalidation():
+    async def scenario():
+        cache = _cache()
+        label, probe = await cache.lookup("policy", "v1", MESSAGES, CLASSES)
+        assert label is None
+        cache.store(probe, "creative")
+        assert (await cache.lookup("policy", "v1", MESSAGES, CLASSES))[0] == "creative"
+        assert (await cache.lookup("policy", "v1", MESSAGES, ["creative"]))[0] is None
+        assert (await cache.lookup("policy", "v2", MESSAGES, CLASSES))[0] is None
+        assert cache.stats()["invalidations"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_lru_eviction_and_ttl_expiry():
+    async def scenario():
+        cache = _cache(max_entries=2)
+        probes = []
+        for i in range(3):
+            _, probe = await cache.lookup("policy", "v1", [{"role": "user", "content": str(i)}], CLASSES)
+            probes.append(probe)
+            cache.store(probe, f"label-{i}")
+        assert cache.stats()["evictions"] == 1
+        assert (await cache.lookup("policy", "v1", [{"role": "user", "content": "0"}], CLASSES))[0] is None
+        assert (await cache.lookup("policy", "v1", [{"role": "user", "content": "2"}], CLASSES))[0] == "label-2"
+
+        expiring = _cache(ttl_seconds=0)
+        _, probe = await expiring.lookup("policy", "v1", MESSAGES, CLASSES)
+        expiring.store(probe, "creative")
+        assert (await expiring.lookup("policy", "v1", MESSAGES, CLASSES))[0] is None
+        assert expiring.stats()["expirations"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_store_indexes_in_background_and_reuses_lookup_embedding():
+    async def scenario():
+        embeddings = FakeEmbeddings({"haiku": _unit(1, 0), "poem": _unit(1, 0.01)})
+        cache = _cache(embeddings, similarity_threshold=0.9)
+        _, probe = await cache.lookup("policy", "v1", MESSAGES, CLASSES)
+        assert embeddings.calls == []  # nothing to compare against yet
+        cache.store(probe, "creative")
+        assert (await cache.lookup("policy", "v1", MESSAGES, CLASSES))[0] == "creative"  # exact tier is immediate
+        await _drain(cache)
+        assert len(embeddings.calls) == 1
+
+        label, probe = await cache.lookup("policy", "v1", OTHER, CLASSES)
+        assert label == "creative"
+        assert cache.stats()["hits_semantic"] == 1
+        cache.store(probe, "creative")
+        assert not cache._indexing
+        assert len(embeddings.calls) == 2  # the lookup's embedding was reused by store
+
+    asyncio.run(scenario())
+
+
+def test_store_does_not_retry_failed_lookup_embedding():
+    async def scenario():
+        embeddings = FakeEmbeddings({"haiku": _unit(1, 0)})
+        cache = _cache(embeddings)
+        _, probe = await cache.lookup("policy", "v1", MESSAGES, CLASSES)
+        cache.store(probe, "creative")
+        await _drain(cache)
+
+        _, probe = await cache.lookup("policy", "v1", OTHER, CLASSES)  # embedding fails for "poem"
+        assert probe.embedded and probe.embedding is None
+        cache.store(probe, "creative")
+        assert not cache._indexing
+        assert embeddings.calls.count(probe.dialogue) == 1
+
+    asyncio.run(scenario())
+
+
+def test_background_index_skips_replaced_entry():
+    async def scenario():
+        embeddings = FakeEmbeddings({"haiku": _unit(1, 0)})
+        cache = _cache(embeddings)
+        _, probe = await cache.lookup("policy", "v1", MESSAGES, CLASSES)
+        cache.store(probe, "creative")
+        await cache.lookup("policy", "v2", MESSAGES, CLASSES)  # config change drops the entry
+        await _drain(cache)
+        assert not cache._semantic
+
+    asyncio.run(scenario())
+
+
+def test_nearest_skips_expired_best_match():
+    async def scenario():
+        embeddings = FakeEmbeddings(
+            {"best": _unit(1, 0), "second": _unit(1, 0.1), "query": _unit(1, 0.02), "far": _unit(0, 1)}
+        )
+        cache = _cache(embeddings, similarity_threshold=0.9)
+        for content, label in (("best", "coding"), ("second", "creative"), ("far", "other")):
+            _, probe = await cache.lookup("policy", "v1", [{"role": "user", "content": content}], CLASSES)
+            cache.store(probe, label)
+            await _drain(cache)
+        _expire(cache, "coding")
+
+        label, _ = await cache.lookup("policy", "v1", [{"role": "user", "content": "query"}], CLASSES)
+        assert label == "creative"
+        assert cache.stats()["expirations"] == 1
+
+        _expire(cache, "creative")
+        label, _ = await cache.lookup("policy", "v1", [{"role": "user", "content": "query"}], CLASSES)
+        assert label is None  # "far" is below the threshold
+
+    asyncio.run(scenario())
@@ -0,0 +1,104 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from controllerApp import speculation
+from controllerApp.routingTable import STRATEGY_STATIC, PolicyRoute
+
+PRIMARY = "http://primary/classify"
+RACE = ("http://race-a/classify", "http://race-b/classify")
+
+
+def _policy() -> PolicyRoute:
+    return PolicyRoute(
+        rule_name="policy",
+        classifier_endpoint=PRIMARY,
+        classifier_race_endpoints=RACE,
+        classes=("coding", "creative"),
+        models={},
+        replicas={},
+        routing_strategy=STRATEGY_STATIC,
+    )
+
+
+def _classifiers(monkeypatch, answers: dict[str, tuple[float, str | Exception]]):
+    """Patch the classifier call with per-endpoint (delay, answer or error)."""
+    cancelled = []
+
+    async def classify(messages, classes, url):
+        delay, answer = answers[url]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            cancelled.append(url)
+            raise
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(speculation, "classify", classify)
+    return cancelled
+
+
+def _race(monkeypatch, deadline: float = 0.02) -> str:
+    monkeypatch.setattr(speculation, "SPECULATIVE_CLASSIFIER_DEADLINE_SECONDS", deadline)
+    return asyncio.run(speculation.race_classifiers([], ["coding", "creative"], _policy()))
+
+
+def test_race_endpoints_not_asked_when_primary_meets_deadline(monkeypatch):
+    asked = []
+    _classifiers(monkeypatch, {PRIMARY: (0.05, "creative"), RACE[0]: (0, "coding"), RACE[1]: (0, "coding")})
+    classify = speculation.classify
+
+    async def recording_classify(messages, classes, url):
+        asked.append(url)
+        return await classify(messages, classes, url)
+
+    monkeypatch.setattr(speculation, "classify", recording_classify)
+    assert _race(monkeypatch, deadline=0.5) == "creative"
+    assert asked == [PRIMARY]
+
+
+def test_race_answer_wins_when_primary_misses_deadline(monkeypatch):
+    cancelled = _classifiers(
+        monkeypatch, {PRIMARY: (0.5, "creative"), RACE[0]: (0, "coding"), RACE[1]: (0.5, "coding")}
+    )
+    assert _race(monkeypatch) == "coding"
+    assert sorted(cancelled) == sorted([PRIMARY, RACE[1]])
+
+
+def test_late_primary_beats_race_unknown(monkeypatch):
+    _classifiers(monkeypatch, {PRIMARY: (0.05, "creative"), RACE[0]: (0, "Unknown"), RACE[1]: (0.5, "coding")})
+    assert _race(monkeypatch) == "creative"
+
+
+def test_primary_unknown_is_authoritative(monkeypatch):
+    _classifiers(monkeypatch, {PRIMARY: (0.01, "Unknown"), RACE[0]: (0, "coding"), RACE[1]: (0, "coding")})
+    assert _race(monkeypatch) == "Unknown"
+
+
+def test_race_answer_used_when_primary_fails(monkeypatch):
+    _classifiers(
+        monkeypatch, {PRIMARY: (0.01, RuntimeError("down")), RACE[0]: (0, "Unknown"), RACE[1]: (0.03, "coding")}
+    )
+    assert _race(monkeypatch) == "coding"
+
+
+def test_race_unknown_only_after_every_race_answer(monkeypatch):
+    _classifiers(
+        monkeypatch,
+        {PRIMARY: (0, RuntimeError("down")), RACE[0]: (0, "Unknown"), RACE[1]: (0.01, RuntimeError("down too"))},
+    )
+    assert _race(monkeypatch) == "Unknown"
+
+
+def test_error_when_every_classifier_fails(monkeypatch):
+    _classifiers(
+        monkeypatch,
+        {PRIMARY: (0, RuntimeError("down")), RACE[0]: (0, RuntimeError("a")), RACE[1]: (0, RuntimeError("b"))},
+    )
+    with pytest.raises(RuntimeError):
+        _race(monkeypatch)
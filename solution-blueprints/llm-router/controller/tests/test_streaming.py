@@ -0,0 +1,56 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+import httpx
+from controllerApp import streaming
+
+EVENTS = [b'data: {"n": 1}\n\n', b'data: {"n": 2}\n\ndata: {"n": 3}\n\n', b"data: [DONE]\n\n"]
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.finished = []
+
+    def first_token(self, base_url, ttft):
+        pass
+
+    def finish(self, base_url, **kwargs):
+        self.finished.append(kwargs)
+
+
+def _relay_tokens(monkeypatch, events: list[bytes], read: int) -> int:
+    """Relay ``read`` chunks of an upstream stream, close it and return the tokens reported to the tracker."""
+    tracker = RecordingTracker()
+    monkeypatch.setattr(streaming, "get_load_tracker", lambda: tracker)
+
+    async def upstream():
+        for event in events:
+            yield event
+
+    async def scenario():
+        relay = streaming.UpstreamRelay(
+            httpx.Response(200, content=upstream()), AsyncExitStack(), "http://llm", time.monotonic()
+        )
+        chunks = relay.__aiter__()
+        for _ in range(read):
+            await anext(chunks)
+        if read == len(events):
+            await anext(chunks, None)
+        await chunks.aclose()
+        await relay.aclose()
+
+    asyncio.run(scenario())
+    return tracker.finished[0]["tokens"]
+
+
+def test_done_sentinel_is_not_counted_as_a_token(monkeypatch):
+    assert _relay_tokens(monkeypatch, EVENTS, read=len(EVENTS)) == 3
+
+
+def test_cancelled_stream_counts_only_relayed_events(monkeypatch):
+    assert _relay_tokens(monkeypatch, EVENTS, read=2) == 3
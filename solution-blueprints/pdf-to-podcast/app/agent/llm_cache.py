@@ -0,0 +1,127 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""Content-addressed on-disk cache for LLM responses."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import ujson as json
+from langchain_core.messages import AIMessage
+
+logger = logging.getLogger(__name__)
+
+
+class LlmResponseCache:
+    """Size-bounded LRU cache of LLM responses, one JSON file per request.
+
+    Entries are keyed by a hash of the model, the rendered messages and the output schema, so
+    rerunning a podcast on the same PDFs with the same parameters (e.g. with another voice mapping,
+    or after a TTS failure) reuses every LLM stage. Recency is the file modification time, which
+    a hit refreshes; the least recently used files are removed once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        """Create the cache directory and measure its current size.
+
+        Args:
+            root (Path): Cache directory.
+            max_bytes (int): Total size above which the least recently used entries are removed.
+        """
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self.root.glob("*.json"))
+
+    @staticmethod
+    def key(*, model: str, messages: list[dict[str, str]], schema: dict | None) -> str:
+        """Return the cache key of a request.
+
+        Args:
+            model (str): Model identifier.
+            messages (list[dict[str, str]]): Rendered messages.
+            schema (dict | None): Structured output schema, if any.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        payload = json.dumps({"model": model, "messages": messages, "schema": schema}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> AIMessage | dict[str, Any] | None:
+        """Return the cached response for a key, or None on a miss.
+
+        Args:
+            key (str): Cache key from key().
+
+        Returns:
+            AIMessage | dict[str, Any] | None: Cached message or structured output.
+        """
+        return await asyncio.to_thread(self._get, key)
+
+    async def put(self, key: str, response: AIMessage | dict[str, Any]) -> None:
+        """Store a response, evicting least recently used entries above the size limit.
+
+        Args:
+            key (str): Cache key from key().
+            response (AIMessage | dict[str, Any]): Message or structured output to store.
+        """
+        if isinstance(response, AIMessage):
+            entry = {"type": "message", "content": response.content}
+        else:
+            entry = {"type": "json", "value": response}
+        await asyncio.to_thread(self._put, key, json.dumps(entry).encode())
+
+    def _get(self, key: str) -> AIMessage | dict[str, Any] | None:
+        path = self.root / f"{key}.json"
+        try:
+            entry = json.loads(path.read_bytes())
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logger.warning("Ignoring unreadable LLM cache entry %s: %s", path.name, exc)
+            return None
+        if entry.get("type") == "message":
+            return AIMessage(content=entry["content"])
+        return entry.get("value")
+
+    def _put(self, key: str, data: bytes) -> None:
+        path = self.root / f"{key}.json"
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        with self._lock:
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp, path)  # atomic: readers never see a partial entry
+            self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in 80% of max_bytes (lock held)."""
+        entries = []
+        for path in self.root.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(size for _, size, _ in entries)
+        # Evicting below the limit amortizes the directory scan over many writes
+        target = self.max_bytes * 4 // 5
+        removed = 0
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= size
+            removed += 1
+        logger.info("LLM cache: evicted %d entries, %d bytes remain", removed, self._size)
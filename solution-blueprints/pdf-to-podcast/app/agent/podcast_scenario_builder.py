@@ -12,6 +12,7 @@ from typing import Any, Iterable, Literal, Sequence
 import jinja2
 import ujson as json
 from agent.chat_llm import ChatLLM
+from agent.llm_cache import LlmResponseCache
 from core.models import Conversation, PdfMetadata, PodcastOutline, ServiceType, TaskStatus
 from core.task_store import TaskStore
 from domain.prompt_tracker import PromptTracker
@@ -30,6 +31,8 @@ class PodcastScenarioBuilder:
         prompt_tracker: PromptTracker,
         prompt_templates: dict[str, str],
         task_store: TaskStore | None = None,
+        max_concurrency: int = 4,
+        response_cache: LlmResponseCache | None = None,
     ) -> None:
         """Initialize the podcast scenario builder.
 
@@ -38,6 +41,9 @@ class PodcastScenarioBuilder:
             prompt_tracker (PromptTracker): Tracker for prompt/response history.
             prompt_templates (dict[str, str]): Dictionary mapping template names to template strings.
             task_store (TaskStore | None): Optional task store for status updates. Defaults to None.
+            max_concurrency (int): Max LLM requests in flight at once. Defaults to 4.
+            response_cache (LlmResponseCache | None): Optional cache consulted before every LLM query.
+                Defaults to None.
 
         Returns:
             None
@@ -46,6 +52,8 @@ class PodcastScenarioBuilder:
         self.prompt_tracker = prompt_tracker
         self.templates = {name: jinja2.Template(tpl, autoescape=True) for name, tpl in prompt_templates.items()}
         self.task_store = task_store
+        self._llm_slots = asyncio.Semaphore(max_concurrency)
+        self.response_cache = response_cache
 
     async def _update_status(self, task_id: str, message: str, progress: float | None = None) -> None:
         """Update task status if task_store is available.
@@ -267,104 +275,14 @@ class PodcastScenarioBuilder:
             logger.error("Task %s: %s", task_id, error_msg, exc_info=True)
             raise RuntimeError(f"Task {task_id}: {error_msg}") from e
 
-        logger.info("Task %s: Generating segment content", task_id)
         total_segments = len(outline_model.segments)
+        logger.info("Task %s: Generating content and dialogue for %d segment(s)", task_id, total_segments)
         await self._update_status(task_id, f"Generating content for {total_segments} segment(s)", progress=0.25)
-        segments: dict[str, str] = {}
-        for idx, segment in enumerate(outline_model.segments):
-            try:
-                text_content: str | None = None
-                if segment.references:
-                    refs = []
-                    for ref in segment.references:
-                        pdf = next((pdf for pdf in request.pdf_metadata if pdf.filename == ref), None)
-                        if pdf:
-                            refs.append(pdf.markdown)
-                    if refs:
-                        text_content = "\n\n".join(refs)
-
-                angles = "\n".join([topic.title for topic in segment.topics])
-                segment_result = await self._generate_segment_content(
-                    segment_idx=idx,
-                    duration=segment.duration,
-                    topic=segment.section,
-                    angles=angles,
-                    template_with_refs="prompt_with_references",
-                    template_no_refs="no_references_prompt",
-                    text_content=text_content,
-                )
-
-                # Validate that segment was generated successfully
-                segment_key = f"segment_transcript_{idx}"
-                if segment_key not in segment_result or not segment_result[segment_key]:
-                    raise ValueError(f"Failed to generate content for segment {idx}: empty result")
-
-                segments.update(segment_result)
-                segment_progress = 0.25 + (idx + 1) / total_segments * 0.35
-                await self._update_status(
-                    task_id, f"Generated segment {idx + 1}/{total_segments}", progress=segment_progress
-                )
-                logger.info(
-                    "Task %s: Generated content for segment %d/%d", task_id, idx + 1, len(outline_model.segments)
-                )
-            except Exception as e:
-                error_msg = f"Failed to generate segment {idx} (section: {segment.section}): {str(e)}"
-                logger.error("Task %s: %s", task_id, error_msg, exc_info=True)
-                raise RuntimeError(error_msg) from e
-
-        if not segments:
-            raise RuntimeError(f"Task {task_id}: No segments were generated successfully")
-
-        logger.info("Task %s: Generated content for %d segment(s)", task_id, len(segments))
-
-        logger.info("Task %s: Converting segments to dialogue", task_id)
-        await self._update_status(task_id, f"Converting {total_segments} segment(s) to dialogue", progress=0.6)
-        segment_dialogues = []
-        for idx, segment in enumerate(outline_model.segments):
-            seg_text = segments.get(f"segment_transcript_{idx}")
-
-            if not seg_text:
-                error_msg = f"Segment {idx} (section: {segment.section}) has no transcript content"
-                logger.error("Task %s: %s", task_id, error_msg)
-                raise RuntimeError(f"Task {task_id}: {error_msg}")
-
-            try:
-                descriptions = self._format_topics(segment.topics)
-                dialogue = await self._convert_segment_to_dialogue(
-                    segment_idx=idx,
-                    segment_text=seg_text,
-                    template_name="transcript_to_dialogue_prompt",
-                    speaker_1_name=request.speaker_1_name,
-                    speaker_2_name=request.speaker_2_name,
-                    duration=segment.duration,
-                    descriptions=descriptions,
-                )
-
-                # Validate that dialogue was generated successfully
-                if not dialogue or not dialogue.strip():
-                    raise ValueError(f"Failed to convert segment {idx} to dialogue: empty result")
-
-                segment_dialogues.append({"section": segment.section, "dialogue": dialogue})
-                dialogue_progress = 0.6 + (len(segment_dialogues) / total_segments) * 0.2
-                await self._update_status(
-                    task_id,
-                    f"Converted {len(segment_dialogues)}/{total_segments} segment(s) to dialogue",
-                    progress=dialogue_progress,
-                )
-                logger.info(
-                    "Task %s: Converted segment %d/%d to dialogue",
-                    task_id,
-                    len(segment_dialogues),
-                    len(outline_model.segments),
-                )
-            except Exception as e:
-                error_msg = f"Failed to convert segment {idx} (section: {segment.section}) to dialogue: {str(e)}"
-                logger.error("Task %s: %s", task_id, error_msg, exc_info=True)
-                raise RuntimeError(f"Task {task_id}: {error_msg}") from e
-
-        if not segment_dialogues:
-            raise RuntimeError(f"Task {task_id}: No dialogues were generated successfully")
-
+        segment_dialogues = await self._generate_segment_dialogues(
+            segments=outline_model.segments,
+            request=request,
+            task_id=task_id,
+        )
         logger.info("Task %s: Converted %d segment(s) to dialogue", task_id, len(segment_dialogues))
 
         logger.info("Task %s: Combining dialogues", task_id)
@@ -410,6 +328,93 @@ class PodcastScenarioBuilder:
 
         return Conversation.model_validate(final_json)
 
+    async def _generate_segment_dialogues(
+        self, *, segments: Sequence[Any], request: Any, task_id: str
+    ) -> list[dict[str, str]]:
+        """Generate content and then dialogue for every segment, segments running concurrently.
+
+        Each segment's dialogue step depends only on its own content step, so the segments run as
+        independent chains; the LLM concurrency cap in _query_llm bounds how many calls are in flight.
+        The first failing step cancels the other chains and is raised with its segment attached.
+
+        Args:
+            segments (Sequence[Any]): PodcastSegment objects from the structured outline.
+            request (Any): Request object containing speaker names and PDF metadata.
+            task_id (str): Task identifier for logging and status updates.
+
+        Returns:
+            list[dict[str, str]]: "section" and "dialogue" of each segment, in outline order.
+        """
+        total = len(segments)
+        markdown_by_filename = {pdf.filename: pdf.markdown for pdf in request.pdf_metadata}
+        dialogues: list[dict[str, str] | None] = [None] * total
+        generated = 0
+        converted = 0
+
+        async def report() -> None:
+            progress = 0.25 + (generated + converted) / (2 * total) * 0.55
+            await self._update_status(
+                task_id,
+                f"Generated {generated}/{total} segment(s), converted {converted}/{total} to dialogue",
+                progress=progress,
+            )
+
+        async def run_segment(idx: int, segment: Any) -> None:
+            nonlocal generated, converted
+            try:
+                refs = [markdown_by_filename[ref] for ref in segment.references if ref in markdown_by_filename]
+                segment_result = await self._generate_segment_content(
+                    segment_idx=idx,
+                    duration=segment.duration,
+                    topic=segment.section,
+                    angles="\n".join([topic.title for topic in segment.topics]),
+                    template_with_refs="prompt_with_references",
+                    template_no_refs="no_references_prompt",
+                    text_content="\n\n".join(refs) if refs else None,
+                )
+                seg_text = segment_result.get(f"segment_transcript_{idx}")
+                if not seg_text:
+                    raise ValueError(f"Failed to generate content for segment {idx}: empty result")
+            except Exception as e:
+                error_msg = f"Failed to generate segment {idx} (section: {segment.section}): {str(e)}"
+                logger.error("Task %s: %s", task_id, error_msg, exc_info=True)
+                raise RuntimeError(f"Task {task_id}: {error_msg}") from e
+
+            generated += 1
+            logger.info("Task %s: Generated content for segment %d/%d", task_id, idx + 1, total)
+            await report()
+
+            try:
+                dialogue = await self._convert_segment_to_dialogue(
+                    segment_idx=idx,
+                    segment_text=seg_text,
+                    template_name="transcript_to_dialogue_prompt",
+                    speaker_1_name=request.speaker_1_name,
+                    speaker_2_name=request.speaker_2_name,
+                    duration=segment.duration,
+                    descriptions=self._format_topics(segment.topics),
+                )
+                if not dialogue or not dialogue.strip():
+                    raise ValueError(f"Failed to convert segment {idx} to dialogue: empty result")
+            except Exception as e:
+                error_msg = f"Failed to convert segment {idx} (section: {segment.section}) to dialogue: {str(e)}"
+                logger.error("Task %s: %s", task_id, error_msg, exc_info=True)
+                raise RuntimeError(f"Task {task_id}: {error_msg}") from e
+
+            dialogues[idx] = {"section": segment.section, "dialogue": dialogue}
+            converted += 1
+            logger.info("Task %s: Converted segment %d/%d to dialogue", task_id, idx + 1, total)
+            await report()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for idx, segment in enumerate(segments):
+                    group.create_task(run_segment(idx, segment))
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0]
+
+        return [entry for entry in dialogues if entry is not None]
+
     def _render_template(self, template_name: str, **kwargs: Any) -> str:
         """Render a Jinja2 template with provided keyword arguments.
 
@@ -738,6 +743,14 @@ class PodcastScenarioBuilder:
         Raises:
             Exception: If query fails after retries
         """
+        cache_key = None
+        if self.response_cache:
+            cache_key = self.response_cache.key(model=self.llm.model, messages=messages, schema=json_schema)
+            cached = await self.response_cache.get(cache_key)
+            if cached:
+                logger.info("LLM query '%s' answered from cache", query_name)
+                return cached
+
         try:
             llm = self.llm
 
@@ -745,12 +758,18 @@ class PodcastScenarioBuilder:
                 llm = llm.with_structured_output(json_schema)
 
             llm = llm.with_retry(stop_after_attempt=retries, wait_exponential_jitter=True)
-            return await llm.ainvoke(messages)
+            async with self._llm_slots:
+                response = await llm.ainvoke(messages)
 
         except Exception as exc:
             logger.error("Async LLM query '%s' failed: %s", query_name, exc)
             raise Exception(f"Async LLM query '{query_name}' failed after {retries} attempts") from exc
 
+        # Empty results are rejected by the callers; caching them would make every rerun fail too
+        if cache_key and (response.content if isinstance(response, AIMessage) else response):
+            await self.response_cache.put(cache_key, response)  # type: ignore[union-attr]
+        return response
+
     @staticmethod
     def _unescape_unicode_string(s: str) -> str:
         """Unescape Unicode escape sequences in a string.
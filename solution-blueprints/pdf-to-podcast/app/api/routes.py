@@ -4,13 +4,13 @@
 
 """API routes for the app service."""
 
-import json
+from pathlib import Path
 from typing import Annotated
 
 from bootstrap import broadcaster, podcast_service
 from core.models import GeneratePodcastRequest, StatusResponse
 from fastapi import APIRouter, BackgroundTasks, Depends, File, Query, UploadFile, WebSocket
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 
 router = APIRouter(prefix="/podcasts", tags=["podcasts"])
 
@@ -57,7 +57,7 @@ async def get_status(task_id: str) -> StatusResponse:
 
 
 @router.get("/{task_id}/audio")
-async def get_audio(task_id: str, user_id: Annotated[str, Query(...)]) -> StreamingResponse:
+async def get_audio(task_id: str, user_id: Annotated[str, Query(...)]) -> FileResponse:
     """Download generated audio.
 
     Args:
@@ -65,14 +65,34 @@ async def get_audio(task_id: str, user_id: Annotated[str, Query(...)]) -> Stream
         user_id (str): User identifier for lookup.
 
     Returns:
-        StreamingResponse: MP3 stream.
+        FileResponse: MP3 file, streamed from disk.
     """
     audio = await podcast_service.get_audio(task_id=task_id, user_id=user_id)
-    return StreamingResponse(iter([audio]), media_type="audio/mpeg")
+    return FileResponse(audio, media_type="audio/mpeg")
+
+
+@router.get("/{task_id}/audio/stream", response_model=None)
+async def stream_audio(task_id: str, user_id: Annotated[str, Query(...)]) -> StreamingResponse | FileResponse:
+    """Play audio while the podcast is being synthesized.
+
+    While TTS runs, the lines synthesized so far are sent at once and the response stays open
+    until the rest is produced. Finished audio is served from disk with range request support.
+
+    Args:
+        task_id (str): Task identifier.
+        user_id (str): User identifier for lookup.
+
+    Returns:
+        StreamingResponse | FileResponse: Chunked MP3 stream, or the finished MP3 file.
+    """
+    audio = podcast_service.stream_audio(task_id=task_id, user_id=user_id)
+    if isinstance(audio, Path):
+        return FileResponse(audio, media_type="audio/mpeg")
+    return StreamingResponse(audio, media_type="audio/mpeg", headers={"Cache-Control": "no-store"})
 
 
 @router.get("/{task_id}/transcript")
-async def get_transcript(task_id: str, user_id: Annotated[str, Query(...)]) -> JSONResponse:
+async def get_transcript(task_id: str, user_id: Annotated[str, Query(...)]) -> FileResponse:
     """Get transcript with generation steps.
 
     Args:
@@ -80,10 +100,10 @@ async def get_transcript(task_id: str, user_id: Annotated[str, Query(...)]) -> J
         user_id (str): User identifier for lookup.
 
     Returns:
-        JSONResponse: Transcript JSON with steps.
+        FileResponse: Transcript JSON with steps, streamed from disk.
     """
     transcript = await podcast_service.get_transcript(task_id=task_id, user_id=user_id)
-    return JSONResponse(json.loads(transcript.decode()))
+    return FileResponse(transcript, media_type="application/json")
 
 
 @router.get("/{task_id}/tokens")
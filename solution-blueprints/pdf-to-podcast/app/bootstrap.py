@@ -11,10 +11,11 @@ from domain.scenario_runner import ScenarioRunner
 from domain.tts_runner import TtsRunner
 from infrastructure.pdf_converter import PdfConverter
 from infrastructure.storage import LocalStorage
+from settings import settings
 
 storage = LocalStorage()
 broadcaster = StatusBroadcaster()
-task_store = TaskStore(broadcaster)
+task_store = TaskStore(broadcaster, ttl=settings.task_ttl, max_records=settings.task_max_records)
 pdf_converter = PdfConverter(task_store, storage)
 scenario_runner = ScenarioRunner(task_store, storage)
 tts_runner = TtsRunner(task_store)
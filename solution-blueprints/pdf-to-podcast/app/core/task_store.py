@@ -2,13 +2,20 @@
 #
 # SPDX-License-Identifier: MIT
 
-"""In-memory task tracking with optional WebSocket notifications."""
+"""In-memory task tracking with optional WebSocket notifications.
+
+Only status is kept in memory; audio and transcripts live on disk and records hold their
+paths. Finished records are evicted once idle for longer than the TTL, and the oldest
+finished ones when there are more than ``max_records``; running tasks are never evicted.
+"""
 
 
 import asyncio
 import logging
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from pathlib import Path
 
 from core.models import ServiceType, StatusSnapshot, TaskStatus
 from core.status_broadcaster import StatusBroadcaster
@@ -22,11 +29,12 @@ class TaskRecord:
 
     task_id: str
     created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     services: dict[ServiceType, StatusSnapshot] = field(
         default_factory=lambda: {service: StatusSnapshot() for service in ServiceType}
     )
-    audio: bytes | None = None
-    transcript: bytes | None = None
+    audio_path: Path | None = None
+    transcript_path: Path | None = None
     final_status: TaskStatus = TaskStatus.PENDING
     message: str = "Task created"
 
@@ -34,10 +42,21 @@ class TaskRecord:
 class TaskStore:
     """Thread-safe task store with async notification hooks."""
 
-    def __init__(self, broadcaster: StatusBroadcaster | None = None) -> None:
-        self._records: dict[str, TaskRecord] = {}
+    def __init__(
+        self, broadcaster: StatusBroadcaster | None = None, ttl: float = 3600.0, max_records: int = 1000
+    ) -> None:
+        """Create task store.
+
+        Args:
+            broadcaster (StatusBroadcaster | None): Optional WebSocket broadcaster.
+            ttl (float): Seconds a finished record is kept after its last update.
+            max_records (int): Finished records beyond this count are evicted, oldest first.
+        """
+        self._records: OrderedDict[str, TaskRecord] = OrderedDict()  # least recently updated first
         self._lock = asyncio.Lock()
         self._broadcaster = broadcaster
+        self._ttl = ttl
+        self._max_records = max_records
 
     @property
     def records(self) -> dict[str, TaskRecord]:
@@ -50,7 +69,9 @@ class TaskStore:
             task_id (str): Unique task identifier.
         """
         async with self._lock:
+            self._evict()
             self._records[task_id] = TaskRecord(task_id=task_id)
+            self._records.move_to_end(task_id)
         await self._notify(task_id, None)
 
     async def update_status(
@@ -71,60 +92,60 @@ class TaskStore:
             progress (float | None): Optional progress [0..1].
         """
         async with self._lock:
-            record = self._require(task_id)
+            record = self._touch(task_id)
             record.services[service] = StatusSnapshot(status=status, message=message, progress=progress)
             record.final_status = self._aggregate_status(record)
             record.message = message or record.message
 
         await self._notify(task_id, service)
 
-    async def set_audio(self, task_id: str, audio: bytes) -> None:
-        """Store synthesized audio.
+    async def set_audio(self, task_id: str, audio_path: Path) -> None:
+        """Record where synthesized audio is stored.
 
         Args:
             task_id (str): Task identifier.
-            audio (bytes): Audio payload.
+            audio_path (Path): Audio file.
         """
         async with self._lock:
-            record = self._require(task_id)
-            record.audio = audio
+            record = self._touch(task_id)
+            record.audio_path = audio_path
 
-    async def set_transcript(self, task_id: str, transcript: bytes) -> None:
-        """Store transcript data.
+    async def set_transcript(self, task_id: str, transcript_path: Path) -> None:
+        """Record where transcript data is stored.
 
         Args:
             task_id (str): Task identifier.
-            transcript (bytes): Serialized transcript JSON.
+            transcript_path (Path): Transcript JSON file.
         """
         async with self._lock:
-            record = self._require(task_id)
-            record.transcript = transcript
+            record = self._touch(task_id)
+            record.transcript_path = transcript_path
 
-    async def get_audio(self, task_id: str) -> bytes | None:
-        """Return stored audio bytes if available.
+    async def get_audio(self, task_id: str) -> Path | None:
+        """Return the stored audio file if available.
 
         Args:
             task_id (str): Task identifier.
 
         Returns:
-            bytes | None: Audio payload or None if missing.
+            Path | None: Audio file or None if missing.
         """
         async with self._lock:
             record = self._records.get(task_id)
-            return record.audio if record else None
+            return record.audio_path if record else None
 
-    async def get_transcript(self, task_id: str) -> bytes | None:
-        """Return stored transcript bytes if available.
+    async def get_transcript(self, task_id: str) -> Path | None:
+        """Return the stored transcript file if available.
 
         Args:
             task_id (str): Task identifier.
 
         Returns:
-            bytes | None: Transcript payload or None if missing.
+            Path | None: Transcript JSON file or None if missing.
         """
         async with self._lock:
             record = self._records.get(task_id)
-            return record.transcript if record else None
+            return record.transcript_path if record else None
 
     async def get_status(self, task_id: str) -> dict:
         """Return aggregated status for all services.
@@ -149,6 +170,37 @@ class TaskStore:
             raise KeyError(f"Task {task_id} not found")
         return self._records[task_id]
 
+    def _touch(self, task_id: str) -> TaskRecord:
+        record = self._require(task_id)
+        record.updated_at = time.time()
+        self._records.move_to_end(task_id)
+        return record
+
+    def _evict(self) -> None:
+        """Drop idle finished records, then the oldest finished ones above max_records (lock held).
+
+        Running tasks are never evicted: their pipeline still updates them, however long a stage takes.
+        """
+        expired_before = time.time() - self._ttl
+        expired = []
+        for task_id, record in self._records.items():
+            if record.updated_at >= expired_before:
+                break  # records are in update order, so the rest are newer
+            if self._is_finished(record):
+                expired.append(task_id)
+        for task_id in expired:
+            del self._records[task_id]
+            logger.info("Evicted task %s after %.0f s without updates", task_id, self._ttl)
+
+        excess = len(self._records) - self._max_records + 1
+        if excess <= 0:
+            return
+        finished = [task_id for task_id, record in self._records.items() if self._is_finished(record)][:excess]
+        for task_id in finished:
+            del self._records[task_id]
+        if finished:
+            logger.info("Evicted %d finished task(s) above the %d record limit", len(finished), self._max_records)
+
     async def _notify(self, task_id: str, service: ServiceType | None) -> None:
         """Notify broadcaster about status change.
 
@@ -171,6 +223,10 @@ class TaskStore:
         except Exception as exc:
             logger.error("Failed to notify status for task %s: %s", task_id, exc, exc_info=True)
 
+    @staticmethod
+    def _is_finished(record: TaskRecord) -> bool:
+        return record.final_status in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+
     @staticmethod
     def _aggregate_status(record: TaskRecord) -> TaskStatus:
         statuses = {snap.status for snap in record.services.values() if snap.status is not None}
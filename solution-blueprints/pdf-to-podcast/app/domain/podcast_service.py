@@ -7,7 +7,8 @@
 import json
 import logging
 import uuid
-from typing import Sequence
+from pathlib import Path
+from typing import AsyncIterator, Sequence
 
 from core.models import Conversation, ConversionStatus, DialogueEntry, GeneratePodcastRequest, ServiceType, TaskStatus
 from core.task_store import TaskStore
@@ -159,19 +160,25 @@ class PodcastService:
 
             else:
                 logger.info("Task %s: Starting TTS synthesis phase", task_id)
-                audio = await self._tts_runner.synthesize(
+                # Written to disk line by line, so stream_audio can serve it while synthesis runs
+                audio_path = await self._tts_runner.synthesize(
                     task_id=task_id,
                     conversation=conversation_for_tts,
                     voice_mapping=voice_mapping,
+                    audio_path=self._storage.file_path(
+                        user_id=request.user_id, task_id=task_id, filename=f"{task_id}.mp3"
+                    ),
                 )
-                self._storage.store_audio(
+                self._storage.store_metadata(
                     user_id=request.user_id,
                     task_id=task_id,
-                    audio_content=audio,
                     filename=f"{task_id}.mp3",
+                    content_type="audio/mpeg",
                     metadata=request.model_dump(),
                 )
-                logger.info("Task %s: TTS synthesis completed, audio size: %d bytes", task_id, len(audio))
+                logger.info(
+                    "Task %s: TTS synthesis completed, audio size: %d bytes", task_id, audio_path.stat().st_size
+                )
                 # Mark all services as completed
                 completed_message = f"Podcast generation completed. Full podcast tokens: {full_token_count}"
                 await self._task_store.update_status(task_id, ServiceType.TTS, TaskStatus.COMPLETED, completed_message)
@@ -259,45 +266,64 @@ class PodcastService:
         except KeyError:
             raise HTTPException(status_code=404, detail="Task not found")
 
-    async def get_audio(self, *, task_id: str, user_id: str) -> bytes:
-        """Fetch generated audio or raise 404.
+    async def get_audio(self, *, task_id: str, user_id: str) -> Path:
+        """Locate generated audio or raise 404.
 
         Args:
             task_id (str): Task identifier.
             user_id (str): User identifier.
 
         Returns:
-            bytes: Audio payload.
+            Path: Audio file.
         """
         audio = await self._task_store.get_audio(task_id)
-        if audio:
+        if audio and audio.exists():
             return audio
-        file_audio = self._storage.get_file(user_id=user_id, task_id=task_id, filename=f"{task_id}.mp3")
-        if file_audio:
+        # Records are evicted from the task store; the file outlives them
+        file_audio = self._storage.file_path(user_id=user_id, task_id=task_id, filename=f"{task_id}.mp3")
+        if file_audio.exists():
             return file_audio
         raise HTTPException(status_code=404, detail="Audio not found")
 
-    async def get_transcript(self, *, task_id: str, user_id: str) -> bytes:
-        """Fetch transcript data or raise 404.
+    def stream_audio(self, *, task_id: str, user_id: str) -> AsyncIterator[bytes] | Path:
+        """Return the audio of a task, following it while TTS is still running.
+
+        Args:
+            task_id (str): Task identifier.
+            user_id (str): User identifier.
+
+        Returns:
+            AsyncIterator[bytes] | Path: Chunks synthesized so far and then as they are produced while the
+            task is synthesizing, otherwise the path of the finished audio file.
+        """
+        audio_path = self._storage.file_path(user_id=user_id, task_id=task_id, filename=f"{task_id}.mp3")
+        stream = self._tts_runner.live_audio(task_id)
+        if stream and stream.final_path == audio_path:
+            # Opened here, not when the response starts, so the file cannot be renamed in between
+            return stream.follow(stream.open())
+        if audio_path.exists():
+            return audio_path
+        raise HTTPException(status_code=404, detail="Audio not found")
+
+    async def get_transcript(self, *, task_id: str, user_id: str) -> Path:
+        """Locate transcript data or raise 404.
 
         Args:
             task_id (str): Task identifier.
             user_id (str): User identifier.
 
         Returns:
-            bytes: Transcript JSON payload.
+            Path: Transcript JSON file.
         """
         transcript = await self._task_store.get_transcript(task_id)
 
-        if transcript:
+        if transcript and transcript.exists():
             return transcript
 
-        # Try to get from storage as fallback
-        transcript_file = self._storage.get_file(
-            user_id=user_id, task_id=task_id, filename=f"{task_id}_prompt_tracker.json"
-        )
-
-        if transcript_file:
-            return transcript_file
+        # Try storage as fallback: the stored transcript, or the prompt tracker steps alone
+        for filename in (f"{task_id}_transcript.json", f"{task_id}_prompt_tracker.json"):
+            transcript_file = self._storage.file_path(user_id=user_id, task_id=task_id, filename=filename)
+            if transcript_file.exists():
+                return transcript_file
 
         raise HTTPException(status_code=404, detail="Transcript not found")
@@ -9,6 +9,7 @@ import json
 import logging
 from typing import Sequence
 
+from agent.llm_cache import LlmResponseCache
 from agent.podcast_scenario_builder import PodcastScenarioBuilder
 from agent.prompts import MONOLOGUE_PROMPTS, PODCAST_PROMPTS
 from agent.utils import init_llm
@@ -34,6 +35,11 @@ class ScenarioRunner:
         """
         self._task_store = task_store
         self._storage = storage
+        self._response_cache = (
+            LlmResponseCache(storage.root / ".llm_cache", settings.llm_cache_max_mb * 1024 * 1024)
+            if settings.llm_cache_enabled
+            else None
+        )
 
     async def run(
         self,
@@ -81,6 +87,8 @@ class ScenarioRunner:
             prompt_tracker=prompt_tracker,
             prompt_templates=prompt_templates,
             task_store=self._task_store,
+            max_concurrency=settings.llm_concurrent_limit,
+            response_cache=self._response_cache,
         )
 
         request = _ScenarioRequest(
@@ -121,7 +129,15 @@ class ScenarioRunner:
 
         # Save transcript with steps
         transcript_json = json.dumps(transcript_data, indent=2)
-        await self._task_store.set_transcript(task_id, transcript_json.encode())
+        transcript_path = self._storage.store_file(
+            user_id=user_id,
+            task_id=task_id,
+            content=transcript_json.encode(),
+            filename=f"{task_id}_transcript.json",
+            content_type="application/json",
+            metadata={"type": "transcript"},
+        )
+        await self._task_store.set_transcript(task_id, transcript_path)
         return conversation
 
 
@@ -8,10 +8,11 @@
 import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
-from typing import Iterable
+from pathlib import Path
 
 from core.models import Conversation, DialogueEntry, ServiceType, TaskStatus
 from core.task_store import TaskStore
+from infrastructure.audio_stream import AudioStream
 from openai import OpenAI
 from settings import settings
 
@@ -30,65 +31,122 @@ class TtsRunner:
         self._task_store = task_store
         self._executor = ThreadPoolExecutor(max_workers=settings.tts_concurrent_limit)
         self._client = OpenAI(api_key=settings.tts_api_key, base_url=settings.tts_base_url, timeout=120.0)
+        self._streams: dict[str, AudioStream] = {}
 
-    async def synthesize(self, *, task_id: str, conversation: Conversation, voice_mapping: dict[str, str]) -> bytes:
-        """Convert conversation dialogue to audio bytes.
+    def live_audio(self, task_id: str) -> AudioStream | None:
+        """Return the audio stream of a task whose synthesis is still running.
+
+        Args:
+            task_id (str): Task identifier.
+
+        Returns:
+            AudioStream | None: Growing audio file, or None if the task is not synthesizing.
+        """
+        return self._streams.get(task_id)
+
+    async def synthesize(
+        self,
+        *,
+        task_id: str,
+        conversation: Conversation,
+        voice_mapping: dict[str, str],
+        audio_path: Path,
+    ) -> Path:
+        """Convert conversation dialogue to an audio file.
+
+        Audio is appended to the file in dialogue order as lines complete, and can be followed
+        through live_audio() while synthesis runs; only lines that finished ahead of an earlier
+        one are held in memory.
 
         Args:
             task_id (str): Task identifier.
             conversation (Conversation): Conversation to synthesize.
             voice_mapping (dict[str, str]): Mapping of speakers to voice ids.
+            audio_path (Path): Where the finished audio is stored.
 
         Returns:
-            bytes: Audio payload in configured format.
+            Path: Audio file in configured format.
         """
-        logger.info("Task %s: Starting TTS synthesis for %d dialogue entries", task_id, len(conversation.dialogue))
+        dialogue = conversation.dialogue
+        total = len(dialogue)
+        logger.info("Task %s: Starting TTS synthesis for %d dialogue entries", task_id, total)
         await self._task_store.update_status(task_id, ServiceType.TTS, TaskStatus.PROCESSING, "Starting TTS")
         mapping = self._resolve_mapping(voice_mapping)
-        batches = self._chunk(conversation.dialogue, settings.tts_concurrent_limit)
-        logger.info("Task %s: Split into %d batch(es) for TTS processing", task_id, len(batches))
 
-        audio_bytes = b""
-        total_batches = len(batches)
-        for idx, batch in enumerate(batches, start=1):
+        # Sliding window: a new line is submitted as soon as any in-flight line finishes, so
+        # tts_concurrent_limit requests stay busy instead of waiting on the slowest line of a batch.
+        window = asyncio.Semaphore(settings.tts_concurrent_limit)
+        pending: dict[int, bytes] = {}  # finished lines not yet written
+        done = 0
+        flushed = 0
+        flush_lock = asyncio.Lock()
+        stream = AudioStream(audio_path)
+
+        async def flush() -> None:
+            # Lines finish out of order; append the contiguous prefix that is ready.
+            nonlocal flushed
+            async with flush_lock:
+                while flushed in pending:
+                    await stream.append(pending.pop(flushed))
+                    flushed += 1
+
+        async def synthesize_line(index: int, line: DialogueEntry) -> None:
+            nonlocal done
+            async with window:
+                pending[index] = await self._process_line(line, mapping)
+            await flush()
+            done += 1
             await self._task_store.update_status(
                 task_id,
                 ServiceType.TTS,
                 TaskStatus.PROCESSING,
-                f"Processing batch {idx} of {total_batches}",
-                progress=idx / total_batches,
+                f"Synthesized line {done} of {total}",
+                progress=done / total,
             )
-            batch_audio = await self._process_batch(batch, mapping)
-            audio_bytes += batch_audio
 
+        self._streams[task_id] = stream
+        completed = False
+        try:
+            async with asyncio.TaskGroup() as group:
+                for index, line in enumerate(dialogue):
+                    group.create_task(synthesize_line(index, line))
+            completed = True
+        except ExceptionGroup as errors:
+            # The first failure cancels the lines still in flight; surface it as the task error.
+            raise errors.exceptions[0]
+        finally:
+            try:
+                await (stream.complete() if completed else stream.abort())
+            finally:
+                # Only after complete() renamed the file, so a listener finds either this
+                # stream or the final file.
+                self._streams.pop(task_id, None)
+
+        logger.info("Task %s: Synthesized %d line(s), %d bytes", task_id, total, stream.size)
         await self._task_store.update_status(
             task_id, ServiceType.TTS, TaskStatus.COMPLETED, "TTS completed", progress=1.0
         )
-        await self._task_store.set_audio(task_id, audio_bytes)
-        return audio_bytes
+        await self._task_store.set_audio(task_id, audio_path)
+        return audio_path
 
     def _resolve_mapping(self, requested: dict[str, str]) -> dict[str, str]:
         if requested:
             return requested
         return settings.default_voice_mapping
 
-    async def _process_batch(self, batch: Iterable[DialogueEntry], mapping: dict[str, str]) -> bytes:
-        """Process one batch of dialogue lines concurrently.
+    async def _process_line(self, line: DialogueEntry, mapping: dict[str, str]) -> bytes:
+        """Synthesize one dialogue line on the executor.
 
         Args:
-            batch (Iterable[DialogueEntry]): Dialogue lines.
+            line (DialogueEntry): Dialogue line.
             mapping (dict[str, str]): Speaker to voice mapping.
 
         Returns:
-            bytes: Concatenated audio for the batch.
+            bytes: Audio for the line.
         """
+        voice = line.voice_id or mapping.get(line.speaker, settings.tts_voice_1_default)
         loop = asyncio.get_running_loop()
-        futures = []
-        for line in batch:
-            voice = line.voice_id or mapping.get(line.speaker, settings.tts_voice_1_default)
-            futures.append(loop.run_in_executor(self._executor, self._synthesize_text, line.text, voice))
-        results = await asyncio.gather(*futures)
-        return b"".join(results)
+        return await loop.run_in_executor(self._executor, self._synthesize_text, line.text, voice)
 
     def _synthesize_text(self, text: str, voice: str) -> bytes:
         try:
@@ -103,7 +161,3 @@ class TtsRunner:
         except Exception as exc:
             logger.error("TTS synthesis error: %s", exc)
             raise
-
-    @staticmethod
-    def _chunk(items: list[DialogueEntry], size: int) -> list[list[DialogueEntry]]:
-        return [items[i : i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,99 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+"""Audio file that grows while TTS runs and can be followed by listeners."""
+
+import asyncio
+import os
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO
+
+CHUNK_SIZE = 64 * 1024
+
+
+class AudioStream:
+    """Append-only audio file written line by line during synthesis.
+
+    Audio is written to ``<path>.part`` and renamed to ``path`` once complete, so a finished
+    file is never confused with a partial one. Listeners read everything written so far and
+    then wait for more until the stream completes or is aborted.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Create the partial file.
+
+        Args:
+            path (Path): Final location of the audio file.
+        """
+        self.final_path = path
+        self.path = path.with_name(path.name + ".part")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.size = 0
+        self.done = False
+        self._file = self.path.open("wb")
+        self._changed = asyncio.Condition()
+
+    async def append(self, data: bytes) -> None:
+        """Append audio and wake up listeners.
+
+        Args:
+            data (bytes): Audio for the next dialogue line(s).
+        """
+        await asyncio.to_thread(self._write, data)
+        await self._publish(size=self.size + len(data))
+
+    async def complete(self) -> None:
+        """Close the file and move it to its final location."""
+        try:
+            await asyncio.to_thread(self._file.close)
+            os.replace(self.path, self.final_path)
+            self.path = self.final_path
+        finally:
+            await self._publish(done=True)
+
+    async def abort(self) -> None:
+        """Close and remove the partial file; listeners get what was written so far."""
+        try:
+            await asyncio.to_thread(self._file.close)
+            self.path.unlink(missing_ok=True)
+        finally:
+            await self._publish(done=True)
+
+    def open(self) -> BinaryIO:
+        """Open the file for a new listener (before the returned handle is followed)."""
+        return self.path.open("rb")
+
+    async def follow(self, handle: BinaryIO) -> AsyncIterator[bytes]:
+        """Yield the audio from the start, waiting for appends until the stream is done.
+
+        Args:
+            handle (BinaryIO): Handle returned by open(); closed when the iteration ends.
+        """
+        sent = 0
+        try:
+            while True:
+                if sent < self.size:
+                    data = await asyncio.to_thread(handle.read, min(CHUNK_SIZE, self.size - sent))
+                    if not data:
+                        return
+                    sent += len(data)
+                    yield data
+                    continue
+                if self.done:
+                    return
+                async with self._changed:
+                    await self._changed.wait_for(lambda: self.size > sent or self.done)
+        finally:
+            handle.close()
+
+    def _write(self, data: bytes) -> None:
+        self._file.write(data)
+        self._file.flush()
+
+    async def _publish(self, *, size: int | None = None, done: bool = False) -> None:
+        async with self._changed:
+            if size is not None:
+                self.size = size
+            self.done = self.done or done
+            self._changed.notify_all()
@@ -49,11 +49,46 @@ class LocalStorage:
 
         target = job_dir / filename
         target.write_bytes(content)
+        self._write_metadata(target, content_type, metadata)
+        return target
+
+    def file_path(self, *, user_id: str, task_id: str, filename: str) -> Path:
+        """Return where a task file is (or will be) stored, for writers that stream to disk.
+
+        Args:
+            user_id (str): User identifier.
+            task_id (str): Task identifier.
+            filename (str): Name of the file.
+
+        Returns:
+            Path: Absolute path of the file.
+        """
+        return self._task_dir(user_id, task_id) / filename
+
+    def store_metadata(
+        self, *, user_id: str, task_id: str, filename: str, content_type: str, metadata: dict | None = None
+    ) -> Path:
+        """Write the metadata sidecar for a file that was written in place (see file_path).
 
+        Args:
+            user_id (str): User identifier.
+            task_id (str): Task identifier.
+            filename (str): Name of the stored file.
+            content_type (str): MIME type for reference.
+            metadata (dict | None): Optional metadata to persist alongside.
+
+        Returns:
+            Path: Absolute path to the described file.
+        """
+        target = self.file_path(user_id=user_id, task_id=task_id, filename=filename)
+        self._write_metadata(target, content_type, metadata)
+        return target
+
+    @staticmethod
+    def _write_metadata(target: Path, content_type: str, metadata: dict | None) -> None:
         meta_path = target.with_suffix(target.suffix + ".meta.json")
         meta_payload = {"content_type": content_type, "metadata": metadata or {}}
         meta_path.write_text(json.dumps(meta_payload))
-        return target
 
     def store_audio(self, *, user_id: str, task_id: str, audio_content: bytes, filename: str, metadata: dict) -> Path:
         """Store audio with metadata.
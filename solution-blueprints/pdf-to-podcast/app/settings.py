@@ -19,10 +19,15 @@ class Settings(BaseSettings):
     pwd: ClassVar = Path(__file__).parent
 
     storage_path: Path = Field(default=Path("/tmp/storage"), description="Local path for storing files and audio")
+    task_ttl: int = Field(default=3600, description="Seconds a finished task's status is kept after its last update")
+    task_max_records: int = Field(default=1000, description="Max finished tasks whose status is kept in memory")
     model_api_timeout: int = Field(default=600, description="Timeout in seconds for PDF conversion requests")
     api_key: str = Field(default="test_key", description="API key for LLM")
     llm_url: str = Field(description="Base URL for LLM service (OpenAI-compatible API)")
     llm_model: str = Field(default="", description="Optional explicit LLM model identifier")
+    llm_cache_enabled: bool = Field(default=True, description="Reuse LLM responses for identical requests")
+    llm_cache_max_mb: int = Field(default=512, description="Max size of the on-disk LLM response cache in MB")
+    llm_concurrent_limit: int = Field(default=4, description="Max LLM requests in flight per scenario build")
 
     tts_api_key: str = Field(default="", description="API key for TTS service")
     tts_base_url: str = Field(description="Base URL for TTS service (OpenAI-compatible API)")
@@ -31,7 +36,7 @@ class Settings(BaseSettings):
 
     tts_model: str = Field(default="Qwen/Qwen3-TTS-12Hz-1.7B-CustomVoice", description="TTS model identifier")
     tts_audio_format: str = Field(default="mp3", description="Output audio format (mp3, opus, aac, flac, wav)")
-    tts_concurrent_limit: int = Field(default=1, description="Max concurrent TTS batch size")
+    tts_concurrent_limit: int = Field(default=1, description="Max TTS requests in flight at once")
     tts_voice_1_default: str = Field(default="Ryan", description="Default voice for speaker-1")
     tts_voice_2_default: str = Field(default="Aiden", description="Default voice for speaker-2")
     tts_speed: float = Field(default=1.0, description="TTS speech speed (0.25-4.0)")
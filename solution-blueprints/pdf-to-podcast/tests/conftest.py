@@ -0,0 +1,9 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import sys
+from pathlib import Path
+
+# The application runs from app/ (see docker/application.Dockerfile), so its modules import as top-level packages.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "app"))
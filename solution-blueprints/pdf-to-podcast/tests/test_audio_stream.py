@@ -0,0 +1,53 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from infrastructure.audio_stream import AudioStream
+
+
+async def _collect(stream: AudioStream) -> bytes:
+    return b"".join([chunk async for chunk in stream.follow(stream.open())])
+
+
+def test_listener_follows_appends_until_complete(tmp_path):
+    async def scenario():
+        stream = AudioStream(tmp_path / "podcast.mp3")
+        await stream.append(b"intro-")
+        listener = asyncio.create_task(_collect(stream))
+        await asyncio.sleep(0.01)
+        assert not listener.done()  # waiting for more audio
+        await stream.append(b"line-1-")
+        await stream.append(b"line-2")
+        await stream.complete()
+        return await asyncio.wait_for(listener, timeout=5), stream
+
+    audio, stream = asyncio.run(scenario())
+    assert audio == b"intro-line-1-line-2"
+    assert stream.path == tmp_path / "podcast.mp3"
+    assert (tmp_path / "podcast.mp3").read_bytes() == audio
+    assert not (tmp_path / "podcast.mp3.part").exists()
+
+
+def test_listener_after_completion_reads_final_file(tmp_path):
+    async def scenario():
+        stream = AudioStream(tmp_path / "podcast.mp3")
+        await stream.append(b"all the audio")
+        await stream.complete()
+        return await _collect(stream)
+
+    assert asyncio.run(scenario()) == b"all the audio"
+
+
+def test_abort_ends_listeners_and_removes_partial_file(tmp_path):
+    async def scenario():
+        stream = AudioStream(tmp_path / "podcast.mp3")
+        await stream.append(b"partial")
+        listeners = [asyncio.create_task(_collect(stream)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        await stream.abort()
+        return await asyncio.wait_for(asyncio.gather(*listeners), timeout=5)
+
+    assert asyncio.run(scenario()) == [b"partial", b"partial"]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,70 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import os
+
+from agent.llm_cache import LlmResponseCache
+from langchain_core.messages import AIMessage
+
+MESSAGES = [{"role": "user", "content": "Summarize the paper"}]
+
+
+def _key(model: str = "model", messages=MESSAGES, schema=None) -> str:
+    return LlmResponseCache.key(model=model, messages=messages, schema=schema)
+
+
+def test_key_depends_on_model_messages_and_schema():
+    assert _key() == _key(messages=[dict(m) for m in MESSAGES])
+    assert _key() != _key(model="other")
+    assert _key() != _key(messages=[{"role": "user", "content": "Summarize the book"}])
+    assert _key() != _key(schema={"type": "object"})
+
+
+def test_round_trips_messages_and_structured_output(tmp_path):
+    async def scenario():
+        cache = LlmResponseCache(tmp_path, max_bytes=1 << 20)
+        assert await cache.get(_key()) is None
+        await cache.put(_key(), AIMessage(content="A summary"))
+        await cache.put(_key(schema={}), {"title": "Episode", "segments": [1, 2]})
+        return await cache.get(_key()), await cache.get(_key(schema={}))
+
+    message, structured = asyncio.run(scenario())
+    assert isinstance(message, AIMessage) and message.content == "A summary"
+    assert structured == {"title": "Episode", "segments": [1, 2]}
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    (tmp_path / f"{_key()}.json").write_text("{not json")
+    cache = LlmResponseCache(tmp_path, max_bytes=1 << 20)
+    assert asyncio.run(cache.get(_key())) is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    payload = "x" * 1000
+    keys = [_key(model=f"model-{i}") for i in range(5)]
+
+    async def scenario():
+        cache = LlmResponseCache(tmp_path, max_bytes=4500)
+        for i, key in enumerate(keys[:4]):
+            await cache.put(key, {"value": payload})
+            os.utime(tmp_path / f"{key}.json", (1000 + i, 1000 + i))  # distinct recency without sleeping
+        assert await cache.get(keys[0]) is not None  # a hit makes the oldest entry the most recent
+        await cache.put(keys[4], {"value": payload})  # over budget: evict down to 80% of it
+        return cache
+
+    cache = asyncio.run(scenario())
+    remaining = {path.stem for path in tmp_path.glob("*.json")}
+    assert remaining == {keys[0], keys[3], keys[4]}
+    assert cache._size == sum(path.stat().st_size for path in tmp_path.glob("*.json"))
+    assert cache._size <= 4500 * 4 // 5
+
+
+def test_existing_entries_count_towards_the_budget(tmp_path):
+    async def fill():
+        await LlmResponseCache(tmp_path, max_bytes=1 << 20).put(_key(), {"value": "x" * 1000})
+
+    asyncio.run(fill())
+    reopened = LlmResponseCache(tmp_path, max_bytes=1 << 20)
+    assert reopened._size == (tmp_path / f"{_key()}.json").stat().st_size
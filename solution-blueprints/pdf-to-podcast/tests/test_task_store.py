@@ -0,0 +1,95 @@
+# Copyright © Advanced Micro Devices, Inc., or its affiliates.
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+from core import task_store
+from core.models import ServiceType, TaskStatus
+from core.task_store import TaskStore
+
+
+class FakeClock:
+    """Stands in for the ``time`` module used by task_store."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(task_store, "time", clock)
+    return clock
+
+
+async def _finish(store: TaskStore, task_id: str, status: TaskStatus = TaskStatus.COMPLETED) -> None:
+    for service in ServiceType:
+        await store.update_status(task_id, service, status)
+
+
+def test_ttl_evicts_only_finished_tasks(clock):
+    async def scenario():
+        store = TaskStore(ttl=60, max_records=100)
+        await store.create_task("running")
+        await store.update_status("running", ServiceType.PDF, TaskStatus.PROCESSING, "Converting")
+        await store.create_task("done")
+        await _finish(store, "done")
+        await store.create_task("failed")
+        await _finish(store, "failed", TaskStatus.FAILED)
+
+        clock.now += 120
+        await store.create_task("new")
+        assert set(store.records) == {"running", "new"}
+
+        # A long-running stage must still be able to report progress after the TTL.
+        await store.update_status("running", ServiceType.PDF, TaskStatus.COMPLETED, "Converted")
+        assert (await store.get_status("running"))["message"] == "Converted"
+
+    asyncio.run(scenario())
+
+
+def test_ttl_stops_at_recently_updated_records(clock):
+    async def scenario():
+        store = TaskStore(ttl=60, max_records=100)
+        await store.create_task("old")
+        await _finish(store, "old")
+        clock.now += 50
+        await store.create_task("recent")
+        await _finish(store, "recent")
+
+        clock.now += 20  # "old" idle for 70 s, "recent" for 20 s
+        await store.create_task("new")
+        assert set(store.records) == {"recent", "new"}
+
+    asyncio.run(scenario())
+
+
+def test_max_records_evicts_oldest_finished_first(clock):
+    async def scenario():
+        store = TaskStore(ttl=3600, max_records=3)
+        await store.create_task("running")
+        for task_id in ("done-1", "done-2"):
+            await store.create_task(task_id)
+            await _finish(store, task_id)
+        await store.create_task("new")
+        assert list(store.records) == ["running", "done-2", "new"]
+
+        await store.create_task("newer")  # only running tasks left besides "new"
+        await store.create_task("newest")
+        assert "running" in store.records and "new" in store.records
+
+    asyncio.run(scenario())
+
+
+def test_unknown_task_raises_key_error():
+    async def scenario():
+        store = TaskStore()
+        with pytest.raises(KeyError):
+            await store.update_status("missing", ServiceType.TTS, TaskStatus.PROCESSING)
+
+    asyncio.run(scenario())